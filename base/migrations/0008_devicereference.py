@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0007_add_deeplink_urls"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeviceReference",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("provider", models.CharField(max_length=50)),
+                ("device_id", models.CharField(max_length=255)),
+                ("fhir_reference", models.CharField(help_text="FHIR reference, e.g. Device/<uuid>", max_length=255)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "unique_together": {("provider", "device_id")},
+            },
+        ),
+    ]
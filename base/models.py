@@ -63,7 +63,7 @@ class Provider(models.Model):
             # Provider enum values are uppercase (WITHINGS, FITBIT)
             # but model provider_type is lowercase (withings, fitbit)
             provider_enum = ProviderEnum[self.provider_type.upper()]
-            return get_supported_data_types(provider_enum)
+            return list(get_supported_data_types(provider_enum))
         except (ValueError, AttributeError, KeyError):
             return []
 
@@ -120,3 +120,23 @@ class ProviderLink(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.provider.name}"
+
+
+class DeviceReference(models.Model):
+    """
+    Local mirror of provider device ID -> FHIR Device reference mappings.
+
+    Used as an optional fast path by the device mapping service (DEVICE_MAPPING["LOCAL_TABLE_FIRST"])
+    and populated from positive FHIR lookups. Stores mapping details only, no health data.
+    """
+
+    provider: str = models.CharField(max_length=50)  # type: ignore[assignment]
+    device_id: str = models.CharField(max_length=255)  # type: ignore[assignment]
+    fhir_reference: str = models.CharField(max_length=255, help_text="FHIR reference, e.g. Device/<uuid>")  # type: ignore[assignment]
+    updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("provider", "device_id")
+
+    def __str__(self):
+        return f"{self.provider}:{self.device_id} -> {self.fhir_reference}"
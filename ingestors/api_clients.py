@@ -10,6 +10,7 @@ import time
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from threading import Lock
 from typing import TYPE_CHECKING, Any, cast
 
 import requests
@@ -104,6 +105,8 @@ class UnifiedHealthDataClient:
         self._request_times: dict[str, list[float]] = defaultdict(list)
         # Server-reported Fitbit rate limit state (from response headers)
         self._fitbit_rate_limit_info: dict[str, Any] = {}
+        # Serializes token refreshes when data types are fetched concurrently (refresh tokens rotate)
+        self._token_refresh_lock = Lock()
 
     def get_health_data(
         self, provider: Provider, data_type: HealthDataType, user_id: str, date_range: DateRange
@@ -111,6 +114,8 @@ class UnifiedHealthDataClient:
         """
         Get health data for a single query
         Wrapper around unified batch method
+
+        Scalar "value" fields are already floats, so managers use them without re-casting
         """
         query = DataQuery(provider=provider, data_type=data_type, user_id=user_id, date_range=date_range)
         results = self.fetch_health_data([query])
@@ -228,9 +233,13 @@ class UnifiedHealthDataClient:
         except TokenExpiredError:
             # Try token refresh once
             try:
-                self._refresh_token(social_auth, query.provider)
-                # Refresh from DB to ensure we have the latest token data
-                social_auth.refresh_from_db()
+                with self._token_refresh_lock:
+                    # Another fetch for this user may have refreshed the token while we waited
+                    social_auth.refresh_from_db()
+                    if social_auth.extra_data.get("access_token") == access_token:
+                        self._refresh_token(social_auth, query.provider)
+                        # Refresh from DB to ensure we have the latest token data
+                        social_auth.refresh_from_db()
                 # Reset circuit breaker after successful token refresh to allow retry
                 match query.provider:
                     case Provider.WITHINGS:
@@ -517,14 +526,13 @@ class UnifiedHealthDataClient:
         # Add meastype if specified (for /measure endpoint)
         # Note: Withings deprecated multi-meastype requests (e.g., "meastype=9,10")
         # For blood pressure and temperature, we need to make separate calls
-        if config.meastype is not None:
-            if isinstance(config.meastype, list):
-                # Store list of meastypes to handle separately
-                # Will make multiple API calls and merge results
-                params["meastype_list"] = config.meastype
-            else:
-                # Single meastype
-                params["meastype"] = config.meastype
+        if len(config.meastype) > 1:
+            # Store meastypes to handle separately
+            # Will make multiple API calls and merge results
+            params["meastype_list"] = config.meastype
+        elif config.meastype:
+            # Single meastype
+            params["meastype"] = config.meastype[0]
 
         # Add data_fields if specified (for sleep getsummary, activity, etc.)
         if config.data_fields:
@@ -578,12 +586,12 @@ class UnifiedHealthDataClient:
         from .provider_mappings import get_data_type_config
 
         config = get_data_type_config(ProviderEnum.WITHINGS, data_type.value)
-        if not config or config.meastype is None:
+        if not config or not config.meastype:
             self.logger.warning(f"No meastype configured for {data_type.value} — cannot match measurements")
             return []
 
         # Build set of expected meastypes from the single source of truth
-        expected_meastypes = set(config.meastype if isinstance(config.meastype, list) else [config.meastype])
+        expected_meastypes = set(config.meastype)
 
         # Blood pressure requires special handling: pair systolic and diastolic
         # into a single record with a dict value, as the transformer expects
@@ -616,6 +624,7 @@ class UnifiedHealthDataClient:
                         "value": float(value),
                         "device_id": group.get("deviceid"),
                         "measurement_id": group.get("grpid"),
+                        "meastype": measure_type,
                         "measurement_source": measurement_source,
                         "category": category,
                     }
@@ -1095,7 +1104,7 @@ class UnifiedHealthDataClient:
                     {
                         "timestamp": sleep_start,
                         "end_time": sleep_end,
-                        "value": sleep_entry.get("minutesAsleep", 0),
+                        "value": float(sleep_entry.get("minutesAsleep", 0)),
                         "unit": "minutes",
                         "device_id": primary_device_id,
                         "log_id": sleep_entry.get("logId"),
@@ -1291,7 +1300,7 @@ class UnifiedHealthDataClient:
                 results.append(
                     {
                         "timestamp": hrv_timestamp,
-                        "value": rmssd,
+                        "value": float(rmssd),
                         "unit": "ms",
                         "device_id": primary_device_id,
                         "measurement_source": MeasurementSource.DEVICE,
@@ -1487,7 +1496,7 @@ class UnifiedHealthDataClient:
                 "token_type": "Bearer",
             }
         )
-        social_auth.save()
+        social_auth.save(update_fields=["extra_data"])
 
         self.logger.info(f"Successfully refreshed Withings token for user {social_auth.user.ehr_user_id}")
         return True
@@ -1527,7 +1536,7 @@ class UnifiedHealthDataClient:
                     "token_type": new_tokens.get("token_type", "Bearer"),
                 }
             )
-            social_auth.save()
+            social_auth.save(update_fields=["extra_data"])
 
             self.logger.info(f"Successfully refreshed Fitbit token for user {social_auth.user.ehr_user_id}")
             return True
@@ -1,21 +1,38 @@
 """
 Modern device mapping service - Provider-agnostic, cached, type-safe
-Maps provider device IDs to FHIR Device UUIDs using Django cache backend
+Maps provider device IDs to FHIR Device UUIDs using the "device_map" Django cache alias
 """
 
+import hashlib
 import logging
-from collections import defaultdict
+import random
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator
 from dataclasses import dataclass
+from datetime import timedelta
+from itertools import groupby
+from operator import attrgetter
+from threading import Lock
 
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import caches
+from django.utils import timezone
 
-from publishers.fhir.client import FHIRClient
+from base.models import DeviceReference
+from publishers.fhir.client import FHIRClient, create_pooled_session
 
 from .constants import Provider
 
 logger = logging.getLogger(__name__)
 
+# Dedicated alias with a JSON serializer - mapping values are plain strings, no pickling needed
+cache = caches["device_map"]
+
+# Number of distinct TTLs negative entries are spread across. Each bucket is one set_many call,
+# so a handful keeps the round trips bounded while de-synchronizing mass expirations.
+NEGATIVE_TTL_BUCKETS = 4
+
 
 @dataclass(slots=True, frozen=True)
 class DeviceQuery:
@@ -31,6 +48,74 @@ class DeviceQuery:
         return f"{prefix}:{self.provider.value}:{self.device_id}"
 
 
+class LocalDeviceCache:
+    """
+    Small in-process TTL + LRU tier in front of the Django cache
+
+    Absorbs repeated lookups of the same device IDs within a worker so they
+    don't pay a Redis round trip each time. Hits are moved to the most recently
+    used end so eviction drops the least recently used entries; recency updates,
+    writes and evictions are serialized with a lock.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[Provider, str], tuple[float, str | None]] = OrderedDict()
+        self._lock = Lock()
+
+    def get_many(self, queries: list[DeviceQuery]) -> tuple[dict[str, str | None], list[DeviceQuery]]:
+        """Split queries into local hits and remaining queries"""
+        now = time.monotonic()
+        hits: dict[str, str | None] = {}
+        remaining: list[DeviceQuery] = []
+
+        hit_keys: list[tuple[Provider, str]] = []
+
+        for query in queries:
+            key = (query.provider, query.device_id)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                hits[query.device_id] = entry[1]
+                hit_keys.append(key)
+            else:
+                remaining.append(query)
+
+        if hit_keys:
+            with self._lock:
+                for key in hit_keys:
+                    # Entry may have been evicted by a concurrent writer since the read
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+
+        return hits, remaining
+
+    def set_many(self, queries: list[DeviceQuery], results: dict[str, str | None]) -> None:
+        """Store resolved results, evicting least recently used entries beyond maxsize"""
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for query in queries:
+                if query.device_id not in results:
+                    continue
+                key = (query.provider, query.device_id)
+                self._entries[key] = (expires_at, results[query.device_id])
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all locally cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class DeviceMappingService:
     """
     Modern device mapping service using unified batch operations
@@ -43,6 +128,10 @@ class DeviceMappingService:
     def __init__(self, fhir_client: FHIRClient | None = None) -> None:
         self.fhir_client = fhir_client or FHIRClient()
         self.config = settings.DEVICE_MAPPING
+        self._local = LocalDeviceCache(
+            maxsize=self.config.get("LOCAL_CACHE_SIZE", 10_000),
+            ttl=self.config.get("LOCAL_CACHE_TTL", 300),
+        )
 
     def get_fhir_device_reference(self, provider: Provider, device_id: str) -> str | None:
         """
@@ -75,28 +164,135 @@ class DeviceMappingService:
         if not queries:
             return {}
 
+        # Phase 0: In-process lookup, no network round trip
+        local_results, remaining_queries = self._local.get_many(queries)
+        if not remaining_queries:
+            return local_results
+
         try:
-            # Phase 1: Batch cache lookup
-            results, uncached_queries = self._batch_cache_lookup(queries)
+            # Phase 1: Local mirror table - one indexed SQL query per provider (opt-in)
+            table_results: dict[str, str | None] = {}
+            lookup_queries = remaining_queries
+            if self.config.get("LOCAL_TABLE_FIRST"):
+                table_results, lookup_queries = self._local_table_lookup(remaining_queries)
+
+            # Phase 2: Whole-batch response cache - a recurring batch costs a single GET
+            batch_key = self._batch_response_key(lookup_queries)
+            results = self._batch_response_lookup(batch_key, lookup_queries) if lookup_queries else {}
+
+            if results is None:
+                # Phase 3: Batch cache lookup
+                results, uncached_queries = self._batch_cache_lookup(lookup_queries)
+
+                logger.info(
+                    f"Cache performance: {len(local_results)} local + {len(table_results)} table + "
+                    f"{len(results)} shared hits of {len(queries)}, {len(uncached_queries)} FHIR lookups needed"
+                )
+
+                # Phase 4: Batch FHIR search for cache misses
+                if uncached_queries:
+                    fhir_results = self._batch_fhir_search(uncached_queries)
+                    results.update(fhir_results)
+
+                    # Phase 5: Batch cache storage
+                    self._batch_cache_store(uncached_queries, fhir_results)
+                    if self.config.get("LOCAL_TABLE_FIRST"):
+                        self._local_table_store(uncached_queries, fhir_results)
+
+                self._batch_response_store(batch_key, results)
+
+            results.update(table_results)
+            self._local.set_many(remaining_queries, results)
+            results.update(local_results)
+            return results
+
+        except Exception as e:
+            logger.error(f"Device mapping batch operation failed: {e}")
+            # Return empty results for failed operations
+            return {query.device_id: None for query in queries}
+
+    def _local_table_lookup(self, queries: list[DeviceQuery]) -> tuple[dict[str, str | None], list[DeviceQuery]]:
+        """Resolve queries from the local DeviceReference mirror, one IN (...) query per provider
+
+        Rows older than LOCAL_TABLE_MAX_AGE are ignored so a Device recreated in FHIR is picked up
+        again; the FHIR result then refreshes the row's updated_at through _local_table_store.
+        """
+        results: dict[str, str | None] = {}
+        max_age = self.config.get("LOCAL_TABLE_MAX_AGE", self.config.get("CACHE_TTL", 86400))
+        fresh_since = timezone.now() - timedelta(seconds=max_age)
+
+        try:
+            for provider, provider_queries in self._group_by_provider(queries):
+                rows = DeviceReference.objects.filter(
+                    provider=provider.value,
+                    device_id__in=[query.device_id for query in provider_queries],
+                    updated_at__gte=fresh_since,
+                ).values_list("device_id", "fhir_reference")
+                results.update(rows)
+
+        except Exception as e:
+            logger.warning(f"Local device table lookup failed: {e}")
+            return {}, queries
+
+        return results, [query for query in queries if query.device_id not in results]
 
-            logger.info(
-                f"Cache performance: {len(results)}/{len(queries)} hits, {len(uncached_queries)} FHIR lookups needed"
+    def _local_table_store(self, queries: list[DeviceQuery], results: dict[str, str | None]) -> None:
+        """Upsert positive FHIR results into the local DeviceReference mirror"""
+        references = [
+            DeviceReference(provider=query.provider.value, device_id=query.device_id, fhir_reference=device_ref)
+            for query in queries
+            if isinstance(device_ref := results.get(query.device_id), str)
+        ]
+        if not references:
+            return
+
+        try:
+            DeviceReference.objects.bulk_create(
+                references,
+                update_conflicts=True,
+                unique_fields=["provider", "device_id"],
+                update_fields=["fhir_reference", "updated_at"],
             )
+        except Exception as e:
+            logger.warning(f"Local device table storage failed: {e}")
 
-            # Phase 2: Batch FHIR search for cache misses
-            if uncached_queries:
-                fhir_results = self._batch_fhir_search(uncached_queries)
-                results.update(fhir_results)
+    def _batch_response_key(self, queries: list[DeviceQuery]) -> str | None:
+        """Stable cache key for a whole batch of queries, independent of query order"""
+        if len(queries) < 2:
+            # A single query is already one cache GET
+            return None
 
-                # Phase 3: Batch cache storage
-                self._batch_cache_store(uncached_queries, fhir_results)
+        identifiers = sorted(f"{query.provider.value}:{query.device_id}" for query in queries)
+        digest = hashlib.blake2b(",".join(identifiers).encode(), digest_size=16).hexdigest()
+        return f"{self.config['CACHE_PREFIX']}:batch:{digest}"
 
-            return results
+    def _batch_response_lookup(self, batch_key: str | None, queries: list[DeviceQuery]) -> dict[str, str | None] | None:
+        """Fetch a previously resolved batch, or None if it isn't cached"""
+        if batch_key is None:
+            return None
 
+        try:
+            cached_batch = cache.get(batch_key)
         except Exception as e:
-            logger.error(f"Device mapping batch operation failed: {e}")
-            # Return empty results for failed operations
-            return {query.device_id: None for query in queries}
+            logger.warning(f"Batch cache lookup failed: {e}")
+            return None
+
+        # Type safety - only trust a mapping covering every queried device
+        if not isinstance(cached_batch, dict) or any(query.device_id not in cached_batch for query in queries):
+            return None
+
+        logger.debug(f"Batch cache HIT: {len(cached_batch)} devices")
+        return dict(cached_batch)
+
+    def _batch_response_store(self, batch_key: str | None, results: dict[str, str | None]) -> None:
+        """Store a resolved batch with a short TTL so retries of the same batch coalesce"""
+        if batch_key is None:
+            return
+
+        try:
+            cache.set(batch_key, results, timeout=self.config.get("BATCH_CACHE_TTL", 60))
+        except Exception as e:
+            logger.warning(f"Batch cache storage failed: {e}")
 
     def _batch_cache_lookup(self, queries: list[DeviceQuery]) -> tuple[dict[str, str | None], list[DeviceQuery]]:
         """Unified cache lookup using Django's get_many for efficiency"""
@@ -137,12 +333,7 @@ class DeviceMappingService:
         """Unified FHIR search with provider-specific identifier systems"""
         results = {}
 
-        # Group queries by provider for efficiency
-        by_provider: dict[Provider, list[DeviceQuery]] = defaultdict(list)
-        for query in queries:
-            by_provider[query.provider].append(query)
-
-        for provider, provider_queries in by_provider.items():
+        for provider, provider_queries in self._group_by_provider(queries):
             identifier_system = self._get_identifier_system(provider)
 
             for query in provider_queries:
@@ -156,9 +347,18 @@ class DeviceMappingService:
 
         return results
 
+    @staticmethod
+    def _group_by_provider(queries: list[DeviceQuery]) -> Iterator[tuple[Provider, list[DeviceQuery]]]:
+        """Group queries by provider in one C-level sort, preserving query order within a provider"""
+        by_provider = attrgetter("provider")
+        for provider, provider_queries in groupby(sorted(queries, key=by_provider), key=by_provider):
+            yield provider, list(provider_queries)
+
     def _search_single_device(self, identifier_system: str, device_id: str) -> str | None:
         """Single device FHIR search - consolidated logic"""
-        search_params = {"identifier": f"{identifier_system}|{device_id}", "_count": 1}
+        # Only the resource id is needed; _elements trims the Device down server-side so the
+        # response bundle stays small instead of carrying the full resource
+        search_params = {"identifier": f"{identifier_system}|{device_id}", "_count": 1, "_elements": "identifier"}
 
         logger.debug(f"FHIR search: {search_params}")
         search_result = self.fhir_client.search_resource("Device", search_params)
@@ -196,12 +396,38 @@ class DeviceMappingService:
                 logger.debug(f"Cached {len(positive_cache)} positive results")
 
             if negative_cache:
-                cache.set_many(negative_cache, timeout=self.config["NEGATIVE_CACHE_TTL"])
+                for timeout, bucket in self._bucket_negative_entries(negative_cache).items():
+                    cache.set_many(bucket, timeout=timeout)
                 logger.debug(f"Cached {len(negative_cache)} negative results")
 
         except Exception as e:
             logger.warning(f"Cache storage failed: {e}")
 
+    def _bucket_negative_entries(self, negative_cache: dict[str, str]) -> dict[int, dict[str, str]]:
+        """
+        Spread negative entries across jittered TTL buckets
+
+        A single TTL makes every "not found" entry from a batch expire at once, so all workers
+        re-query FHIR for the same unknown IDs together. Each entry instead gets one of up to
+        NEGATIVE_TTL_BUCKETS distinct timeouts within +/-10% of NEGATIVE_CACHE_TTL, capped at
+        NEGATIVE_CACHE_MAX_TTL (default 2x NEGATIVE_CACHE_TTL).
+        """
+        ttl = self.config["NEGATIVE_CACHE_TTL"]
+        max_ttl = self.config.get("NEGATIVE_CACHE_MAX_TTL", 2 * ttl)
+        spread = ttl // 10
+
+        if spread <= 0 or NEGATIVE_TTL_BUCKETS <= 1:
+            timeouts = [min(ttl, max_ttl)]
+        else:
+            step = (2 * spread) / (NEGATIVE_TTL_BUCKETS - 1)
+            # Clamped values can collide at the ceiling, keep each bucket distinct
+            timeouts = sorted({min(ttl - spread + round(i * step), max_ttl) for i in range(NEGATIVE_TTL_BUCKETS)})
+
+        buckets: dict[int, dict[str, str]] = defaultdict(dict)
+        for cache_key, value in negative_cache.items():
+            buckets[random.choice(timeouts)][cache_key] = value
+        return buckets
+
     def _get_identifier_system(self, provider: Provider) -> str:
         """Provider-agnostic identifier system lookup from settings"""
         systems: dict[str, str] = self.config["IDENTIFIER_SYSTEMS"]
@@ -215,9 +441,10 @@ class DeviceMappingService:
 
     def clear_cache(self) -> None:
         """Clear device mapping cache (development/testing only)"""
+        self._local.clear()
         logger.warning(
             "Full cache pattern deletion not supported with Django cache. "
-            "Use cache.clear() for full clear or wait for TTL expiration."
+            "Use caches['device_map'].clear() for full clear or wait for TTL expiration."
         )
 
     def get_cache_stats(self) -> dict[str, str | int]:
@@ -228,19 +455,29 @@ class DeviceMappingService:
             "negative_cache_ttl_hours": self.config["NEGATIVE_CACHE_TTL"] // 3600,
             "cache_prefix": self.config["CACHE_PREFIX"],
             "batch_size": self.config["BATCH_SIZE"],
+            "local_cache_entries": len(self._local),
             "supported_providers": list(self.config["IDENTIFIER_SYSTEMS"].keys()),
         }
 
 
 # Global service instance
 _device_mapping_service: DeviceMappingService | None = None
+_device_mapping_service_lock = Lock()
 
 
 def get_device_mapping_service() -> DeviceMappingService:
-    """Lazy singleton for global service instance"""
+    """
+    Lazy, thread-safe singleton for global service instance
+
+    The instance owns one pooled FHIR session shared by all threads in the worker,
+    sized by DEVICE_MAPPING["HTTP_POOL_SIZE"].
+    """
     global _device_mapping_service
     if _device_mapping_service is None:
-        _device_mapping_service = DeviceMappingService()
+        with _device_mapping_service_lock:
+            if _device_mapping_service is None:
+                session = create_pooled_session(settings.DEVICE_MAPPING.get("HTTP_POOL_SIZE", 10))
+                _device_mapping_service = DeviceMappingService(fhir_client=FHIRClient(session=session))
     return _device_mapping_service
 
 
@@ -2,9 +2,11 @@
 Production-ready error handling for health data operations.
 """
 
+import asyncio
+import inspect
 import logging
+import random
 import time
-import traceback
 from collections.abc import Callable
 from enum import Enum
 from functools import wraps
@@ -71,10 +73,14 @@ def error_handler(provider: str, operation: str):
                 error_type = _classify_error(e)
 
                 # Record error metrics
-                metrics.record_sync_operation(
-                    provider=provider, operation_type=operation, status="error", duration=duration
+                metrics.record_operation_batch(
+                    provider=provider,
+                    operation_type=operation,
+                    status="error",
+                    duration=duration,
+                    error_type=error_type.value,
+                    rate_limited=error_type == ErrorType.RATE_LIMIT_ERROR,
                 )
-                metrics.record_provider_api_error(provider, error_type.value)
 
                 # Log error with context
                 logger.error(
@@ -85,13 +91,13 @@ def error_handler(provider: str, operation: str):
                         "error_type": error_type.value,
                         "error_message": error_message,
                         "duration": duration,
-                        "traceback": traceback.format_exc(),
                     },
+                    # Let the handler format the traceback only if the record is emitted
+                    exc_info=True,
                 )
 
                 # Handle specific error types
                 if error_type == ErrorType.RATE_LIMIT_ERROR:
-                    metrics.record_rate_limit(provider)
                     raise HealthDataError(
                         f"Rate limit exceeded for {provider}", error_type, provider=provider, original_error=e
                     )
@@ -131,7 +137,17 @@ def _classify_error(exception: Exception) -> ErrorType:
 
 
 class RetryHandler:
-    """Configurable retry handler with exponential backoff."""
+    """
+    Configurable retry handler with decorrelated-jitter backoff.
+
+    Each delay is drawn from [base_delay, previous_delay * backoff_factor] and capped at
+    max_delay, so concurrent workers failing together don't retry in lockstep. A
+    ``retry_after`` detail on a HealthDataError (e.g. from a Retry-After header) takes
+    precedence over the jittered delay, but is still capped at max_delay.
+
+    Coroutine functions are wrapped with an async wrapper that waits with ``asyncio.sleep``
+    so retries don't block the event loop.
+    """
 
     def __init__(
         self,
@@ -148,68 +164,87 @@ class RetryHandler:
         self.retryable_errors = retryable_errors
 
     def __call__(self, func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            last_exception = None
-
-            for attempt in range(self.max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
+        if inspect.iscoroutinefunction(func):
 
-                except HealthDataError as e:
-                    last_exception = e
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                prev_delay = self.base_delay
 
-                    # Don't retry non-retryable errors
-                    if e.error_type not in self.retryable_errors:
-                        raise
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        delay, prev_delay = self._retry_delay(e, attempt, prev_delay)
+                        await asyncio.sleep(delay)
 
-                    # Don't retry on last attempt
-                    if attempt == self.max_retries:
-                        raise
+                # This should never be reached, but just in case
+                raise Exception("Retry handler failed unexpectedly")
 
-                    # Calculate delay with exponential backoff
-                    delay = min(self.base_delay * (self.backoff_factor**attempt), self.max_delay)
+            return async_wrapper
 
-                    logger.warning(
-                        f"Attempt {attempt + 1} failed, retrying in {delay}s",
-                        extra={
-                            "attempt": attempt + 1,
-                            "max_retries": self.max_retries,
-                            "delay": delay,
-                            "error": str(e),
-                        },
-                    )
-
-                    time.sleep(delay)
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            prev_delay = self.base_delay
 
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return func(*args, **kwargs)
                 except Exception as e:
-                    # Convert non-HealthDataError exceptions
-                    error_type = _classify_error(e)
-                    health_error = HealthDataError(str(e), error_type, original_error=e)
-                    last_exception = health_error
-
-                    if error_type not in self.retryable_errors or attempt == self.max_retries:
-                        raise health_error
-
-                    delay = min(self.base_delay * (self.backoff_factor**attempt), self.max_delay)
-
-                    logger.warning(
-                        f"Attempt {attempt + 1} failed, retrying in {delay}s",
-                        extra={
-                            "attempt": attempt + 1,
-                            "max_retries": self.max_retries,
-                            "delay": delay,
-                            "error": str(e),
-                        },
-                    )
-
+                    delay, prev_delay = self._retry_delay(e, attempt, prev_delay)
                     time.sleep(delay)
 
             # This should never be reached, but just in case
-            raise last_exception or Exception("Retry handler failed unexpectedly")
+            raise Exception("Retry handler failed unexpectedly")
 
         return wrapper
 
+    def _retry_delay(self, error: Exception, attempt: int, prev_delay: float) -> tuple[float, float]:
+        """
+        Decide whether a failed attempt is retried.
+
+        Raises the (converted) HealthDataError when the error isn't retryable or retries are
+        exhausted, otherwise returns the delay before the next attempt and the jitter state
+        to carry into the following one.
+        """
+        if isinstance(error, HealthDataError):
+            health_error = error
+        else:
+            # Convert non-HealthDataError exceptions
+            health_error = HealthDataError(str(error), _classify_error(error), original_error=error)
+
+        # Don't retry non-retryable errors or on the last attempt
+        if health_error.error_type not in self.retryable_errors or attempt == self.max_retries:
+            raise health_error
+
+        delay, prev_delay = self._next_delay(prev_delay, health_error)
+
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                f"Attempt {attempt + 1} failed, retrying in {delay}s",
+                extra={
+                    "attempt": attempt + 1,
+                    "max_retries": self.max_retries,
+                    "delay": delay,
+                    "error": str(error),
+                },
+            )
+        return delay, prev_delay
+
+    def _next_delay(self, prev_delay: float, error: HealthDataError) -> tuple[float, float]:
+        """
+        Server-provided retry_after if present, otherwise a decorrelated-jitter delay.
+
+        Both are capped at max_delay. A retry_after doesn't feed the jitter state, so the
+        returned previous delay is left unchanged in that case.
+        """
+        retry_after = error.details.get("retry_after")
+        if isinstance(retry_after, int | float) and retry_after >= 0:
+            return min(self.max_delay, float(retry_after)), prev_delay
+
+        upper = max(self.base_delay, prev_delay * self.backoff_factor)
+        delay = min(self.max_delay, random.uniform(self.base_delay, upper))
+        return delay, delay
+
 
 # Predefined retry handlers
 default_retry = RetryHandler()
@@ -38,6 +38,13 @@ class HealthDataType(StrEnum):
     FAT_MASS = "fat_mass"
     GLUCOSE = "glucose"
 
+    # Position in declaration order, assigned below; indexes the per-type lookup tables
+    ordinal: int
+
+
+for _ordinal, _data_type in enumerate(HealthDataType):
+    _data_type.ordinal = _ordinal
+
 
 class AggregationLevel(StrEnum):
     """Data aggregation preferences"""
@@ -83,6 +90,30 @@ class DateRange:
         if self.start >= self.end:
             raise ValueError("Start date must be before end date")
 
+    @classmethod
+    def _unchecked(cls, start: datetime, end: datetime) -> DateRange:
+        """Build a range already known to be valid, skipping __post_init__ validation"""
+        date_range = object.__new__(cls)
+        object.__setattr__(date_range, "start", start)
+        object.__setattr__(date_range, "end", end)
+        return date_range
+
+    def split(self, window: timedelta) -> list[DateRange]:
+        """Split into consecutive ranges no longer than window (at least one day)
+
+        Chunks after the first start at midnight and each chunk ends one microsecond before the
+        next, so providers that treat both bounds as inclusive (whole days, whole seconds) never
+        return boundary data twice.
+        """
+        chunks = []
+        start = self.start
+        while self.end - start > window:
+            next_start = (start + window).replace(hour=0, minute=0, second=0, microsecond=0)
+            chunks.append(DateRange._unchecked(start, next_start - timedelta(microseconds=1)))
+            start = next_start
+        chunks.append(DateRange._unchecked(start, self.end))
+        return chunks
+
 
 @dataclass(slots=True)
 class HealthDataRecord:
@@ -95,34 +126,32 @@ class HealthDataRecord:
     value: float | dict[str, Any]  # Simple value or complex data
     unit: str
     device_id: str | None = None
-    metadata: dict[str, Any] | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
     measurement_source: MeasurementSource = MeasurementSource.UNKNOWN
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
-
 
 @dataclass(slots=True)
 class HealthSyncConfig:
     """User-level sync configuration"""
 
     user_id: str
-    enabled_data_types: list[HealthDataType]
+    enabled_data_types: frozenset[HealthDataType]
     aggregation_preference: AggregationLevel
     sync_frequency: SyncFrequency
     retention_period: timedelta
 
     # Special linking rules (e.g., ECG always with heart rate)
-    linked_data_rules: dict[HealthDataType, list[HealthDataType]] | None = None
+    linked_data_rules: dict[HealthDataType, tuple[HealthDataType, ...]] | None = None
 
     def __post_init__(self):
+        # Membership is checked per data type during sync planning
+        self.enabled_data_types = frozenset(self.enabled_data_types)
         if self.linked_data_rules is None:
             # Default linking rules
             self.linked_data_rules = {
-                HealthDataType.ECG: [HealthDataType.HEART_RATE],
-                HealthDataType.RR_INTERVALS: [HealthDataType.HEART_RATE],
-                HealthDataType.HRV: [HealthDataType.HEART_RATE],
+                HealthDataType.ECG: (HealthDataType.HEART_RATE,),
+                HealthDataType.RR_INTERVALS: (HealthDataType.HEART_RATE,),
+                HealthDataType.HRV: (HealthDataType.HEART_RATE,),
             }
 
 
@@ -194,6 +223,17 @@ HEALTH_DATA_UCUM_UNITS = {
     "g": "g",  # grams
 }
 
+# Units that are already UCUM codes map to themselves, so to_ucum can return them without a table lookup
+_UCUM_CANONICAL = frozenset(HEALTH_DATA_UCUM_UNITS.values())
+
+
+def to_ucum(unit: str) -> str:
+    """UCUM code for a display unit; unknown units pass through unchanged"""
+    if unit in _UCUM_CANONICAL:
+        return unit
+    return HEALTH_DATA_UCUM_UNITS.get(unit, unit)
+
+
 # Display names for health data types
 HEALTH_DATA_DISPLAY_NAMES = {
     HealthDataType.HEART_RATE: "Heart rate",
@@ -228,6 +268,48 @@ HEALTH_DATA_FHIR_CATEGORIES = {
     HealthDataType.GLUCOSE: "laboratory",
 }
 
+# Ordinal-indexed views of the per-type tables above for per-record lookups (None where undefined)
+_LOINC_CODES_BY_ORDINAL = tuple(HEALTH_DATA_LOINC_CODES.get(data_type) for data_type in HealthDataType)
+_DISPLAY_NAMES_BY_ORDINAL = tuple(HEALTH_DATA_DISPLAY_NAMES.get(data_type) for data_type in HealthDataType)
+_FHIR_CATEGORIES_BY_ORDINAL = tuple(HEALTH_DATA_FHIR_CATEGORIES.get(data_type) for data_type in HealthDataType)
+
+
+def loinc_code_for(data_type: HealthDataType) -> str | None:
+    """Default LOINC code for a data type"""
+    return _LOINC_CODES_BY_ORDINAL[data_type.ordinal]
+
+
+def display_name_for(data_type: HealthDataType) -> str | None:
+    """Display name for a data type"""
+    return _DISPLAY_NAMES_BY_ORDINAL[data_type.ordinal]
+
+
+def fhir_category_for(data_type: HealthDataType) -> str | None:
+    """FHIR observation category for a data type"""
+    return _FHIR_CATEGORIES_BY_ORDINAL[data_type.ordinal]
+
+
+# Value-to-member maps for coercing task and webhook strings without going through EnumMeta.__call__
+_PROVIDERS_BY_VALUE = {provider.value: provider for provider in Provider}
+_DATA_TYPES_BY_VALUE = {data_type.value: data_type for data_type in HealthDataType}
+
+
+def provider_from_value(value: str) -> Provider:
+    """Provider for its string value; raises ValueError like Provider(value)"""
+    try:
+        return _PROVIDERS_BY_VALUE[value]
+    except KeyError:
+        raise ValueError(f"{value!r} is not a valid {Provider.__name__}") from None
+
+
+def data_types_from_values(values: list[str]) -> list[HealthDataType]:
+    """Health data types for their string values; raises ValueError like HealthDataType(value)"""
+    try:
+        return [_DATA_TYPES_BY_VALUE[value] for value in values]
+    except KeyError as e:
+        raise ValueError(f"{e.args[0]!r} is not a valid {HealthDataType.__name__}") from None
+
+
 # =====================================================
 # Backwards Compatibility Constants (inwithings support)
 # =====================================================
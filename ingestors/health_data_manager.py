@@ -4,10 +4,15 @@ Health data managers for fetching health data from different providers
 
 import logging
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Protocol, cast, runtime_checkable
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import BoundedSemaphore
+from typing import Any, ClassVar, Protocol, cast
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connections
 from social_django.models import UserSocialAuth
 
 # Real API clients for Phase 2
@@ -25,10 +30,34 @@ from .health_data_constants import (
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Metadata "source" tags shared by every record a manager builds
+WITHINGS_SOURCE = "withings_api"
+FITBIT_SOURCE = "fitbit_api"
+
+# Fitbit step records all carry the same metadata; records share this dict, which must not be mutated
+_FITBIT_STEPS_METADATA = {"source": FITBIT_SOURCE}
+
+
+class _BoundedClient:
+    """Health data client wrapper allowing at most `limit` concurrent get_health_data calls
+
+    Data types and their date windows are fetched on nested thread pools; sharing one wrapper
+    across both levels keeps a single sync at FETCH_WORKERS concurrent provider requests.
+    """
+
+    __slots__ = ("_client", "_slots")
+
+    def __init__(self, client, limit: int):
+        self._client = client
+        self._slots = BoundedSemaphore(limit)
+
+    def get_health_data(self, *args, **kwargs):
+        with self._slots:
+            return self._client.get_health_data(*args, **kwargs)
+
 
-@runtime_checkable
 class HealthDataManager(Protocol):
-    """Protocol for health data managers"""
+    """Protocol for health data managers (static typing only; concrete managers are registered in the factory)"""
 
     def fetch_health_data(
         self, user_id: str, data_types: list[HealthDataType], date_range: DateRange, sync_trigger: SyncTrigger
@@ -36,17 +65,32 @@ class HealthDataManager(Protocol):
         """Fetch health data for user"""
         ...
 
-    def get_supported_data_types(self) -> list[HealthDataType]:
+    def get_supported_data_types(self) -> tuple[HealthDataType, ...]:
         """Get data types supported by this provider"""
         ...
 
+    def supported_data_types_set(self) -> frozenset[HealthDataType]:
+        """Get data types supported by this provider, for membership checks"""
+        ...
+
 
 class BaseHealthDataManager(ABC):
     """Base class for health data managers"""
 
+    # Data types the provider can fetch; subclasses override
+    _SUPPORTED: ClassVar[frozenset[HealthDataType]] = frozenset()
+    # _SUPPORTED in HealthDataType declaration order, derived once per subclass
+    _SUPPORTED_ORDERED: ClassVar[tuple[HealthDataType, ...]] = ()
+
+    # Per-provider logger, resolved once at class creation; subclasses override
+    logger: ClassVar[logging.Logger] = logger
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._SUPPORTED_ORDERED = tuple(data_type for data_type in HealthDataType if data_type in cls._SUPPORTED)
+
     def __init__(self, provider: Provider):
         self.provider = provider
-        self.logger = logging.getLogger(f"{__name__}.{provider.value.title()}HealthDataManager")
 
     @abstractmethod
     def fetch_health_data(
@@ -54,9 +98,118 @@ class BaseHealthDataManager(ABC):
     ) -> list[HealthDataRecord]:
         """Fetch health data for user"""
 
+    @classmethod
+    def get_supported_data_types(cls) -> tuple[HealthDataType, ...]:
+        """Get data types supported by this provider, in HealthDataType declaration order"""
+        return cls._SUPPORTED_ORDERED
+
+    @classmethod
+    def supported_data_types_set(cls) -> frozenset[HealthDataType]:
+        """Get data types supported by this provider, for membership checks"""
+        return cls._SUPPORTED
+
     @abstractmethod
-    def get_supported_data_types(self) -> list[HealthDataType]:
-        """Get data types supported by this provider"""
+    def _fetch_data_type(
+        self, client, user_id: str, data_type: HealthDataType, date_range: DateRange
+    ) -> list[HealthDataRecord]:
+        """Fetch a single data type from the provider"""
+
+    def _fetch_data_types(
+        self, client, user_id: str, data_types: list[HealthDataType], date_range: DateRange
+    ) -> list[HealthDataRecord]:
+        """Fetch the supported data types concurrently, isolating failures per data type
+
+        Each data type is an independent API call, so they run on a small thread pool
+        (API_CLIENT_CONFIG["FETCH_WORKERS"]), which also bounds the provider requests in flight
+        across data types and their date windows. Records are returned in request order, with repeats of
+        the same measurement (data type, timestamp, device, measurement id, meastype) dropped.
+        """
+        provider_name = self.provider.value.title()
+
+        fetchable = []
+        for data_type in data_types:
+            if data_type not in self._SUPPORTED:
+                self.logger.warning("Data type %s not supported by %s", data_type, provider_name)
+            else:
+                fetchable.append(data_type)
+
+        bounded_client = _BoundedClient(client, max(1, settings.API_CLIENT_CONFIG.get("FETCH_WORKERS", 4)))
+        outcomes = self._map_concurrently(
+            lambda data_type: self._fetch_data_type_safely(bounded_client, user_id, data_type, date_range), fetchable
+        )
+
+        all_records: list[HealthDataRecord] = []
+        # Drop measurements the provider returned more than once before they reach FHIR conversion.
+        # Measurement id and meastype keep distinct measures of one group (same timestamp and device) apart.
+        seen: set[tuple[HealthDataType, datetime, str | None, Any, Any]] = set()
+        for data_type, records in zip(fetchable, outcomes, strict=True):
+            if records is None:
+                continue
+            unique: list[HealthDataRecord] = []
+            for record in records:
+                key = (
+                    record.data_type,
+                    record.timestamp,
+                    record.device_id,
+                    record.metadata.get("measurement_id"),
+                    record.metadata.get("meastype"),
+                )
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(record)
+            if len(unique) < len(records):
+                self.logger.debug(
+                    "Dropped %d duplicate %s records from %s", len(records) - len(unique), data_type, provider_name
+                )
+            all_records.extend(unique)
+            self.logger.info("Fetched %d %s records from %s", len(unique), data_type, provider_name)
+
+        return all_records
+
+    def _fetch_data_type_safely(
+        self, client, user_id: str, data_type: HealthDataType, date_range: DateRange
+    ) -> list[HealthDataRecord] | None:
+        """Fetch a single data type, logging failures so the other data types still sync"""
+        provider_name = self.provider.value.title()
+        try:
+            return self._fetch_data_type(client, user_id, data_type, date_range)
+        except APIError as e:
+            self.logger.error("API error fetching %s from %s: %s", data_type, provider_name, e)
+        except Exception as e:
+            self.logger.error("Unexpected error fetching %s from %s: %s", data_type, provider_name, e)
+        return None
+
+    def _fetch_raw_data(
+        self, client, user_id: str, data_type: HealthDataType, date_range: DateRange
+    ) -> list[dict[str, Any]]:
+        """Fetch raw provider data, splitting long ranges into FETCH_CHUNK_DAYS windows fetched concurrently"""
+        window = timedelta(days=settings.API_CLIENT_CONFIG.get("FETCH_CHUNK_DAYS", 30))
+        chunks = date_range.split(window)
+        if len(chunks) == 1:
+            return client.get_health_data(self.provider, data_type, user_id, date_range)
+
+        chunk_results = self._map_concurrently(
+            lambda chunk: client.get_health_data(self.provider, data_type, user_id, chunk), chunks
+        )
+        return [item for chunk_data in chunk_results for item in chunk_data]
+
+    def _map_concurrently[T, R](self, fn: Callable[[T], R], items: list[T]) -> list[R]:
+        """Apply fn to items on a bounded thread pool (API_CLIENT_CONFIG["FETCH_WORKERS"]), preserving order
+
+        A single item runs inline. Worker threads release their DB connections when done.
+        """
+        max_workers = min(settings.API_CLIENT_CONFIG.get("FETCH_WORKERS", 4), len(items))
+        if max_workers <= 1:
+            return [fn(item) for item in items]
+
+        def run(item: T) -> R:
+            try:
+                return fn(item)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{self.provider.value}-fetch") as pool:
+            return list(pool.map(run, items))
 
     def _get_user_social_auth(self, user_id: str) -> UserSocialAuth:
         """Get user's social auth for this provider"""
@@ -81,39 +234,20 @@ class BaseHealthDataManager(ABC):
         measurement_source: MeasurementSource = MeasurementSource.UNKNOWN,
     ) -> HealthDataRecord:
         """Create a standardized health data record"""
+        # Positional in HealthDataRecord field order, avoiding keyword matching in the generated __init__
         return HealthDataRecord(
-            provider=self.provider,
-            user_id=user_id,
-            data_type=data_type,
-            timestamp=timestamp,
-            value=value,
-            unit=unit,
-            device_id=device_id,
-            metadata=metadata or {},
-            measurement_source=measurement_source,
+            self.provider, user_id, data_type, timestamp, value, unit, device_id, metadata or {}, measurement_source
         )
 
 
 class WithingsHealthDataManager(BaseHealthDataManager):
     """Health data manager for Withings"""
 
+    logger = logging.getLogger(f"{__name__}.WithingsHealthDataManager")
+
     def __init__(self):
         super().__init__(Provider.WITHINGS)
 
-    def get_supported_data_types(self) -> list[HealthDataType]:
-        """Withings supports heart rate, steps, weight, blood pressure, ECG, temperature, SpO2, sleep, RR intervals"""
-        return [
-            HealthDataType.HEART_RATE,
-            HealthDataType.STEPS,
-            HealthDataType.WEIGHT,
-            HealthDataType.BLOOD_PRESSURE,
-            HealthDataType.ECG,
-            HealthDataType.TEMPERATURE,
-            HealthDataType.SPO2,
-            HealthDataType.SLEEP,
-            HealthDataType.RR_INTERVALS,
-        ]
-
     def fetch_health_data(
         self, user_id: str, data_types: list[HealthDataType], date_range: DateRange, sync_trigger: SyncTrigger
     ) -> list[HealthDataRecord]:
@@ -122,31 +256,14 @@ class WithingsHealthDataManager(BaseHealthDataManager):
             # Create real API client
             client = get_unified_health_data_client()
 
-            # Fetch data for each requested type
-            all_records = []
-
-            for data_type in data_types:
-                if data_type not in self.get_supported_data_types():
-                    self.logger.warning(f"Data type {data_type} not supported by Withings")
-                    continue
-
-                try:
-                    records = self._fetch_data_type(client, user_id, data_type, date_range)
-                    all_records.extend(records)
-                    self.logger.info(f"Fetched {len(records)} {data_type} records from Withings")
-                except APIError as e:
-                    self.logger.error(f"API error fetching {data_type} from Withings: {e}")
-                    # Continue with other data types
-                except Exception as e:
-                    self.logger.error(f"Unexpected error fetching {data_type} from Withings: {e}")
-
-            return all_records
+            # Fetch requested types concurrently; a failing type doesn't abort the others
+            return self._fetch_data_types(client, user_id, data_types, date_range)
 
         except APIError as e:
-            self.logger.error(f"API error fetching Withings health data for user {user_id}: {e}")
+            self.logger.error("API error fetching Withings health data for user %s: %s", user_id, e)
             raise
         except Exception as e:
-            self.logger.error(f"Error fetching Withings health data for user {user_id}: {e}")
+            self.logger.error("Error fetching Withings health data for user %s: %s", user_id, e)
             raise
 
     def _fetch_data_type(
@@ -157,242 +274,281 @@ class WithingsHealthDataManager(BaseHealthDataManager):
         date_range: DateRange,
     ) -> list[HealthDataRecord]:
         """Fetch specific data type from Withings using the unified client API"""
-        records = []
+        build_records = self._RECORD_BUILDERS.get(data_type)
+        if build_records is None:
+            raise ValueError(f"Data type {data_type} not supported by Withings")
 
         try:
             # Use the unified client API to fetch data
-            raw_data = client.get_health_data(Provider.WITHINGS, data_type, user_id, date_range)
-
-            if data_type == HealthDataType.HEART_RATE:
-                for measurement in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.HEART_RATE,
-                        timestamp=measurement["timestamp"],
-                        value=float(measurement["value"]),
-                        unit=FHIR_UNITS["heart_rate"]["display"],
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "measurement_id": measurement.get("measurement_id"),
-                            "category": measurement.get("category"),
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.STEPS:
-                for activity in raw_data:
-                    if activity.get("steps", 0) > 0:
-                        record = self._create_health_record(
-                            user_id=user_id,
-                            data_type=HealthDataType.STEPS,
-                            timestamp=activity["date"],
-                            value=float(activity["steps"]),
-                            unit=FHIR_UNITS["steps"]["display"],
-                            device_id=activity.get("device_id"),
-                            metadata={
-                                "source": "withings_api",
-                                "original_date": activity.get("original_date"),
-                                "distance": activity.get("distance"),
-                                "calories": activity.get("calories"),
-                                "elevation": activity.get("elevation"),
-                            },
-                        )
-                        records.append(record)
-
-            elif data_type == HealthDataType.WEIGHT:
-                for measurement in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.WEIGHT,
-                        timestamp=measurement["timestamp"],
-                        value=float(measurement["value"]),
-                        unit=FHIR_UNITS["weight"]["display"],
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "measurement_id": measurement.get("measurement_id"),
-                            "category": measurement.get("category"),
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.BLOOD_PRESSURE:
-                for measurement in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.BLOOD_PRESSURE,
-                        timestamp=measurement["timestamp"],
-                        value=measurement["value"],
-                        unit=FHIR_UNITS["blood_pressure"]["display"],
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "measurement_id": measurement.get("measurement_id"),
-                            "category": measurement.get("category"),
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.ECG:
-                for measurement in raw_data:
-                    heart_rate = measurement.get("heart_rate")
-                    afib_result = measurement.get("afib_result")
-                    raw_samples = measurement.get("waveform_samples", [])
-                    # wearposition=2 means right wrist: the lead polarity is reversed relative to
-                    # standard ECG convention, so the signal must be negated for correct display.
-                    # wearposition=1 (left wrist) and unknown positions are left as-is.
-                    wear_position = measurement.get("wear_position")
-                    waveform_samples = [-s for s in raw_samples] if wear_position == 2 else raw_samples
-                    sampling_freq = measurement.get("sampling_frequency", 500)
-
-                    # Map Withings afib int (0=normal, 1=afib, 2=inconclusive) to classification keys
-                    # recognized by ECGTransformer._create_afib_interpretation / AFIB_INTERPRETATION_CODES
-                    afib_code_map = {0: "NEGATIVE", 1: "POSITIVE", 2: "INCONCLUSIVE"}
-                    afib_code = afib_code_map.get(afib_result, "INCONCLUSIVE") if afib_result is not None else None
-
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.ECG,
-                        timestamp=measurement["timestamp"],
-                        value=float(heart_rate) if heart_rate is not None else 0.0,
-                        unit="bpm",
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "device_model": measurement.get("device_model"),
-                            "ecg_metrics": {
-                                "result_classification": afib_code,
-                                "afib": measurement.get("afib_classification"),
-                                "signal_id": measurement.get("signal_id"),
-                                "qrs_interval": measurement.get("qrs_interval"),
-                                "pr_interval": measurement.get("pr_interval"),
-                                "qt_interval": measurement.get("qt_interval"),
-                                "qtc_interval": measurement.get("qtc_interval"),
-                            },
-                            "waveform_data": {
-                                "samples": waveform_samples,
-                                "sampling_frequency_hz": sampling_freq,
-                                "scaling_factor": 1,
-                                "number_of_samples": len(waveform_samples),
-                                "lead_number": 1,
-                                "duration_seconds": (
-                                    len(waveform_samples) / max(sampling_freq, 1) if waveform_samples else 0
-                                ),
-                            },
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.DEVICE),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.TEMPERATURE:
-                for measurement in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.TEMPERATURE,
-                        timestamp=measurement["timestamp"],
-                        value=float(measurement["value"]),
-                        unit=FHIR_UNITS["temperature"]["display"],
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "measurement_id": measurement.get("measurement_id"),
-                            "category": measurement.get("category"),
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.SPO2:
-                for measurement in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.SPO2,
-                        timestamp=measurement["timestamp"],
-                        value=float(measurement["value"]),
-                        unit=FHIR_UNITS["spo2"]["display"],
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "measurement_id": measurement.get("measurement_id"),
-                            "category": measurement.get("category"),
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.SLEEP:
-                for measurement in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.SLEEP,
-                        timestamp=measurement["timestamp"],
-                        value={
-                            "duration": measurement.get("duration"),
-                            "deep_sleep_duration": measurement.get("deep_sleep_duration"),
-                            "light_sleep_duration": measurement.get("light_sleep_duration"),
-                            "rem_sleep_duration": measurement.get("rem_sleep_duration"),
-                            "wake_up_count": measurement.get("wake_up_count"),
-                        },
-                        unit="seconds",
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "end_timestamp": (
-                                measurement["end_timestamp"].isoformat() if measurement.get("end_timestamp") else None
-                            ),
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.DEVICE),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.RR_INTERVALS:
-                for measurement in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.RR_INTERVALS,
-                        timestamp=measurement["timestamp"],
-                        value=float(measurement["value"]),
-                        unit=FHIR_UNITS["time_ms"]["display"],
-                        device_id=measurement.get("device_id"),
-                        metadata={
-                            "source": "withings_api",
-                            "hr": measurement.get("hr"),
-                        },
-                        measurement_source=measurement.get("measurement_source", MeasurementSource.DEVICE),
-                    )
-                    records.append(record)
+            raw_data = self._fetch_raw_data(client, user_id, data_type, date_range)
+            return build_records(self, user_id, raw_data)
 
         except APIError as e:
-            self.logger.error(f"API error fetching {data_type} from Withings: {e}")
+            self.logger.error("API error fetching %s from Withings: %s", data_type, e)
             raise
         except Exception as e:
-            self.logger.error(f"Error processing {data_type} data from Withings: {e}")
+            self.logger.error("Error processing %s data from Withings: %s", data_type, e)
             raise
 
+    def _build_heart_rate_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build heart rate records from Withings data (intraday volume: lookups hoisted, built positionally)"""
+        make_record = HealthDataRecord
+        provider = self.provider
+        data_type = HealthDataType.HEART_RATE
+        unit = FHIR_UNITS["heart_rate"]["display"]
+        unknown = MeasurementSource.UNKNOWN
+        return [
+            make_record(
+                provider,
+                user_id,
+                data_type,
+                measurement["timestamp"],
+                measurement["value"],
+                unit,
+                measurement.get("device_id"),
+                {
+                    "source": WITHINGS_SOURCE,
+                    "measurement_id": measurement.get("measurement_id"),
+                    "category": measurement.get("category"),
+                },
+                measurement.get("measurement_source", unknown),
+            )
+            for measurement in raw_data
+        ]
+
+    def _build_steps_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build steps records from Withings data"""
+        make_record = HealthDataRecord
+        provider = self.provider
+        data_type = HealthDataType.STEPS
+        unit = FHIR_UNITS["steps"]["display"]
+        unknown = MeasurementSource.UNKNOWN
+        return [
+            make_record(
+                provider,
+                user_id,
+                data_type,
+                activity["date"],
+                float(activity["steps"]),
+                unit,
+                activity.get("device_id"),
+                {
+                    "source": WITHINGS_SOURCE,
+                    "original_date": activity.get("original_date"),
+                    "distance": activity.get("distance"),
+                    "calories": activity.get("calories"),
+                    "elevation": activity.get("elevation"),
+                },
+                unknown,
+            )
+            for activity in raw_data
+            if activity.get("steps", 0) > 0
+        ]
+
+    def _build_weight_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build weight records from Withings data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.WEIGHT,
+                timestamp=measurement["timestamp"],
+                value=measurement["value"],
+                unit=FHIR_UNITS["weight"]["display"],
+                device_id=measurement.get("device_id"),
+                metadata={
+                    "source": WITHINGS_SOURCE,
+                    "measurement_id": measurement.get("measurement_id"),
+                    "category": measurement.get("category"),
+                },
+                measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
+            )
+            for measurement in raw_data
+        ]
+
+    def _build_blood_pressure_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build blood pressure records from Withings data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.BLOOD_PRESSURE,
+                timestamp=measurement["timestamp"],
+                value=measurement["value"],
+                unit=FHIR_UNITS["blood_pressure"]["display"],
+                device_id=measurement.get("device_id"),
+                metadata={
+                    "source": WITHINGS_SOURCE,
+                    "measurement_id": measurement.get("measurement_id"),
+                    "category": measurement.get("category"),
+                },
+                measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
+            )
+            for measurement in raw_data
+        ]
+
+    def _build_ecg_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build ECG records from Withings data"""
+        records: list[HealthDataRecord] = []
+        for measurement in raw_data:
+            heart_rate = measurement.get("heart_rate")
+            afib_result = measurement.get("afib_result")
+            raw_samples = measurement.get("waveform_samples", [])
+            # wearposition=2 means right wrist: the lead polarity is reversed relative to
+            # standard ECG convention, so the signal must be negated for correct display.
+            # wearposition=1 (left wrist) and unknown positions are left as-is.
+            wear_position = measurement.get("wear_position")
+            waveform_samples = [-s for s in raw_samples] if wear_position == 2 else raw_samples
+            sampling_freq = measurement.get("sampling_frequency", 500)
+
+            # Map Withings afib int (0=normal, 1=afib, 2=inconclusive) to classification keys
+            # recognized by ECGTransformer._create_afib_interpretation / AFIB_INTERPRETATION_CODES
+            afib_code_map = {0: "NEGATIVE", 1: "POSITIVE", 2: "INCONCLUSIVE"}
+            afib_code = afib_code_map.get(afib_result, "INCONCLUSIVE") if afib_result is not None else None
+
+            record = self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.ECG,
+                timestamp=measurement["timestamp"],
+                value=float(heart_rate) if heart_rate is not None else 0.0,
+                unit="bpm",
+                device_id=measurement.get("device_id"),
+                metadata={
+                    "source": WITHINGS_SOURCE,
+                    "device_model": measurement.get("device_model"),
+                    "ecg_metrics": {
+                        "result_classification": afib_code,
+                        "afib": measurement.get("afib_classification"),
+                        "signal_id": measurement.get("signal_id"),
+                        "qrs_interval": measurement.get("qrs_interval"),
+                        "pr_interval": measurement.get("pr_interval"),
+                        "qt_interval": measurement.get("qt_interval"),
+                        "qtc_interval": measurement.get("qtc_interval"),
+                    },
+                    "waveform_data": {
+                        "samples": waveform_samples,
+                        "sampling_frequency_hz": sampling_freq,
+                        "scaling_factor": 1,
+                        "number_of_samples": len(waveform_samples),
+                        "lead_number": 1,
+                        "duration_seconds": (len(waveform_samples) / max(sampling_freq, 1) if waveform_samples else 0),
+                    },
+                },
+                measurement_source=measurement.get("measurement_source", MeasurementSource.DEVICE),
+            )
+            records.append(record)
+
         return records
 
+    def _build_temperature_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build temperature records from Withings data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.TEMPERATURE,
+                timestamp=measurement["timestamp"],
+                value=measurement["value"],
+                unit=FHIR_UNITS["temperature"]["display"],
+                device_id=measurement.get("device_id"),
+                metadata={
+                    "source": WITHINGS_SOURCE,
+                    "measurement_id": measurement.get("measurement_id"),
+                    # One measure group can hold several temperature meastypes (12, 71, 73)
+                    "meastype": measurement.get("meastype"),
+                    "category": measurement.get("category"),
+                },
+                measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
+            )
+            for measurement in raw_data
+        ]
+
+    def _build_spo2_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build SpO2 records from Withings data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.SPO2,
+                timestamp=measurement["timestamp"],
+                value=measurement["value"],
+                unit=FHIR_UNITS["spo2"]["display"],
+                device_id=measurement.get("device_id"),
+                metadata={
+                    "source": WITHINGS_SOURCE,
+                    "measurement_id": measurement.get("measurement_id"),
+                    "category": measurement.get("category"),
+                },
+                measurement_source=measurement.get("measurement_source", MeasurementSource.UNKNOWN),
+            )
+            for measurement in raw_data
+        ]
+
+    def _build_sleep_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build sleep records from Withings data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.SLEEP,
+                timestamp=measurement["timestamp"],
+                value={
+                    "duration": measurement.get("duration"),
+                    "deep_sleep_duration": measurement.get("deep_sleep_duration"),
+                    "light_sleep_duration": measurement.get("light_sleep_duration"),
+                    "rem_sleep_duration": measurement.get("rem_sleep_duration"),
+                    "wake_up_count": measurement.get("wake_up_count"),
+                },
+                unit="seconds",
+                device_id=measurement.get("device_id"),
+                metadata={
+                    "source": WITHINGS_SOURCE,
+                    "end_timestamp": (
+                        measurement["end_timestamp"].isoformat() if measurement.get("end_timestamp") else None
+                    ),
+                },
+                measurement_source=measurement.get("measurement_source", MeasurementSource.DEVICE),
+            )
+            for measurement in raw_data
+        ]
+
+    def _build_rr_intervals_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build RR interval records from Withings data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.RR_INTERVALS,
+                timestamp=measurement["timestamp"],
+                value=measurement["value"],
+                unit=FHIR_UNITS["time_ms"]["display"],
+                device_id=measurement.get("device_id"),
+                metadata={
+                    "source": WITHINGS_SOURCE,
+                    "hr": measurement.get("hr"),
+                },
+                measurement_source=measurement.get("measurement_source", MeasurementSource.DEVICE),
+            )
+            for measurement in raw_data
+        ]
+
+    # Dispatch table from data type to record builder; also defines the supported data types
+    _RECORD_BUILDERS = {
+        HealthDataType.HEART_RATE: _build_heart_rate_records,
+        HealthDataType.STEPS: _build_steps_records,
+        HealthDataType.WEIGHT: _build_weight_records,
+        HealthDataType.BLOOD_PRESSURE: _build_blood_pressure_records,
+        HealthDataType.ECG: _build_ecg_records,
+        HealthDataType.TEMPERATURE: _build_temperature_records,
+        HealthDataType.SPO2: _build_spo2_records,
+        HealthDataType.SLEEP: _build_sleep_records,
+        HealthDataType.RR_INTERVALS: _build_rr_intervals_records,
+    }
+    _SUPPORTED = frozenset(_RECORD_BUILDERS)
+
 
 class FitbitHealthDataManager(BaseHealthDataManager):
     """Health data manager for Fitbit"""
 
+    logger = logging.getLogger(f"{__name__}.FitbitHealthDataManager")
+
     def __init__(self):
         super().__init__(Provider.FITBIT)
 
-    def get_supported_data_types(self) -> list[HealthDataType]:
-        """Fitbit supports heart rate, steps, weight, sleep, ECG, and HRV"""
-        return [
-            HealthDataType.HEART_RATE,
-            HealthDataType.STEPS,
-            HealthDataType.WEIGHT,
-            HealthDataType.SLEEP,
-            HealthDataType.ECG,
-            HealthDataType.RR_INTERVALS,
-        ]
-
     def fetch_health_data(
         self, user_id: str, data_types: list[HealthDataType], date_range: DateRange, sync_trigger: SyncTrigger
     ) -> list[HealthDataRecord]:
@@ -401,31 +557,14 @@ class FitbitHealthDataManager(BaseHealthDataManager):
             # Create real API client
             client = get_unified_health_data_client()
 
-            # Fetch data for each requested type
-            all_records = []
-
-            for data_type in data_types:
-                if data_type not in self.get_supported_data_types():
-                    self.logger.warning(f"Data type {data_type} not supported by Fitbit")
-                    continue
-
-                try:
-                    records = self._fetch_data_type(client, user_id, data_type, date_range)
-                    all_records.extend(records)
-                    self.logger.info(f"Fetched {len(records)} {data_type} records from Fitbit")
-                except APIError as e:
-                    self.logger.error(f"API error fetching {data_type} from Fitbit: {e}")
-                    # Continue with other data types
-                except Exception as e:
-                    self.logger.error(f"Unexpected error fetching {data_type} from Fitbit: {e}")
-
-            return all_records
+            # Fetch requested types concurrently; a failing type doesn't abort the others
+            return self._fetch_data_types(client, user_id, data_types, date_range)
 
         except APIError as e:
-            self.logger.error(f"API error fetching Fitbit health data for user {user_id}: {e}")
+            self.logger.error("API error fetching Fitbit health data for user %s: %s", user_id, e)
             raise
         except Exception as e:
-            self.logger.error(f"Error fetching Fitbit health data for user {user_id}: {e}")
+            self.logger.error("Error fetching Fitbit health data for user %s: %s", user_id, e)
             raise
 
     def _fetch_data_type(
@@ -436,147 +575,199 @@ class FitbitHealthDataManager(BaseHealthDataManager):
         date_range: DateRange,
     ) -> list[HealthDataRecord]:
         """Fetch specific data type from Fitbit using the unified client API"""
-        records = []
+        build_records = self._RECORD_BUILDERS.get(data_type)
+        if build_records is None:
+            raise ValueError(f"Data type {data_type} not supported by Fitbit")
 
         try:
             # Use the unified client API to fetch data
-            raw_data = client.get_health_data(Provider.FITBIT, data_type, user_id, date_range)
-
-            if data_type == HealthDataType.HEART_RATE:
-                for data_point in raw_data:
-                    metadata = {
-                        "source": "fitbit_api",
-                        "heart_rate_type": data_point.get("heart_rate_type", "resting"),
-                    }
-                    if data_point.get("heart_rate_zones"):
-                        metadata["heart_rate_zones"] = data_point["heart_rate_zones"]
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.HEART_RATE,
-                        timestamp=data_point["timestamp"],
-                        value=float(data_point["value"]),
-                        unit=FHIR_UNITS["heart_rate"]["display"],
-                        device_id=data_point.get("device_id"),
-                        metadata=metadata,
-                        measurement_source=data_point.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.STEPS:
-                for data_point in raw_data:
-                    if data_point.get("steps", 0) > 0:
-                        record = self._create_health_record(
-                            user_id=user_id,
-                            data_type=HealthDataType.STEPS,
-                            timestamp=data_point["date"],
-                            value=float(data_point["steps"]),
-                            unit=FHIR_UNITS["steps"]["display"],
-                            device_id=data_point.get("device_id"),
-                            metadata={"source": "fitbit_api"},
-                            measurement_source=data_point.get("measurement_source", MeasurementSource.UNKNOWN),
-                        )
-                        records.append(record)
-
-            elif data_type == HealthDataType.WEIGHT:
-                for data_point in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.WEIGHT,
-                        timestamp=data_point["timestamp"],
-                        value=float(data_point["value"]),
-                        unit=FHIR_UNITS["weight"]["display"],
-                        device_id=data_point.get("device_id"),
-                        metadata={
-                            "source": "fitbit_api",
-                            "fitbit_source": data_point.get("source"),
-                            "log_id": data_point.get("log_id"),
-                            "bmi": data_point.get("bmi"),
-                        },
-                        measurement_source=data_point.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.SLEEP:
-                for data_point in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.SLEEP,
-                        timestamp=data_point["timestamp"],
-                        value=float(data_point["value"]),  # minutes asleep
-                        unit=data_point.get("unit", FHIR_UNITS["time_min"]["display"]),
-                        device_id=data_point.get("device_id"),
-                        metadata={
-                            "source": "fitbit_api",
-                            "fitbit_log_type": data_point.get("log_type"),
-                            "log_id": data_point.get("log_id"),
-                            "end_time": (data_point["end_time"].isoformat() if data_point.get("end_time") else None),
-                            "sleep_metrics": data_point.get("sleep_metrics", {}),
-                        },
-                        measurement_source=data_point.get("measurement_source", MeasurementSource.UNKNOWN),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.ECG:
-                for data_point in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.ECG,
-                        timestamp=data_point["timestamp"],
-                        value={
-                            "heart_rate": data_point.get("value"),
-                            "ecg_metrics": data_point.get("ecg_metrics", {}),
-                        },
-                        unit=data_point.get("unit", "uV"),
-                        device_id=data_point.get("device_id"),
-                        metadata={
-                            "source": "fitbit_api",
-                            "ecg_metrics": data_point.get("ecg_metrics", {}),
-                            "waveform_data": data_point.get("waveform_data", {}),
-                        },
-                        measurement_source=data_point.get("measurement_source", MeasurementSource.DEVICE),
-                    )
-                    records.append(record)
-
-            elif data_type == HealthDataType.RR_INTERVALS:
-                for data_point in raw_data:
-                    record = self._create_health_record(
-                        user_id=user_id,
-                        data_type=HealthDataType.RR_INTERVALS,
-                        timestamp=data_point["timestamp"],
-                        value=float(data_point["value"]),  # RMSSD value
-                        unit=data_point.get("unit", FHIR_UNITS["time_ms"]["display"]),
-                        device_id=data_point.get("device_id"),
-                        metadata={
-                            "source": "fitbit_api",
-                            "hrv_metrics": data_point.get("hrv_metrics", {}),
-                            "data_source": "hrv_intraday",
-                        },
-                        measurement_source=data_point.get("measurement_source", MeasurementSource.DEVICE),
-                    )
-                    records.append(record)
+            raw_data = self._fetch_raw_data(client, user_id, data_type, date_range)
+            return build_records(self, user_id, raw_data)
 
         except APIError as e:
-            self.logger.error(f"API error fetching {data_type} from Fitbit: {e}")
+            self.logger.error("API error fetching %s from Fitbit: %s", data_type, e)
             raise
         except Exception as e:
-            self.logger.error(f"Error processing {data_type} data from Fitbit: {e}")
+            self.logger.error("Error processing %s data from Fitbit: %s", data_type, e)
             raise
 
+    def _build_heart_rate_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build heart rate records from Fitbit data (intraday volume: lookups hoisted, built positionally)"""
+        records: list[HealthDataRecord] = []
+        make_record = HealthDataRecord
+        provider = self.provider
+        data_type = HealthDataType.HEART_RATE
+        append = records.append
+        unit = FHIR_UNITS["heart_rate"]["display"]
+        unknown = MeasurementSource.UNKNOWN
+        for data_point in raw_data:
+            get = data_point.get
+            metadata = {
+                "source": FITBIT_SOURCE,
+                "heart_rate_type": get("heart_rate_type", "resting"),
+            }
+            if heart_rate_zones := get("heart_rate_zones"):
+                metadata["heart_rate_zones"] = heart_rate_zones
+            append(
+                make_record(
+                    provider,
+                    user_id,
+                    data_type,
+                    data_point["timestamp"],
+                    data_point["value"],
+                    unit,
+                    get("device_id"),
+                    metadata,
+                    get("measurement_source", unknown),
+                )
+            )
+
         return records
 
+    def _build_steps_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build steps records from Fitbit data"""
+        make_record = HealthDataRecord
+        provider = self.provider
+        data_type = HealthDataType.STEPS
+        unit = FHIR_UNITS["steps"]["display"]
+        unknown = MeasurementSource.UNKNOWN
+        return [
+            make_record(
+                provider,
+                user_id,
+                data_type,
+                data_point["date"],
+                float(data_point["steps"]),
+                unit,
+                data_point.get("device_id"),
+                _FITBIT_STEPS_METADATA,
+                data_point.get("measurement_source", unknown),
+            )
+            for data_point in raw_data
+            if data_point.get("steps", 0) > 0
+        ]
+
+    def _build_weight_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build weight records from Fitbit data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.WEIGHT,
+                timestamp=data_point["timestamp"],
+                value=data_point["value"],
+                unit=FHIR_UNITS["weight"]["display"],
+                device_id=data_point.get("device_id"),
+                metadata={
+                    "source": FITBIT_SOURCE,
+                    "fitbit_source": data_point.get("source"),
+                    "log_id": data_point.get("log_id"),
+                    "bmi": data_point.get("bmi"),
+                },
+                measurement_source=data_point.get("measurement_source", MeasurementSource.UNKNOWN),
+            )
+            for data_point in raw_data
+        ]
+
+    def _build_sleep_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build sleep records from Fitbit data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.SLEEP,
+                timestamp=data_point["timestamp"],
+                value=data_point["value"],  # minutes asleep
+                unit=data_point.get("unit", FHIR_UNITS["time_min"]["display"]),
+                device_id=data_point.get("device_id"),
+                metadata={
+                    "source": FITBIT_SOURCE,
+                    "fitbit_log_type": data_point.get("log_type"),
+                    "log_id": data_point.get("log_id"),
+                    "end_time": (data_point["end_time"].isoformat() if data_point.get("end_time") else None),
+                    "sleep_metrics": data_point.get("sleep_metrics", {}),
+                },
+                measurement_source=data_point.get("measurement_source", MeasurementSource.UNKNOWN),
+            )
+            for data_point in raw_data
+        ]
+
+    def _build_ecg_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build ECG records from Fitbit data"""
+        return [
+            self._create_health_record(
+                user_id=user_id,
+                data_type=HealthDataType.ECG,
+                timestamp=data_point["timestamp"],
+                value={
+                    "heart_rate": data_point.get("value"),
+                    "ecg_metrics": data_point.get("ecg_metrics", {}),
+                },
+                unit=data_point.get("unit", "uV"),
+                device_id=data_point.get("device_id"),
+                metadata={
+                    "source": FITBIT_SOURCE,
+                    "ecg_metrics": data_point.get("ecg_metrics", {}),
+                    "waveform_data": data_point.get("waveform_data", {}),
+                },
+                measurement_source=data_point.get("measurement_source", MeasurementSource.DEVICE),
+            )
+            for data_point in raw_data
+        ]
+
+    def _build_rr_intervals_records(self, user_id: str, raw_data: list[dict[str, Any]]) -> list[HealthDataRecord]:
+        """Build RR interval records from Fitbit data"""
+        make_record = HealthDataRecord
+        provider = self.provider
+        data_type = HealthDataType.RR_INTERVALS
+        default_unit = FHIR_UNITS["time_ms"]["display"]
+        device = MeasurementSource.DEVICE
+        return [
+            make_record(
+                provider,
+                user_id,
+                data_type,
+                data_point["timestamp"],
+                data_point["value"],  # RMSSD value
+                data_point.get("unit", default_unit),
+                data_point.get("device_id"),
+                {
+                    "source": FITBIT_SOURCE,
+                    "hrv_metrics": data_point.get("hrv_metrics", {}),
+                    "data_source": "hrv_intraday",
+                },
+                data_point.get("measurement_source", device),
+            )
+            for data_point in raw_data
+        ]
+
+    # Dispatch table from data type to record builder; also defines the supported data types
+    _RECORD_BUILDERS = {
+        HealthDataType.HEART_RATE: _build_heart_rate_records,
+        HealthDataType.STEPS: _build_steps_records,
+        HealthDataType.WEIGHT: _build_weight_records,
+        HealthDataType.SLEEP: _build_sleep_records,
+        HealthDataType.ECG: _build_ecg_records,
+        HealthDataType.RR_INTERVALS: _build_rr_intervals_records,
+    }
+    _SUPPORTED = frozenset(_RECORD_BUILDERS)
+
 
 class HealthDataManagerFactory:
     """Factory for creating health data managers"""
 
     _managers = {Provider.WITHINGS: WithingsHealthDataManager, Provider.FITBIT: FitbitHealthDataManager}
+    # Managers hold no per-sync state, so one instance per provider is shared
+    _instances: dict[Provider, HealthDataManager] = {}
 
     @classmethod
     def create(cls, provider: Provider) -> HealthDataManager:
-        """Create a health data manager for the given provider"""
-        if provider not in cls._managers:
-            raise ValueError(f"Unsupported health data provider: {provider}")
+        """Get the health data manager for the given provider"""
+        manager = cls._instances.get(provider)
+        if manager is None:
+            if provider not in cls._managers:
+                raise ValueError(f"Unsupported health data provider: {provider}")
+            manager = cls._instances.setdefault(provider, cls._managers[provider]())
 
-        return cls._managers[provider]()
+        return manager
 
     @classmethod
     def get_supported_providers(cls) -> list[Provider]:
@@ -584,10 +775,12 @@ class HealthDataManagerFactory:
         return list(cls._managers.keys())
 
     @classmethod
-    def get_supported_data_types(cls, provider: Provider) -> list[HealthDataType]:
+    def get_supported_data_types(cls, provider: Provider) -> tuple[HealthDataType, ...]:
         """Get supported data types for a provider"""
-        manager = cls.create(provider)
-        return manager.get_supported_data_types()
+        if provider not in cls._managers:
+            raise ValueError(f"Unsupported health data provider: {provider}")
+
+        return cls._managers[provider].get_supported_data_types()
 
 
 # ============================================================================
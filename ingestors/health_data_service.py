@@ -4,11 +4,18 @@ Health data synchronization service
 
 import logging
 import time
-from typing import Any
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, ClassVar
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
 from django.utils import timezone
 
+from base.models import ProviderLink
+from publishers.fhir.client import FHIRClient, create_pooled_session
 from publishers.fhir.health_data_publisher import HealthDataPublisher
 from transformers.health_data_transformers import HealthDataTransformer
 
@@ -18,6 +25,7 @@ from .health_data_constants import (
     HealthSyncConfig,
     HealthSyncResult,
     Provider,
+    provider_from_value,
 )
 from .health_data_manager import HealthDataManagerFactory
 from .health_sync_strategies import SyncStrategy, get_default_sync_strategy
@@ -28,9 +36,11 @@ logger = logging.getLogger(__name__)
 class HealthDataSyncService:
     """Main health data synchronization service"""
 
+    # The transformer holds no per-sync state, so every service in the process shares one
+    transformer: ClassVar[HealthDataTransformer] = HealthDataTransformer()
+
     def __init__(self, fhir_publisher: HealthDataPublisher | None = None):
         self.fhir_publisher = fhir_publisher or HealthDataPublisher()
-        self.transformer = HealthDataTransformer()
         self.logger = logging.getLogger(f"{__name__}.HealthDataSyncService")
 
     def sync_user_health_data(
@@ -62,7 +72,7 @@ class HealthDataSyncService:
 
         # Convert provider to enum if needed
         if isinstance(provider, str):
-            provider = Provider(provider)
+            provider = provider_from_value(provider)
 
         # Default patient reference
         if patient_reference is None:
@@ -74,9 +84,7 @@ class HealthDataSyncService:
 
         # Determine sync strategy
         if sync_strategy is None:
-            # Check if user has synced before (simplified for Phase 1)
-            user_has_synced_before = False  # TODO: Implement proper check
-            sync_strategy = get_default_sync_strategy(user_has_synced_before)
+            sync_strategy = get_default_sync_strategy(self._user_has_synced_before(user_id, provider))
 
         # Initialize result
         result = HealthSyncResult(
@@ -88,10 +96,11 @@ class HealthDataSyncService:
 
             # 1. Get sync parameters
             sync_params = sync_strategy.get_sync_params(user_id, data_types, config)
-            self.logger.debug(f"Sync parameters: {sync_params}")
+            self.logger.debug("Sync parameters: %s", sync_params)
 
-            # 2. Fetch health data from provider
-            health_records = self._fetch_health_data(user_id, provider, data_types, sync_params)
+            # 2. Fetch health data from provider, for the data types enabled in the user's config
+            enabled_data_types = [data_type for data_type in data_types if data_type in config.enabled_data_types]
+            health_records = self._fetch_health_data(user_id, provider, enabled_data_types, sync_params)
             result.records_fetched = len(health_records)
 
             if not health_records:
@@ -101,38 +110,56 @@ class HealthDataSyncService:
 
             self.logger.info(f"Fetched {len(health_records)} health records from {provider.value}")
 
-            # 3. Transform to FHIR resources
-            fhir_observations = self._transform_health_data(health_records, patient_reference, device_reference)
-            result.records_transformed = len(fhir_observations)
+            # 3. Transform to FHIR resources and publish batch by batch, so only the in-flight
+            # batches of observations are held in memory on long initial syncs
+            batch_size = sync_params.get("batch_size")
+            if batch_size is None:
+                batch_size = settings.HEALTH_DATA_CONFIG["BATCH_SIZES"]["PUBLISHER"]
+            batches = [
+                health_records[start : start + batch_size] for start in range(0, len(health_records), batch_size)
+            ]
+
+            # 4. Publish to FHIR server
+            outcomes = self._map_batches_concurrently(
+                lambda batch: self._transform_and_publish(batch, patient_reference, device_reference, sync_params),
+                batches,
+            )
+
+            published_all = True
+            for records_transformed, publish_result in outcomes:
+                if publish_result is None:
+                    continue
+                result.records_transformed += records_transformed
+                result.fhir_resources_created += publish_result.get("published_successfully", 0)
+                published_all = published_all and publish_result.get("success", False)
 
-            if not fhir_observations:
+                # 5. Handle publishing errors
+                if publish_result.get("errors"):
+                    result.errors.extend(publish_result["errors"])
+
+            if not result.records_transformed:
                 self.logger.warning(f"No FHIR observations created from {len(health_records)} records")
                 result.success = True
                 return result
 
-            self.logger.info(f"Transformed {len(fhir_observations)} health records to FHIR observations")
-
-            # 4. Publish to FHIR server
-            publish_result = self._publish_health_data(fhir_observations, sync_params)
-            result.fhir_resources_created = publish_result.get("published_successfully", 0)
-
-            # 5. Handle publishing errors
-            if publish_result.get("errors"):
-                result.errors.extend(publish_result["errors"])
+            self.logger.info(f"Transformed {result.records_transformed} health records to FHIR observations")
 
             # 6. Determine success
-            result.success = len(result.errors or []) == 0 and publish_result.get("success", False)
+            result.success = len(result.errors) == 0 and published_all
+            if result.success:
+                self._mark_user_synced(user_id, provider)
 
             # 7. Calculate processing time
             result.processing_time_ms = int((time.time() - start_time) * 1000)
 
             self.logger.info(
-                f"Health data sync completed for user {user_id}: "
-                f"{result.records_fetched} fetched, "
-                f"{result.records_transformed} transformed, "
-                f"{result.fhir_resources_created} published, "
-                f"{len(result.errors or [])} errors, "
-                f"{result.processing_time_ms}ms"
+                "Health data sync completed for user %s: %d fetched, %d transformed, %d published, %d errors, %dms",
+                user_id,
+                result.records_fetched,
+                result.records_transformed,
+                result.fhir_resources_created,
+                len(result.errors),
+                result.processing_time_ms,
             )
 
             return result
@@ -140,11 +167,59 @@ class HealthDataSyncService:
         except Exception as e:
             error_msg = f"Unexpected error in health data sync for user {user_id}: {e}"
             self.logger.error(error_msg)
-            assert result.errors is not None  # Initialized in __post_init__
             result.errors.append(error_msg)
             result.processing_time_ms = int((time.time() - start_time) * 1000)
             return result
 
+    def _transform_and_publish(
+        self,
+        health_records: list[HealthDataRecord],
+        patient_reference: str,
+        device_reference: str | None,
+        sync_params: dict[str, Any],
+    ) -> tuple[int, dict[str, Any] | None]:
+        """Transform one batch of records and publish it; None result when nothing was transformed"""
+        fhir_observations = self._transform_health_data(health_records, patient_reference, device_reference)
+        if not fhir_observations:
+            return 0, None
+        return len(fhir_observations), self._publish_health_data(fhir_observations, sync_params)
+
+    def _map_batches_concurrently[T, R](self, fn: Callable[[T], R], batches: list[T]) -> list[R]:
+        """Apply fn to batches on a bounded thread pool (FHIR_CLIENT_CONFIG["PUBLISH_WORKERS"]), preserving order
+
+        FHIR publishing is network-bound, so batches overlap their round trips. A single batch
+        runs inline. Worker threads release their DB connections when done.
+        """
+        max_workers = min(settings.FHIR_CLIENT_CONFIG.get("PUBLISH_WORKERS", 4), len(batches))
+        if max_workers <= 1:
+            return [fn(batch) for batch in batches]
+
+        def run(batch: T) -> R:
+            try:
+                return fn(batch)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fhir-publish") as pool:
+            return list(pool.map(run, batches))
+
+    def _user_has_synced_before(self, user_id: str, provider: Provider) -> bool:
+        """Whether the user has a recorded health data sync with the provider, cached per user and provider"""
+        cache_key = _synced_before_cache_key(user_id, provider)
+        synced_before = cache.get(cache_key)
+        if synced_before is None:
+            synced_before = ProviderLink.objects.filter(
+                user__ehr_user_id=user_id,
+                provider__provider_type=provider.value,
+                extra_data__has_key="last_health_data_sync",
+            ).exists()
+            cache.set(cache_key, synced_before, settings.CACHE_TIMEOUTS["HEALTH_SYNC_HISTORY"])
+        return synced_before
+
+    def _mark_user_synced(self, user_id: str, provider: Provider) -> None:
+        """Record a successful sync so later default strategies are incremental"""
+        cache.set(_synced_before_cache_key(user_id, provider), True, settings.CACHE_TIMEOUTS["HEALTH_SYNC_HISTORY"])
+
     def _create_default_config(self, user_id: str, data_types: list[HealthDataType]) -> HealthSyncConfig:
         """Create default sync configuration"""
         from datetime import timedelta
@@ -153,7 +228,7 @@ class HealthDataSyncService:
 
         return HealthSyncConfig(
             user_id=user_id,
-            enabled_data_types=data_types,
+            enabled_data_types=frozenset(data_types),
             aggregation_preference=AggregationLevel.INDIVIDUAL,  # No aggregation in Phase 1
             sync_frequency=SyncFrequency.DAILY,
             retention_period=timedelta(days=90),
@@ -167,13 +242,31 @@ class HealthDataSyncService:
             # Create health data manager for provider
             health_manager = HealthDataManagerFactory.create(provider)
 
+            # Drop types the provider can't serve before the manager opens an API client
+            supported = health_manager.supported_data_types_set()
+            fetchable: list[HealthDataType] = []
+            unsupported: list[HealthDataType] = []
+            for data_type in data_types:
+                if data_type in supported:
+                    fetchable.append(data_type)
+                else:
+                    unsupported.append(data_type)
+            if unsupported:
+                self.logger.debug(
+                    "Skipping data types not supported by %s: %s",
+                    provider.value,
+                    [data_type.value for data_type in unsupported],
+                )
+            if not fetchable:
+                return []
+
             # Extract date range and sync trigger from params
             date_range = sync_params["date_range"]
             sync_trigger = sync_params["sync_trigger"]
 
             # Fetch data
             health_records = health_manager.fetch_health_data(
-                user_id=user_id, data_types=data_types, date_range=date_range, sync_trigger=sync_trigger
+                user_id=user_id, data_types=fetchable, date_range=date_range, sync_trigger=sync_trigger
             )
 
             return health_records
@@ -201,9 +294,14 @@ class HealthDataSyncService:
         self, fhir_observations: list[dict[str, Any]], sync_params: dict[str, Any]
     ) -> dict[str, Any]:
         """Publish FHIR observations to server"""
+        if not fhir_observations:
+            return {"published_successfully": 0, "errors": [], "success": True}
+
         try:
-            # Get batch size from sync params
-            batch_size = sync_params.get("batch_size", settings.HEALTH_DATA_CONFIG["BATCH_SIZES"]["PUBLISHER"])
+            # Get batch size from sync params, falling back to settings only when absent
+            batch_size = sync_params.get("batch_size")
+            if batch_size is None:
+                batch_size = settings.HEALTH_DATA_CONFIG["BATCH_SIZES"]["PUBLISHER"]
 
             # Publish observations
             publish_result = self.fhir_publisher.publish_health_observations(
@@ -238,7 +336,7 @@ class HealthDataSyncService:
         """Delete all health data for a user from a specific provider"""
         try:
             if isinstance(provider, str):
-                provider = Provider(provider)
+                provider = provider_from_value(provider)
 
             patient_ref = f"Patient/{user_id}"
 
@@ -258,6 +356,44 @@ class HealthDataSyncService:
             return {"success": False, "error": str(e), "deleted_count": 0}
 
 
+def _synced_before_cache_key(user_id: str, provider: Provider) -> str:
+    """Cache key for whether a user has completed a health data sync with a provider"""
+    return f"health_synced_before:{provider.value}:{user_id}"
+
+
+# Global service instance
+_health_data_sync_service: HealthDataSyncService | None = None
+_health_data_sync_service_lock = Lock()
+
+
+def get_health_data_sync_service() -> HealthDataSyncService:
+    """
+    Lazy, thread-safe singleton for global service instance
+
+    Sync tasks in a worker share the service, its transformer and one pooled FHIR
+    session sized by HEALTH_DATA_CONFIG["HTTP_POOL_SIZE"].
+    """
+    global _health_data_sync_service
+    if _health_data_sync_service is None:
+        with _health_data_sync_service_lock:
+            if _health_data_sync_service is None:
+                session = create_pooled_session(settings.HEALTH_DATA_CONFIG.get("HTTP_POOL_SIZE", 10))
+                _health_data_sync_service = HealthDataSyncService(
+                    fhir_publisher=HealthDataPublisher(fhir_client=FHIRClient(session=session))
+                )
+    return _health_data_sync_service
+
+
+# Mock value per data type: (base value, increment per data type position, unit)
+_MOCK_RECORD_TEMPLATES: dict[HealthDataType, tuple[float, float, str]] = {
+    HealthDataType.HEART_RATE: (72.0, 1.0, "bpm"),
+    HealthDataType.STEPS: (1000.0, 100.0, "steps"),
+}
+
+# Shared by all mock records; records treat metadata as read-only
+_MOCK_METADATA = {"source": "mock"}
+
+
 class MockHealthDataSyncService(HealthDataSyncService):
     """Mock health data sync service for testing"""
 
@@ -281,30 +417,22 @@ class MockHealthDataSyncService(HealthDataSyncService):
         base_time = timezone.now() - timedelta(hours=1)
 
         for i, data_type in enumerate(data_types):
-            if data_type == HealthDataType.HEART_RATE:
-                record = HealthDataRecord(
-                    provider=provider,
-                    user_id=user_id,
-                    data_type=data_type,
-                    timestamp=base_time + timedelta(minutes=i * 10),
-                    value=72.0 + i,
-                    unit="bpm",
-                    metadata={"source": "mock"},
-                )
-            elif data_type == HealthDataType.STEPS:
-                record = HealthDataRecord(
+            template = _MOCK_RECORD_TEMPLATES.get(data_type)
+            if template is None:
+                continue  # Skip unsupported types in mock
+
+            base_value, value_step, unit = template
+            mock_records.append(
+                HealthDataRecord(
                     provider=provider,
                     user_id=user_id,
                     data_type=data_type,
                     timestamp=base_time + timedelta(minutes=i * 10),
-                    value=1000.0 + i * 100,
-                    unit="steps",
-                    metadata={"source": "mock"},
+                    value=base_value + i * value_step,
+                    unit=unit,
+                    metadata=_MOCK_METADATA,
                 )
-            else:
-                continue  # Skip unsupported types in mock
-
-            mock_records.append(record)
+            )
 
         return mock_records
 
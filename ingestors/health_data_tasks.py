@@ -2,12 +2,17 @@
 Huey tasks for health data synchronization
 """
 
+import json
 import logging
+import random
 from datetime import datetime
 from typing import Any
 
+from django.conf import settings
 from django.db import close_old_connections
+from django_redis import get_redis_connection
 from huey import crontab
+from huey.api import Task
 
 from base.models import EHRUser, ProviderLink
 from open_health_exchange.settings import HUEY
@@ -16,10 +21,14 @@ from .health_data_constants import (
     DateRange,
     HealthDataType,
     Provider,
+    data_types_from_values,
+    provider_from_value,
 )
-from .health_data_service import HealthDataSyncService
+from .health_data_service import get_health_data_sync_service
 from .health_sync_strategies import SyncStrategy, SyncStrategyFactory
+from .provider_link_data import merged_extra_data
 from .result_serialization import result_to_dict
+from .task_queue import active_provider_links, enqueue_link_tasks
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +40,7 @@ def sync_user_health_data_realtime(
     data_types: list[str],
     trigger_type: str = "webhook",
     date_range: dict[str, str] | None = None,
+    validated: bool = False,
 ) -> dict[str, Any]:
     """
     Real-time health data sync triggered by webhooks
@@ -41,6 +51,7 @@ def sync_user_health_data_realtime(
         data_types: List of health data type strings
         trigger_type: What triggered this sync
         date_range: Optional custom date range
+        validated: Caller already confirmed the EHR user exists
 
     Returns:
         Sync result dictionary
@@ -51,9 +62,10 @@ def sync_user_health_data_realtime(
     try:
         # Validate inputs
         try:
-            EHRUser.objects.get(ehr_user_id=user_id)
-            provider = Provider(provider_name)
-            data_type_enums = [HealthDataType(dt) for dt in data_types]
+            if not validated:
+                EHRUser.objects.get(ehr_user_id=user_id)
+            provider = provider_from_value(provider_name)
+            data_type_enums = data_types_from_values(data_types)
         except EHRUser.DoesNotExist:
             error_msg = f"EHR user {user_id} not found"
             logger.error(error_msg)
@@ -76,8 +88,8 @@ def sync_user_health_data_realtime(
             except Exception as e:
                 logger.warning(f"Invalid date range, using default: {e}")
 
-        # Create sync service
-        sync_service = HealthDataSyncService()
+        # Shared per-worker sync service
+        sync_service = get_health_data_sync_service()
 
         # Perform sync
         result = sync_service.sync_user_health_data(
@@ -86,14 +98,13 @@ def sync_user_health_data_realtime(
 
         # Update provider link with sync information
         try:
-            user = EHRUser.objects.get(ehr_user_id=user_id)
-            _update_provider_link_health_sync_info(user, provider, result)
+            _update_provider_link_health_sync_info(user_id, provider, result)
         except Exception as e:
             logger.warning(f"Could not update provider link: {e}")
 
         result_dict = result_to_dict(result)
 
-        logger.info(f"Real-time health data sync completed for user {user_id}: {result_dict}")
+        logger.info("Real-time health data sync completed for user %s: %s", user_id, result_dict)
         return result_dict
 
     except Exception as e:
@@ -102,9 +113,126 @@ def sync_user_health_data_realtime(
         return {"error": error_msg, "success": False}
 
 
+# Pending coalesced webhook state outlives the window so a delayed flush still finds it
+COALESCE_STATE_TTL_SECONDS = 300
+
+
+def queue_realtime_health_sync(
+    user_id: str,
+    provider_name: str,
+    data_types: list[str],
+    trigger_type: str = "webhook",
+    date_range: dict[str, str] | None = None,
+) -> str:
+    """
+    Queue a real-time health data sync, coalescing webhook bursts
+
+    Providers often send several notifications for one user within a second (one per
+    data type). Requests for the same user and provider arriving within
+    WEBHOOK_CONFIG["SYNC_COALESCE_SECONDS"] are merged into a single sync over the
+    union of their data types and date ranges.
+
+    Returns:
+        ID of the task that will perform the sync
+    """
+    window = settings.WEBHOOK_CONFIG.get("SYNC_COALESCE_SECONDS", 0)
+    if window <= 0:
+        return sync_user_health_data_realtime(
+            user_id=user_id,
+            provider_name=provider_name,
+            data_types=data_types,
+            trigger_type=trigger_type,
+            date_range=date_range,
+        ).id
+
+    conn = get_redis_connection("default")
+    key = _coalesce_key(user_id, provider_name)
+
+    # Record the request before claiming the flush so a concurrent flush either sees it or leaves
+    # the flag free for this caller to schedule a new one
+    with conn.pipeline() as pipe:
+        pipe.sadd(f"{key}:data_types", *data_types)
+        pipe.rpush(f"{key}:date_ranges", json.dumps(date_range))
+        pipe.expire(f"{key}:data_types", COALESCE_STATE_TTL_SECONDS)
+        pipe.expire(f"{key}:date_ranges", COALESCE_STATE_TTL_SECONDS)
+        pipe.execute()
+
+    task = flush_realtime_health_sync.s(user_id, provider_name, trigger_type, delay=window)
+    if conn.set(key, task.id, nx=True, ex=COALESCE_STATE_TTL_SECONDS):
+        HUEY.enqueue(task)
+        logger.debug(f"Scheduled coalesced real-time sync {task.id} for user {user_id} with {provider_name}")
+        return task.id
+
+    pending_task_id = conn.get(key)
+    return pending_task_id.decode() if pending_task_id else task.id
+
+
+@HUEY.task(priority=1)  # High priority for real-time sync
+def flush_realtime_health_sync(user_id: str, provider_name: str, trigger_type: str = "webhook") -> dict[str, Any]:
+    """
+    Run one real-time sync for all webhook requests coalesced for a user and provider
+
+    Args:
+        user_id: EHR user ID
+        provider_name: Provider name
+        trigger_type: What triggered this sync
+
+    Returns:
+        Sync result dictionary
+    """
+    conn = get_redis_connection("default")
+    key = _coalesce_key(user_id, provider_name)
+
+    # Take and clear the pending requests atomically; later webhooks start a new window
+    with conn.pipeline() as pipe:
+        pipe.smembers(f"{key}:data_types")
+        pipe.lrange(f"{key}:date_ranges", 0, -1)
+        pipe.delete(key, f"{key}:data_types", f"{key}:date_ranges")
+        raw_data_types, raw_date_ranges, _ = pipe.execute()
+
+    if not raw_data_types:
+        logger.debug(f"No pending real-time sync requests for user {user_id} with {provider_name}")
+        return {"success": True, "coalesced_requests": 0}
+
+    logger.info(
+        f"Running coalesced real-time sync for user {user_id} with {provider_name} "
+        f"({len(raw_date_ranges)} webhook requests)"
+    )
+    return sync_user_health_data_realtime.call_local(
+        user_id=user_id,
+        provider_name=provider_name,
+        data_types=sorted(data_type.decode() for data_type in raw_data_types),
+        trigger_type=trigger_type,
+        date_range=_merge_date_ranges([json.loads(date_range) for date_range in raw_date_ranges]),
+    )
+
+
+def _coalesce_key(user_id: str, provider_name: str) -> str:
+    """Redis key holding the pending coalesced sync for a user and provider"""
+    return f"ohe:webhook_sync:{provider_name}:{user_id}"
+
+
+def _merge_date_ranges(date_ranges: list[dict[str, str] | None]) -> dict[str, str] | None:
+    """Span of all requested date ranges; None (strategy default) if any request had no range"""
+    if not date_ranges or any(date_range is None for date_range in date_ranges):
+        return None
+
+    try:
+        starts = [datetime.fromisoformat(date_range["start"]) for date_range in date_ranges]
+        ends = [datetime.fromisoformat(date_range["end"]) for date_range in date_ranges]
+        return {"start": min(starts).isoformat(), "end": max(ends).isoformat()}
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Could not merge coalesced date ranges, using default: {e}")
+        return None
+
+
 @HUEY.task(priority=3)  # Medium priority for scheduled sync
 def sync_user_health_data_incremental(
-    user_id: str, provider_name: str, data_types: list[str] | None = None
+    user_id: str,
+    provider_name: str,
+    data_types: list[str] | None = None,
+    validated: bool = False,
+    provider_link_id: int | None = None,
 ) -> dict[str, Any]:
     """
     Incremental health data sync for regular updates
@@ -113,6 +241,8 @@ def sync_user_health_data_incremental(
         user_id: EHR user ID
         provider_name: Provider name
         data_types: Optional list of specific data types to sync
+        validated: Caller already confirmed the EHR user exists
+        provider_link_id: Provider link to record sync information on, if known
 
     Returns:
         Sync result dictionary
@@ -123,8 +253,9 @@ def sync_user_health_data_incremental(
     try:
         # Validate inputs
         try:
-            user = EHRUser.objects.get(ehr_user_id=user_id)
-            provider = Provider(provider_name)
+            if not validated:
+                EHRUser.objects.get(ehr_user_id=user_id)
+            provider = provider_from_value(provider_name)
         except EHRUser.DoesNotExist:
             error_msg = f"EHR user {user_id} not found"
             logger.error(error_msg)
@@ -137,7 +268,7 @@ def sync_user_health_data_incremental(
         # Determine data types to sync
         if data_types:
             try:
-                data_type_enums = [HealthDataType(dt) for dt in data_types]
+                data_type_enums = data_types_from_values(data_types)
             except ValueError as e:
                 error_msg = f"Invalid data type: {e}"
                 logger.error(error_msg)
@@ -149,8 +280,8 @@ def sync_user_health_data_incremental(
         # Create incremental sync strategy
         sync_strategy = SyncStrategyFactory.create_incremental_sync()
 
-        # Create sync service
-        sync_service = HealthDataSyncService()
+        # Shared per-worker sync service
+        sync_service = get_health_data_sync_service()
 
         # Perform sync
         result = sync_service.sync_user_health_data(
@@ -159,13 +290,13 @@ def sync_user_health_data_incremental(
 
         # Update provider link with sync information
         try:
-            _update_provider_link_health_sync_info(user, provider, result)
+            _update_provider_link_health_sync_info(user_id, provider, result, provider_link_id)
         except Exception as e:
             logger.warning(f"Could not update provider link: {e}")
 
         result_dict = result_to_dict(result)
 
-        logger.info(f"Incremental health data sync completed for user {user_id}: {result_dict}")
+        logger.info("Incremental health data sync completed for user %s: %s", user_id, result_dict)
         return result_dict
 
     except Exception as e:
@@ -176,7 +307,11 @@ def sync_user_health_data_incremental(
 
 @HUEY.task(priority=4)  # Low priority for initial sync
 def sync_user_health_data_initial(
-    user_id: str, provider_name: str, lookback_days: int = 30, data_types: list[str] | None = None
+    user_id: str,
+    provider_name: str,
+    lookback_days: int = 30,
+    data_types: list[str] | None = None,
+    validated: bool = False,
 ) -> dict[str, Any]:
     """
     Initial health data sync for new users
@@ -186,6 +321,7 @@ def sync_user_health_data_initial(
         provider_name: Provider name
         lookback_days: Number of days to sync historically
         data_types: Optional list of specific data types to sync
+        validated: Caller already confirmed the EHR user exists
 
     Returns:
         Sync result dictionary
@@ -198,8 +334,9 @@ def sync_user_health_data_initial(
     try:
         # Validate inputs
         try:
-            user = EHRUser.objects.get(ehr_user_id=user_id)
-            provider = Provider(provider_name)
+            if not validated:
+                EHRUser.objects.get(ehr_user_id=user_id)
+            provider = provider_from_value(provider_name)
         except EHRUser.DoesNotExist:
             error_msg = f"EHR user {user_id} not found"
             logger.error(error_msg)
@@ -212,7 +349,7 @@ def sync_user_health_data_initial(
         # Determine data types to sync
         if data_types:
             try:
-                data_type_enums = [HealthDataType(dt) for dt in data_types]
+                data_type_enums = data_types_from_values(data_types)
             except ValueError as e:
                 error_msg = f"Invalid data type: {e}"
                 logger.error(error_msg)
@@ -224,8 +361,8 @@ def sync_user_health_data_initial(
         # Create initial sync strategy
         sync_strategy = SyncStrategyFactory.create_initial_sync(lookback_days)
 
-        # Create sync service
-        sync_service = HealthDataSyncService()
+        # Shared per-worker sync service
+        sync_service = get_health_data_sync_service()
 
         # Perform sync
         result = sync_service.sync_user_health_data(
@@ -234,13 +371,13 @@ def sync_user_health_data_initial(
 
         # Update provider link with sync information
         try:
-            _update_provider_link_health_sync_info(user, provider, result)
+            _update_provider_link_health_sync_info(user_id, provider, result)
         except Exception as e:
             logger.warning(f"Could not update provider link: {e}")
 
         result_dict = result_to_dict(result)
 
-        logger.info(f"Initial health data sync completed for user {user_id}: {result_dict}")
+        logger.info("Initial health data sync completed for user %s: %s", user_id, result_dict)
         return result_dict
 
     except Exception as e:
@@ -258,80 +395,59 @@ def nightly_health_data_sync() -> list[dict]:
     logger.info("Starting nightly health data synchronization")
     close_old_connections()
 
-    # Get all active provider links
-    active_links = ProviderLink.objects.filter(provider__active=True).select_related("user", "provider")
-
-    sync_results = []
-
-    for link in active_links:
-        try:
-            # Validate provider is supported for health data
-            if link.provider.provider_type not in [p.value for p in Provider]:
-                logger.debug(f"Provider {link.provider.provider_type} not supported for health data sync")
-                continue
-
-            # Check for access token
-            if not link.extra_data or "access_token" not in link.extra_data:
-                logger.warning(f"No access token found for provider link {link.id}")
-                continue
-
-            # Queue incremental health data sync
-            result = sync_user_health_data_incremental(
-                user_id=link.user.ehr_user_id,
-                provider_name=link.provider.provider_type,
-                data_types=["heart_rate", "steps"],  # Default types for Phase 1
-            )
-
-            sync_results.append(
-                {
-                    "user_id": link.user.ehr_user_id,
-                    "provider": link.provider.provider_type,
-                    "task_id": result.id,
-                    "status": "queued",
-                }
-            )
-
-            logger.debug(
-                f"Queued nightly health data sync for user {link.user.ehr_user_id} with {link.provider.provider_type}"
-            )
+    batch_size = settings.HEALTH_DATA_CONFIG["BATCH_SIZES"]["ENQUEUE"]
+    spread_seconds = settings.HEALTH_DATA_CONFIG.get("NIGHTLY_SPREAD_SECONDS", 0)
+
+    def build_task(link: ProviderLink) -> Task:
+        # Build incremental health data sync; written to the queue with its batch
+        return sync_user_health_data_incremental.s(
+            user_id=link.user.ehr_user_id,
+            provider_name=link.provider.provider_type,
+            data_types=["heart_rate", "steps"],  # Default types for Phase 1
+            validated=True,
+            provider_link_id=link.pk,
+            # Jittered start spreads provider API calls across the window instead of a 4 AM burst
+            delay=random.uniform(0, spread_seconds) if spread_seconds > 0 else None,
+        )
 
-        except Exception as e:
-            error_result = {
-                "error": f"Error processing provider link {link.id}: {e}",
-                "success": False,
-                "link_id": link.id,
-            }
-            sync_results.append(error_result)
-            logger.error(f"Error processing provider link {link.id}: {e}")
+    sync_results = enqueue_link_tasks(active_provider_links().iterator(chunk_size=batch_size), build_task, batch_size)
 
     logger.info(f"Nightly health data sync completed. Queued {len(sync_results)} sync tasks")
     return sync_results
 
 
-def _update_provider_link_health_sync_info(user: EHRUser, provider: Provider, result) -> None:
+def _update_provider_link_health_sync_info(
+    user_id: str, provider: Provider, result, provider_link_id: int | None = None
+) -> None:
     """Update provider link with health data sync information"""
     try:
-        provider_link = ProviderLink.objects.filter(user=user, provider__provider_type=provider.value).first()
-
-        if provider_link:
-            # Update extra_data with health sync information
-            if not provider_link.extra_data:
-                provider_link.extra_data = {}
-
-            provider_link.extra_data.update(
-                {
-                    "last_health_data_sync": result.sync_timestamp,
-                    "last_health_sync_records_fetched": result.records_fetched,
-                    "last_health_sync_records_transformed": result.records_transformed,
-                    "last_health_sync_fhir_resources_created": result.fhir_resources_created,
-                    "last_health_sync_errors": len(result.errors),
-                    "last_health_sync_success": result.success,
-                    "last_health_sync_processing_time_ms": result.processing_time_ms,
-                }
+        # Primary-key match when the caller knows the link, otherwise by EHR user and provider type
+        if provider_link_id is not None:
+            provider_links = ProviderLink.objects.filter(pk=provider_link_id)
+        else:
+            provider_links = ProviderLink.objects.filter(
+                user__ehr_user_id=user_id, provider__provider_type=provider.value
             )
-            provider_link.save()
-            logger.debug(f"Updated provider link {provider_link.id} with health sync information")
+
+        # Merge into extra_data server-side in a single UPDATE
+        updated = provider_links.update(extra_data=merged_extra_data(_health_sync_info(result)))
+
+        if updated:
+            logger.debug(f"Updated provider link for user {user_id} with health sync information")
 
     except Exception as e:
         logger.error(f"Failed to update provider link health sync info: {e}")
         raise
+
+
+def _health_sync_info(result) -> dict[str, Any]:
+    """Provider link extra_data entries describing the last health data sync"""
+    return {
+        "last_health_data_sync": result.sync_timestamp,
+        "last_health_sync_records_fetched": result.records_fetched,
+        "last_health_sync_records_transformed": result.records_transformed,
+        "last_health_sync_fhir_resources_created": result.fhir_resources_created,
+        "last_health_sync_errors": len(result.errors),
+        "last_health_sync_success": result.success,
+        "last_health_sync_processing_time_ms": result.processing_time_ms,
+    }
@@ -5,8 +5,9 @@ Health data sync strategies for different sync scenarios
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Protocol
+from typing import Any, ClassVar, Protocol
 
+from django.conf import settings
 from django.utils import timezone
 
 from .health_data_constants import DateRange, HealthDataType, HealthSyncConfig, SyncTrigger
@@ -29,7 +30,9 @@ class SyncStrategy(Protocol):
         """Get sync parameters for this strategy"""
         ...
 
-    def get_date_range(self, config: HealthSyncConfig, last_sync: datetime | None = None) -> DateRange:
+    def get_date_range(
+        self, config: HealthSyncConfig, last_sync: datetime | None = None, now: datetime | None = None
+    ) -> DateRange:
         """Get date range for this sync strategy"""
         ...
 
@@ -37,13 +40,42 @@ class SyncStrategy(Protocol):
 class BaseSyncStrategy(ABC):
     """Base class for sync strategies"""
 
+    # Strategies are created per sync; slots keep the fan-out of instances small
+    __slots__ = ("sync_trigger",)
+
+    # Per-strategy logger, resolved once at class creation; subclasses override
+    logger: ClassVar[logging.Logger] = logger
+
+    _BATCH_SIZES: ClassVar[dict[SyncTrigger, int]] = {
+        SyncTrigger.INITIAL: 1000,  # Large batches for historical data
+        SyncTrigger.INCREMENTAL: 500,  # Medium batches for regular sync
+        SyncTrigger.WEBHOOK: 100,  # Small batches for real-time
+        SyncTrigger.MANUAL: 500,  # Medium batches for manual sync
+    }
+
+    # HEALTH_DATA_CONFIG["BATCH_SIZES"] keys that override _BATCH_SIZES at runtime
+    _BATCH_SIZE_SETTINGS: ClassVar[dict[SyncTrigger, str]] = {
+        SyncTrigger.INITIAL: "INITIAL_SYNC",
+        SyncTrigger.INCREMENTAL: "INCREMENTAL_SYNC",
+        SyncTrigger.WEBHOOK: "WEBHOOK_SYNC",
+        SyncTrigger.MANUAL: "MANUAL_SYNC",
+    }
+
+    _PRIORITIES: ClassVar[dict[SyncTrigger, str]] = {
+        SyncTrigger.WEBHOOK: "high",  # Real-time has highest priority
+        SyncTrigger.MANUAL: "medium",  # User-triggered is medium
+        SyncTrigger.INCREMENTAL: "low",  # Regular sync is low
+        SyncTrigger.INITIAL: "low",  # Initial sync is low (can be slow)
+    }
+
     def __init__(self, sync_trigger: SyncTrigger):
         self.sync_trigger = sync_trigger
-        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     @abstractmethod
-    def get_date_range(self, config: HealthSyncConfig, last_sync: datetime | None = None) -> DateRange:
-        """Get date range for this sync strategy"""
+    def get_date_range(
+        self, config: HealthSyncConfig, last_sync: datetime | None = None, now: datetime | None = None
+    ) -> DateRange:
+        """Get date range for this sync strategy, ending at now (defaults to the current time)"""
 
     def get_sync_params(
         self,
@@ -53,7 +85,7 @@ class BaseSyncStrategy(ABC):
         last_sync: datetime | None = None,
     ) -> dict:
         """Get common sync parameters"""
-        date_range = self.get_date_range(config, last_sync)
+        date_range = self.get_date_range(config, last_sync, timezone.now())
 
         return {
             "sync_trigger": self.sync_trigger,
@@ -66,43 +98,34 @@ class BaseSyncStrategy(ABC):
         }
 
     def _get_batch_size(self) -> int:
-        """Get appropriate batch size for this strategy"""
-        match self.sync_trigger:
-            case SyncTrigger.INITIAL:
-                return 1000  # Large batches for historical data
-            case SyncTrigger.INCREMENTAL:
-                return 500  # Medium batches for regular sync
-            case SyncTrigger.WEBHOOK:
-                return 100  # Small batches for real-time
-            case SyncTrigger.MANUAL:
-                return 500  # Medium batches for manual sync
+        """Get appropriate batch size for this strategy, as configured in HEALTH_DATA_CONFIG["BATCH_SIZES"]"""
+        configured = settings.HEALTH_DATA_CONFIG.get("BATCH_SIZES", {})
+        return configured.get(self._BATCH_SIZE_SETTINGS[self.sync_trigger], self._BATCH_SIZES[self.sync_trigger])
 
     def _get_priority(self) -> str:
         """Get priority level for this strategy"""
-        match self.sync_trigger:
-            case SyncTrigger.WEBHOOK:
-                return "high"  # Real-time has highest priority
-            case SyncTrigger.MANUAL:
-                return "medium"  # User-triggered is medium
-            case SyncTrigger.INCREMENTAL:
-                return "low"  # Regular sync is low
-            case SyncTrigger.INITIAL:
-                return "low"  # Initial sync is low (can be slow)
+        return self._PRIORITIES[self.sync_trigger]
 
 
 class InitialSyncStrategy(BaseSyncStrategy):
     """Strategy for initial historical data sync"""
 
+    __slots__ = ("lookback_days",)
+
+    logger = logging.getLogger(f"{__name__}.InitialSyncStrategy")
+
     def __init__(self, lookback_days: int = 30):
         super().__init__(SyncTrigger.INITIAL)
         self.lookback_days = lookback_days
 
-    def get_date_range(self, config: HealthSyncConfig, last_sync: datetime | None = None) -> DateRange:
+    def get_date_range(
+        self, config: HealthSyncConfig, last_sync: datetime | None = None, now: datetime | None = None
+    ) -> DateRange:
         """Get date range for initial sync"""
-        end_date = timezone.now()
+        end_date = now or timezone.now()
         start_date = end_date - timedelta(days=self.lookback_days)
 
-        self.logger.info(f"Initial sync date range: {start_date} to {end_date}")
+        self.logger.debug("Initial sync date range: %s to %s", start_date, end_date)
 
         return DateRange(start_date, end_date)
 
@@ -131,41 +154,85 @@ class InitialSyncStrategy(BaseSyncStrategy):
 class IncrementalSyncStrategy(BaseSyncStrategy):
     """Strategy for incremental updates since last sync"""
 
-    def __init__(self, overlap_minutes: int = 5):
+    __slots__ = ("overlap_minutes", "max_span")
+
+    logger = logging.getLogger(f"{__name__}.IncrementalSyncStrategy")
+
+    def __init__(self, overlap_minutes: int = 5, max_span: timedelta = timedelta(days=7)):
         super().__init__(SyncTrigger.INCREMENTAL)
         self.overlap_minutes = overlap_minutes
+        # Longest window one incremental sync fetches; older gaps are clamped rather than refetched in one go
+        self.max_span = max_span
+
+    def get_date_range(
+        self,
+        config: HealthSyncConfig,
+        last_sync: datetime | None = None,
+        now: datetime | None = None,
+        overlap_cursor: datetime | None = None,
+    ) -> DateRange:
+        """Get date range for incremental sync
 
-    def get_date_range(self, config: HealthSyncConfig, last_sync: datetime | None = None) -> DateRange:
-        """Get date range for incremental sync"""
-        end_date = timezone.now()
+        overlap_cursor is the start of the previous sync's window. When given, the range reaches
+        back to it so records created while that sync was running are not missed.
+        """
+        end_date = now or timezone.now()
 
-        if last_sync is None:
+        if last_sync is None and overlap_cursor is None:
             # Fallback to recent data if no last sync
             start_date = end_date - timedelta(hours=24)
-            self.logger.warning(f"No last sync found, using 24-hour fallback: {start_date} to {end_date}")
+            self.logger.warning("No last sync found, using 24-hour fallback: %s to %s", start_date, end_date)
         else:
-            # Small overlap to handle timezone issues and potential missed data
-            start_date = last_sync - timedelta(minutes=self.overlap_minutes)
-            self.logger.info(f"Incremental sync from {start_date} (with {self.overlap_minutes}min overlap)")
+            start_date = self._start_date(last_sync, overlap_cursor, end_date)
+            self.logger.debug("Incremental sync from %s (with %dmin overlap)", start_date, self.overlap_minutes)
 
         return DateRange(start_date, end_date)
 
+    def _start_date(self, last_sync: datetime | None, overlap_cursor: datetime | None, end_date: datetime) -> datetime:
+        """Earliest of the overlap cursor and the last sync less the overlap buffer, capped at max_span"""
+        # Small overlap to handle timezone issues and potential missed data
+        candidates = [overlap_cursor] if overlap_cursor is not None else []
+        if last_sync is not None:
+            candidates.append(last_sync - timedelta(minutes=self.overlap_minutes))
+        start_date = min(candidates)
+
+        earliest = end_date - self.max_span
+        if start_date < earliest:
+            self.logger.warning(
+                "Incremental sync gap since %s exceeds %s, syncing from %s", start_date, self.max_span, earliest
+            )
+            return earliest
+        return start_date
+
     def get_sync_params(
         self,
         user_id: str,
         data_types: list[HealthDataType],
         config: HealthSyncConfig,
         last_sync: datetime | None = None,
+        overlap_cursor: datetime | None = None,
     ) -> dict:
-        """Get incremental sync parameters"""
+        """Get incremental sync parameters
+
+        The returned cursor_current and cursor_overlap are the end and start of the synced
+        window; pass them back as last_sync and overlap_cursor on the next sync or a retry.
+        """
         params = super().get_sync_params(user_id, data_types, config, last_sync)
 
+        if overlap_cursor is not None:
+            date_range = params["date_range"]
+            params["date_range"] = DateRange(
+                self._start_date(last_sync, overlap_cursor, date_range.end), date_range.end
+            )
+
         # Add incremental sync specific parameters
         params.update(
             {
                 "include_all_records": False,
                 "skip_duplicates": True,  # Skip data we've already processed
                 "use_deduplication": True,  # Enable deduplication for overlapping data
+                "cursor_current": params["date_range"].end,
+                "cursor_overlap": params["date_range"].start,
             }
         )
 
@@ -175,17 +242,23 @@ class IncrementalSyncStrategy(BaseSyncStrategy):
 class WebhookSyncStrategy(BaseSyncStrategy):
     """Strategy for real-time webhook-triggered sync"""
 
+    __slots__ = ("lookback_minutes",)
+
+    logger = logging.getLogger(f"{__name__}.WebhookSyncStrategy")
+
     def __init__(self, lookback_minutes: int = 15):
         super().__init__(SyncTrigger.WEBHOOK)
         self.lookback_minutes = lookback_minutes
 
-    def get_date_range(self, config: HealthSyncConfig, last_sync: datetime | None = None) -> DateRange:
+    def get_date_range(
+        self, config: HealthSyncConfig, last_sync: datetime | None = None, now: datetime | None = None
+    ) -> DateRange:
         """Get date range for webhook sync"""
-        end_date = timezone.now()
+        end_date = now or timezone.now()
         # Only sync very recent data for webhooks
         start_date = end_date - timedelta(minutes=self.lookback_minutes)
 
-        self.logger.info(f"Webhook sync for recent {self.lookback_minutes} minutes: {start_date} to {end_date}")
+        self.logger.debug("Webhook sync for recent %d minutes: %s to %s", self.lookback_minutes, start_date, end_date)
 
         return DateRange(start_date, end_date)
 
@@ -215,23 +288,29 @@ class WebhookSyncStrategy(BaseSyncStrategy):
 class ManualSyncStrategy(BaseSyncStrategy):
     """Strategy for user-triggered manual sync"""
 
+    __slots__ = ("custom_date_range",)
+
+    logger = logging.getLogger(f"{__name__}.ManualSyncStrategy")
+
     def __init__(self, custom_date_range: DateRange | None = None):
         super().__init__(SyncTrigger.MANUAL)
         self.custom_date_range = custom_date_range
 
-    def get_date_range(self, config: HealthSyncConfig, last_sync: datetime | None = None) -> DateRange:
+    def get_date_range(
+        self, config: HealthSyncConfig, last_sync: datetime | None = None, now: datetime | None = None
+    ) -> DateRange:
         """Get date range for manual sync"""
         if self.custom_date_range:
-            self.logger.info(
-                f"Manual sync with custom range: {self.custom_date_range.start} to {self.custom_date_range.end}"
+            self.logger.debug(
+                "Manual sync with custom range: %s to %s", self.custom_date_range.start, self.custom_date_range.end
             )
             return self.custom_date_range
 
         # Default to recent data if no custom range
-        end_date = timezone.now()
+        end_date = now or timezone.now()
         start_date = end_date - timedelta(days=7)  # Last week
 
-        self.logger.info(f"Manual sync with default range: {start_date} to {end_date}")
+        self.logger.debug("Manual sync with default range: %s to %s", start_date, end_date)
 
         return DateRange(start_date, end_date)
 
@@ -261,6 +340,14 @@ class ManualSyncStrategy(BaseSyncStrategy):
 class SyncStrategyFactory:
     """Factory for creating sync strategies"""
 
+    # Strategy class, its constructor keyword and that keyword's default, per trigger
+    _STRATEGIES: ClassVar[dict[SyncTrigger, tuple[type[BaseSyncStrategy], str, Any]]] = {
+        SyncTrigger.INITIAL: (InitialSyncStrategy, "lookback_days", 30),
+        SyncTrigger.INCREMENTAL: (IncrementalSyncStrategy, "overlap_minutes", 5),
+        SyncTrigger.WEBHOOK: (WebhookSyncStrategy, "lookback_minutes", 15),
+        SyncTrigger.MANUAL: (ManualSyncStrategy, "date_range", None),
+    }
+
     @classmethod
     def create_initial_sync(cls, lookback_days: int = 30) -> InitialSyncStrategy:
         """Create initial sync strategy"""
@@ -284,17 +371,11 @@ class SyncStrategyFactory:
     @classmethod
     def create_for_trigger(cls, trigger: SyncTrigger, **kwargs) -> SyncStrategy:
         """Create strategy based on sync trigger"""
-        match trigger:
-            case SyncTrigger.INITIAL:
-                return cls.create_initial_sync(kwargs.get("lookback_days", 30))
-            case SyncTrigger.INCREMENTAL:
-                return cls.create_incremental_sync(kwargs.get("overlap_minutes", 5))
-            case SyncTrigger.WEBHOOK:
-                return cls.create_webhook_sync(kwargs.get("lookback_minutes", 15))
-            case SyncTrigger.MANUAL:
-                return cls.create_manual_sync(kwargs.get("date_range"))
-            case _:
-                raise ValueError(f"Unsupported sync trigger: {trigger}")
+        try:
+            strategy_class, option, default = cls._STRATEGIES[trigger]
+        except KeyError:
+            raise ValueError(f"Unsupported sync trigger: {trigger}") from None
+        return strategy_class(kwargs.get(option, default))
 
 
 def get_default_sync_strategy(user_has_synced_before: bool, trigger: SyncTrigger | None = None) -> SyncStrategy:
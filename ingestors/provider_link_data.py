@@ -0,0 +1,22 @@
+"""Shared helpers for updating ProviderLink.extra_data."""
+
+from typing import Any
+
+from django.db.models import Func, JSONField, Value
+from django.db.models.functions import Coalesce
+
+
+def merged_extra_data(entries: dict[str, Any]) -> Func:
+    """
+    Expression merging entries into ProviderLink.extra_data server-side (jsonb ||)
+
+    Used with QuerySet.update() so the link is written in a single UPDATE: no read round
+    trip, and tokens refreshed concurrently by another task are not overwritten.
+    """
+    return Func(
+        Coalesce("extra_data", Value({}, output_field=JSONField())),
+        Value(entries, output_field=JSONField()),
+        template="%(expressions)s",
+        arg_joiner=" || ",
+        output_field=JSONField(),
+    )
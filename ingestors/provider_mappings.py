@@ -16,8 +16,11 @@ Example Flow:
     When webhook arrives for appli 54: Fetch data using /v2/heart endpoint
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 
 from .health_data_constants import Provider
 
@@ -29,22 +32,25 @@ class APIMethod(Enum):
     POST = "POST"
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True, eq=False, kw_only=True)
 class DataTypeConfig:
     """
     Complete configuration for a single data type on a specific provider
 
+    Each (provider, data type) config is built once in the mappings below, so configs compare and
+    hash by identity rather than field by field.
+
     Attributes:
         name: Data type identifier (e.g., 'ecg', 'heart_rate')
         display_name: Human-readable name
-        subscription_categories: List of provider-specific categories to subscribe to
-            - Withings: appli types (e.g., ['54'] for ECG)
-            - Fitbit: collection types (e.g., ['activities'] for heart rate)
+        subscription_categories: Provider-specific categories to subscribe to
+            - Withings: appli types (e.g., ('54',) for ECG)
+            - Fitbit: collection types (e.g., ('activities',) for heart rate)
         api_endpoint: API endpoint path for fetching this data
         api_method: HTTP method (GET or POST)
         api_action: Action parameter (e.g., 'list', 'getmeas')
-        meastype: Withings-specific meastype(s) for /measure endpoint
-            - Can be int, list of ints, or None
+        meastype: Withings-specific meastypes for /measure endpoint
+            - Empty for data types that don't use the /measure endpoint
             - Only used for /measure endpoint (getmeas action)
         response_processor: Method name to process API response
         requires_date_range: Whether this data type requires date range parameters
@@ -56,11 +62,11 @@ class DataTypeConfig:
 
     name: str
     display_name: str
-    subscription_categories: list[str]
+    subscription_categories: tuple[str, ...]
     api_endpoint: str
     api_method: APIMethod
     api_action: str | None
-    meastype: int | list[int] | None
+    meastype: tuple[int, ...] = ()
     response_processor: str
     requires_date_range: bool
     description: str
@@ -72,235 +78,242 @@ class DataTypeConfig:
 # WITHINGS DATA TYPE MAPPINGS
 # ==============================================================================
 
-WITHINGS_DATA_TYPES: dict[str, DataTypeConfig] = {
-    "ecg": DataTypeConfig(
-        name="ecg",
-        display_name="Electrocardiogram (ECG)",
-        subscription_categories=["54"],  # Appli 54: ECG data
-        api_endpoint="/v2/heart",
-        api_method=APIMethod.POST,
-        api_action="list",
-        meastype=None,  # ECG uses Heart v2 API, not measure endpoint
-        response_processor="_process_withings_ecg",
-        requires_date_range=True,
-        description="ECG recordings with AFib detection and heart rate",
-    ),
-    "heart_rate": DataTypeConfig(
-        name="heart_rate",
-        display_name="Heart Rate",
-        subscription_categories=["4"],  # Appli 4: Pressure-related data
-        api_endpoint="/measure",
-        api_method=APIMethod.POST,
-        api_action="getmeas",
-        meastype=11,  # Meastype 11: Heart pulse
-        response_processor="_process_withings_measurements",
-        requires_date_range=True,
-        description="Heart rate measurements in beats per minute",
-    ),
-    "weight": DataTypeConfig(
-        name="weight",
-        display_name="Weight",
-        subscription_categories=["1"],  # Appli 1: Weight-related metrics
-        api_endpoint="/measure",
-        api_method=APIMethod.POST,
-        api_action="getmeas",
-        meastype=1,  # Meastype 1: Weight
-        response_processor="_process_withings_measurements",
-        requires_date_range=True,
-        description="Body weight measurements in kg",
-    ),
-    "fat_mass": DataTypeConfig(
-        name="fat_mass",
-        display_name="Fat Mass",
-        subscription_categories=["1"],  # Appli 1: Weight-related metrics
-        api_endpoint="/measure",
-        api_method=APIMethod.POST,
-        api_action="getmeas",
-        meastype=8,  # Meastype 8: Fat mass weight
-        response_processor="_process_withings_measurements",
-        requires_date_range=True,
-        description="Body fat mass in kg",
-    ),
-    "steps": DataTypeConfig(
-        name="steps",
-        display_name="Steps",
-        subscription_categories=["16"],  # Appli 16: Activity data
-        api_endpoint="/v2/measure",
-        api_method=APIMethod.POST,
-        api_action="getactivity",
-        meastype=None,  # Activity uses different action, not meastype
-        response_processor="_process_withings_activity",
-        requires_date_range=True,
-        description="Daily step count",
-        date_format="ymd",
-        data_fields="steps,distance,elevation,calories,totalcalories",
-    ),
-    "blood_pressure": DataTypeConfig(
-        name="blood_pressure",
-        display_name="Blood Pressure",
-        subscription_categories=["4"],  # Appli 4: Pressure-related data
-        api_endpoint="/measure",
-        api_method=APIMethod.POST,
-        api_action="getmeas",
-        meastype=[9, 10],  # Meastype 9: Diastolic, 10: Systolic
-        response_processor="_process_withings_measurements",
-        requires_date_range=True,
-        description="Blood pressure readings (systolic/diastolic)",
-    ),
-    "temperature": DataTypeConfig(
-        name="temperature",
-        display_name="Body Temperature",
-        subscription_categories=["2"],  # Appli 2: Temperature-related data
-        api_endpoint="/measure",
-        api_method=APIMethod.POST,
-        api_action="getmeas",
-        meastype=[12, 71, 73],  # 12: Temperature, 71: Body temp, 73: Skin temp
-        response_processor="_process_withings_measurements",
-        requires_date_range=True,
-        description="Body temperature measurements",
-    ),
-    "spo2": DataTypeConfig(
-        name="spo2",
-        display_name="Oxygen Saturation (SpO2)",
-        subscription_categories=["4"],  # Appli 4: Pressure-related data
-        api_endpoint="/measure",
-        api_method=APIMethod.POST,
-        api_action="getmeas",
-        meastype=54,  # Meastype 54: SpO2
-        response_processor="_process_withings_measurements",
-        requires_date_range=True,
-        description="Blood oxygen saturation percentage",
-    ),
-    "sleep": DataTypeConfig(
-        name="sleep",
-        display_name="Sleep Data",
-        subscription_categories=["44"],  # Appli 44: Sleep-related data
-        api_endpoint="/v2/sleep",
-        api_method=APIMethod.POST,
-        api_action="getsummary",
-        meastype=None,  # Sleep uses different endpoint
-        response_processor="_process_withings_sleep",
-        requires_date_range=True,
-        description="Sleep sessions with stages and quality metrics",
-        date_format="ymd",
-        data_fields="nb_rem_episodes,sleep_efficiency,sleep_latency,total_sleep_time,total_timeinbed,wakeup_latency,waso,apnea_hypopnea_index,breathing_disturbances_intensity,deepsleepduration,lightsleepduration,remsleepduration,snoring,snoringepisodecount,wakeupcount,hr_average,hr_min,hr_max,rr_average,rr_min,rr_max,sleep_score",
-    ),
-    "rr_intervals": DataTypeConfig(
-        name="rr_intervals",
-        display_name="RR Intervals (HRV)",
-        subscription_categories=["44", "62"],  # Appli 44: Sleep, 62: HRV
-        api_endpoint="/v2/sleep",
-        api_method=APIMethod.POST,
-        api_action="get",
-        meastype=None,
-        response_processor="_process_withings_sleep",
-        requires_date_range=True,
-        description="Heart rate variability measurements",
-        data_fields="hr,rr,snoring",
-    ),
-    "pulse_wave_velocity": DataTypeConfig(
-        name="pulse_wave_velocity",
-        display_name="Pulse Wave Velocity",
-        subscription_categories=["4"],  # Appli 4: Pressure-related data
-        api_endpoint="/measure",
-        api_method=APIMethod.POST,
-        api_action="getmeas",
-        meastype=91,  # Meastype 91: Pulse wave velocity
-        response_processor="_process_withings_measurements",
-        requires_date_range=True,
-        description="Arterial stiffness measurement in m/s",
-    ),
-}
+WITHINGS_DATA_TYPES: Mapping[str, DataTypeConfig] = MappingProxyType(
+    {
+        "ecg": DataTypeConfig(
+            name="ecg",
+            display_name="Electrocardiogram (ECG)",
+            subscription_categories=("54",),  # Appli 54: ECG data
+            api_endpoint="/v2/heart",
+            api_method=APIMethod.POST,
+            api_action="list",
+            meastype=(),  # ECG uses Heart v2 API, not measure endpoint
+            response_processor="_process_withings_ecg",
+            requires_date_range=True,
+            description="ECG recordings with AFib detection and heart rate",
+        ),
+        "heart_rate": DataTypeConfig(
+            name="heart_rate",
+            display_name="Heart Rate",
+            subscription_categories=("4",),  # Appli 4: Pressure-related data
+            api_endpoint="/measure",
+            api_method=APIMethod.POST,
+            api_action="getmeas",
+            meastype=(11,),  # Meastype 11: Heart pulse
+            response_processor="_process_withings_measurements",
+            requires_date_range=True,
+            description="Heart rate measurements in beats per minute",
+        ),
+        "weight": DataTypeConfig(
+            name="weight",
+            display_name="Weight",
+            subscription_categories=("1",),  # Appli 1: Weight-related metrics
+            api_endpoint="/measure",
+            api_method=APIMethod.POST,
+            api_action="getmeas",
+            meastype=(1,),  # Meastype 1: Weight
+            response_processor="_process_withings_measurements",
+            requires_date_range=True,
+            description="Body weight measurements in kg",
+        ),
+        "fat_mass": DataTypeConfig(
+            name="fat_mass",
+            display_name="Fat Mass",
+            subscription_categories=("1",),  # Appli 1: Weight-related metrics
+            api_endpoint="/measure",
+            api_method=APIMethod.POST,
+            api_action="getmeas",
+            meastype=(8,),  # Meastype 8: Fat mass weight
+            response_processor="_process_withings_measurements",
+            requires_date_range=True,
+            description="Body fat mass in kg",
+        ),
+        "steps": DataTypeConfig(
+            name="steps",
+            display_name="Steps",
+            subscription_categories=("16",),  # Appli 16: Activity data
+            api_endpoint="/v2/measure",
+            api_method=APIMethod.POST,
+            api_action="getactivity",
+            meastype=(),  # Activity uses different action, not meastype
+            response_processor="_process_withings_activity",
+            requires_date_range=True,
+            description="Daily step count",
+            date_format="ymd",
+            data_fields="steps,distance,elevation,calories,totalcalories",
+        ),
+        "blood_pressure": DataTypeConfig(
+            name="blood_pressure",
+            display_name="Blood Pressure",
+            subscription_categories=("4",),  # Appli 4: Pressure-related data
+            api_endpoint="/measure",
+            api_method=APIMethod.POST,
+            api_action="getmeas",
+            meastype=(9, 10),  # Meastype 9: Diastolic, 10: Systolic
+            response_processor="_process_withings_measurements",
+            requires_date_range=True,
+            description="Blood pressure readings (systolic/diastolic)",
+        ),
+        "temperature": DataTypeConfig(
+            name="temperature",
+            display_name="Body Temperature",
+            subscription_categories=("2",),  # Appli 2: Temperature-related data
+            api_endpoint="/measure",
+            api_method=APIMethod.POST,
+            api_action="getmeas",
+            meastype=(12, 71, 73),  # 12: Temperature, 71: Body temp, 73: Skin temp
+            response_processor="_process_withings_measurements",
+            requires_date_range=True,
+            description="Body temperature measurements",
+        ),
+        "spo2": DataTypeConfig(
+            name="spo2",
+            display_name="Oxygen Saturation (SpO2)",
+            subscription_categories=("4",),  # Appli 4: Pressure-related data
+            api_endpoint="/measure",
+            api_method=APIMethod.POST,
+            api_action="getmeas",
+            meastype=(54,),  # Meastype 54: SpO2
+            response_processor="_process_withings_measurements",
+            requires_date_range=True,
+            description="Blood oxygen saturation percentage",
+        ),
+        "sleep": DataTypeConfig(
+            name="sleep",
+            display_name="Sleep Data",
+            subscription_categories=("44",),  # Appli 44: Sleep-related data
+            api_endpoint="/v2/sleep",
+            api_method=APIMethod.POST,
+            api_action="getsummary",
+            meastype=(),  # Sleep uses different endpoint
+            response_processor="_process_withings_sleep",
+            requires_date_range=True,
+            description="Sleep sessions with stages and quality metrics",
+            date_format="ymd",
+            data_fields="nb_rem_episodes,sleep_efficiency,sleep_latency,total_sleep_time,total_timeinbed,wakeup_latency,waso,apnea_hypopnea_index,breathing_disturbances_intensity,deepsleepduration,lightsleepduration,remsleepduration,snoring,snoringepisodecount,wakeupcount,hr_average,hr_min,hr_max,rr_average,rr_min,rr_max,sleep_score",
+        ),
+        "rr_intervals": DataTypeConfig(
+            name="rr_intervals",
+            display_name="RR Intervals (HRV)",
+            subscription_categories=("44", "62"),  # Appli 44: Sleep, 62: HRV
+            api_endpoint="/v2/sleep",
+            api_method=APIMethod.POST,
+            api_action="get",
+            meastype=(),
+            response_processor="_process_withings_sleep",
+            requires_date_range=True,
+            description="Heart rate variability measurements",
+            data_fields="hr,rr,snoring",
+        ),
+        "pulse_wave_velocity": DataTypeConfig(
+            name="pulse_wave_velocity",
+            display_name="Pulse Wave Velocity",
+            subscription_categories=("4",),  # Appli 4: Pressure-related data
+            api_endpoint="/measure",
+            api_method=APIMethod.POST,
+            api_action="getmeas",
+            meastype=(91,),  # Meastype 91: Pulse wave velocity
+            response_processor="_process_withings_measurements",
+            requires_date_range=True,
+            description="Arterial stiffness measurement in m/s",
+        ),
+    }
+)
 
 
 # ==============================================================================
 # FITBIT DATA TYPE MAPPINGS
 # ==============================================================================
 
-FITBIT_DATA_TYPES: dict[str, DataTypeConfig] = {
-    "heart_rate": DataTypeConfig(
-        name="heart_rate",
-        display_name="Heart Rate",
-        subscription_categories=["activities"],  # Fitbit collection type
-        api_endpoint="/1/user/-/activities/heart/date/{date}/1d.json",
-        api_method=APIMethod.GET,
-        api_action=None,
-        meastype=None,  # Fitbit doesn't use meastypes
-        response_processor="_process_fitbit_heart_rate",
-        requires_date_range=True,
-        description="Heart rate zones and intraday measurements",
-    ),
-    "steps": DataTypeConfig(
-        name="steps",
-        display_name="Steps",
-        subscription_categories=["activities"],
-        api_endpoint="/1/user/-/activities/steps/date/{date}/1d.json",
-        api_method=APIMethod.GET,
-        api_action=None,
-        meastype=None,
-        response_processor="_process_fitbit_activity",
-        requires_date_range=True,
-        description="Daily step count and intraday data",
-    ),
-    "weight": DataTypeConfig(
-        name="weight",
-        display_name="Weight",
-        subscription_categories=["body"],
-        api_endpoint="/1/user/-/body/log/weight/date/{date}.json",
-        api_method=APIMethod.GET,
-        api_action=None,
-        meastype=None,
-        response_processor="_process_fitbit_weight",
-        requires_date_range=True,
-        description="Body weight logs",
-    ),
-    "sleep": DataTypeConfig(
-        name="sleep",
-        display_name="Sleep Data",
-        subscription_categories=["sleep"],
-        api_endpoint="/1.2/user/-/sleep/date/{date}.json",
-        api_method=APIMethod.GET,
-        api_action=None,
-        meastype=None,
-        response_processor="_process_fitbit_sleep",
-        requires_date_range=True,
-        description="Sleep stages and quality metrics",
-    ),
-    "ecg": DataTypeConfig(
-        name="ecg",
-        display_name="Electrocardiogram (ECG)",
-        subscription_categories=["activities"],  # ECG notifications come through activities
-        api_endpoint="/1/user/-/ecg/list.json",
-        api_method=APIMethod.GET,
-        api_action=None,
-        meastype=None,
-        response_processor="_process_fitbit_ecg",
-        requires_date_range=True,
-        description="ECG readings with AFib detection",
-    ),
-    "rr_intervals": DataTypeConfig(
-        name="rr_intervals",
-        display_name="HRV (RR Intervals)",
-        subscription_categories=["activities"],
-        api_endpoint="/1/user/-/hrv/date/{date}/all.json",
-        api_method=APIMethod.GET,
-        api_action=None,
-        meastype=None,
-        response_processor="_process_fitbit_hrv",
-        requires_date_range=True,
-        description="Heart rate variability measurements",
-    ),
-}
+FITBIT_DATA_TYPES: Mapping[str, DataTypeConfig] = MappingProxyType(
+    {
+        "heart_rate": DataTypeConfig(
+            name="heart_rate",
+            display_name="Heart Rate",
+            subscription_categories=("activities",),  # Fitbit collection type
+            api_endpoint="/1/user/-/activities/heart/date/{date}/1d.json",
+            api_method=APIMethod.GET,
+            api_action=None,
+            meastype=(),  # Fitbit doesn't use meastypes
+            response_processor="_process_fitbit_heart_rate",
+            requires_date_range=True,
+            description="Heart rate zones and intraday measurements",
+        ),
+        "steps": DataTypeConfig(
+            name="steps",
+            display_name="Steps",
+            subscription_categories=("activities",),
+            api_endpoint="/1/user/-/activities/steps/date/{date}/1d.json",
+            api_method=APIMethod.GET,
+            api_action=None,
+            meastype=(),
+            response_processor="_process_fitbit_activity",
+            requires_date_range=True,
+            description="Daily step count and intraday data",
+        ),
+        "weight": DataTypeConfig(
+            name="weight",
+            display_name="Weight",
+            subscription_categories=("body",),
+            api_endpoint="/1/user/-/body/log/weight/date/{date}.json",
+            api_method=APIMethod.GET,
+            api_action=None,
+            meastype=(),
+            response_processor="_process_fitbit_weight",
+            requires_date_range=True,
+            description="Body weight logs",
+        ),
+        "sleep": DataTypeConfig(
+            name="sleep",
+            display_name="Sleep Data",
+            subscription_categories=("sleep",),
+            api_endpoint="/1.2/user/-/sleep/date/{date}.json",
+            api_method=APIMethod.GET,
+            api_action=None,
+            meastype=(),
+            response_processor="_process_fitbit_sleep",
+            requires_date_range=True,
+            description="Sleep stages and quality metrics",
+        ),
+        "ecg": DataTypeConfig(
+            name="ecg",
+            display_name="Electrocardiogram (ECG)",
+            subscription_categories=("activities",),  # ECG notifications come through activities
+            api_endpoint="/1/user/-/ecg/list.json",
+            api_method=APIMethod.GET,
+            api_action=None,
+            meastype=(),
+            response_processor="_process_fitbit_ecg",
+            requires_date_range=True,
+            description="ECG readings with AFib detection",
+        ),
+        "rr_intervals": DataTypeConfig(
+            name="rr_intervals",
+            display_name="HRV (RR Intervals)",
+            subscription_categories=("activities",),
+            api_endpoint="/1/user/-/hrv/date/{date}/all.json",
+            api_method=APIMethod.GET,
+            api_action=None,
+            meastype=(),
+            response_processor="_process_fitbit_hrv",
+            requires_date_range=True,
+            description="Heart rate variability measurements",
+        ),
+    }
+)
 
 
 # ==============================================================================
 # COMBINED PROVIDER MAPPINGS
 # ==============================================================================
 
-PROVIDER_DATA_TYPE_MAPPINGS: dict[Provider, dict[str, DataTypeConfig]] = {
-    Provider.WITHINGS: WITHINGS_DATA_TYPES,
-    Provider.FITBIT: FITBIT_DATA_TYPES,
-}
+# Read-only so the shared configs can be handed to any caller or thread without copying
+PROVIDER_DATA_TYPE_MAPPINGS: Mapping[Provider, Mapping[str, DataTypeConfig]] = MappingProxyType(
+    {
+        Provider.WITHINGS: WITHINGS_DATA_TYPES,
+        Provider.FITBIT: FITBIT_DATA_TYPES,
+    }
+)
 
 
 # ==============================================================================
@@ -308,31 +321,55 @@ PROVIDER_DATA_TYPE_MAPPINGS: dict[Provider, dict[str, DataTypeConfig]] = {
 # ==============================================================================
 
 
-def get_category_to_data_types_mapping(provider: Provider) -> dict[str, list[str]]:
+def _build_category_to_data_types_mapping(data_types: Mapping[str, DataTypeConfig]) -> Mapping[str, tuple[str, ...]]:
+    """Reverse one provider's data type configs into a read-only category → data types mapping"""
+    category_mapping: dict[str, list[str]] = {}
+    for data_type_name, config in data_types.items():
+        for category in config.subscription_categories:
+            category_mapping.setdefault(category, []).append(data_type_name)
+
+    return MappingProxyType({category: tuple(names) for category, names in category_mapping.items()})
+
+
+# Built once at import; webhook processing looks these up on every notification
+_CATEGORY_TO_DATA_TYPES: dict[Provider, Mapping[str, tuple[str, ...]]] = {
+    provider: _build_category_to_data_types_mapping(data_types)
+    for provider, data_types in PROVIDER_DATA_TYPE_MAPPINGS.items()
+}
+_EMPTY_CATEGORY_MAPPING: Mapping[str, tuple[str, ...]] = MappingProxyType({})
+
+# Data type names each provider supports, built once at import
+_SUPPORTED_DATA_TYPES: dict[Provider, frozenset[str]] = {
+    provider: frozenset(data_types) for provider, data_types in PROVIDER_DATA_TYPE_MAPPINGS.items()
+}
+_SUPPORTED_DATA_TYPE_NAMES: dict[Provider, tuple[str, ...]] = {
+    provider: tuple(data_types) for provider, data_types in PROVIDER_DATA_TYPE_MAPPINGS.items()
+}
+
+# Subscription categories per data type, built once at import
+_DATA_TYPE_CATEGORIES: dict[Provider, dict[str, frozenset[str]]] = {
+    provider: {name: frozenset(config.subscription_categories) for name, config in data_types.items()}
+    for provider, data_types in PROVIDER_DATA_TYPE_MAPPINGS.items()
+}
+
+
+def get_category_to_data_types_mapping(provider: Provider) -> Mapping[str, tuple[str, ...]]:
     """
-    Build reverse mapping from subscription categories to data types
+    Get the reverse mapping from subscription categories to data types
 
     This is used by webhook processors to determine which data types
     to fetch when receiving a notification for a specific category.
+    The mapping is precomputed and read-only.
 
     Example for Withings:
         {
-            '1': ['weight', 'fat_mass'],
-            '4': ['heart_rate', 'blood_pressure', 'spo2'],
-            '54': ['ecg'],
+            '1': ('weight', 'fat_mass'),
+            '4': ('heart_rate', 'blood_pressure', 'spo2'),
+            '54': ('ecg',),
             ...
         }
     """
-    category_mapping: dict[str, list[str]] = {}
-
-    data_types = PROVIDER_DATA_TYPE_MAPPINGS.get(provider, {})
-    for data_type_name, config in data_types.items():
-        for category in config.subscription_categories:
-            if category not in category_mapping:
-                category_mapping[category] = []
-            category_mapping[category].append(data_type_name)
-
-    return category_mapping
+    return _CATEGORY_TO_DATA_TYPES.get(provider, _EMPTY_CATEGORY_MAPPING)
 
 
 def resolve_subscription_categories(provider: Provider, data_types: list[str]) -> list[str]:
@@ -350,14 +387,17 @@ def resolve_subscription_categories(provider: Provider, data_types: list[str]) -
         Input: provider=WITHINGS, data_types=['ecg', 'heart_rate', 'weight']
         Output: ['1', '4', '54']
     """
-    categories = set()
-    provider_mappings = PROVIDER_DATA_TYPE_MAPPINGS.get(provider, {})
+    return list(_resolve_subscription_categories(provider, frozenset(data_types)))
 
-    for data_type in data_types:
-        if data_type in provider_mappings:
-            categories.update(provider_mappings[data_type].subscription_categories)
 
-    return sorted(categories)
+@lru_cache(maxsize=256)
+def _resolve_subscription_categories(provider: Provider, data_types: frozenset[str]) -> tuple[str, ...]:
+    """Sorted subscription categories for a set of data types; users share a handful of data type sets"""
+    data_type_categories = _DATA_TYPE_CATEGORIES.get(provider, {})
+    categories = frozenset[str]().union(
+        *(data_type_categories[data_type] for data_type in data_types if data_type in data_type_categories)
+    )
+    return tuple(sorted(categories))
 
 
 def get_data_type_config(provider: Provider, data_type: str) -> DataTypeConfig | None:
@@ -366,12 +406,15 @@ def get_data_type_config(provider: Provider, data_type: str) -> DataTypeConfig |
 
     Returns None if the data type is not supported by the provider
     """
-    return PROVIDER_DATA_TYPE_MAPPINGS.get(provider, {}).get(data_type)
+    try:
+        return PROVIDER_DATA_TYPE_MAPPINGS[provider][data_type]
+    except KeyError:
+        return None
 
 
-def get_supported_data_types(provider: Provider) -> list[str]:
-    """Get list of all supported data types for a provider"""
-    return list(PROVIDER_DATA_TYPE_MAPPINGS.get(provider, {}).keys())
+def get_supported_data_types(provider: Provider) -> tuple[str, ...]:
+    """Get all supported data types for a provider, precomputed at import"""
+    return _SUPPORTED_DATA_TYPE_NAMES.get(provider, ())
 
 
 def validate_data_types(provider: Provider, data_types: list[str]) -> tuple[list[str], list[str]]:
@@ -379,16 +422,10 @@ def validate_data_types(provider: Provider, data_types: list[str]) -> tuple[list
     Validate which data types are supported by the provider
 
     Returns:
-        Tuple of (supported_types, unsupported_types)
+        Tuple of (supported_types, unsupported_types), each in request order
     """
-    supported = []
-    unsupported = []
-    provider_mappings = PROVIDER_DATA_TYPE_MAPPINGS.get(provider, {})
-
-    for data_type in data_types:
-        if data_type in provider_mappings:
-            supported.append(data_type)
-        else:
-            unsupported.append(data_type)
+    supported_keys = _SUPPORTED_DATA_TYPES.get(provider, frozenset())
+    supported = [data_type for data_type in data_types if data_type in supported_keys]
+    unsupported = [data_type for data_type in data_types if data_type not in supported_keys]
 
     return (supported, unsupported)
@@ -1,17 +1,21 @@
 """Shared helpers for serializing task result dataclasses to JSON-safe dicts."""
 
-from dataclasses import asdict
+from dataclasses import fields
 from enum import Enum
 from typing import Any
 
 
 def result_to_dict(result) -> dict[str, Any]:
-    """Convert a dataclass result to a JSON-serializable dict, converting enums to their values."""
-    return {
-        k: [i.value for i in v]
-        if isinstance(v, list) and v and isinstance(v[0], Enum)
-        else v.value
-        if isinstance(v, Enum)
-        else v
-        for k, v in asdict(result).items()
-    }
+    """Convert a dataclass result to a JSON-serializable dict, converting enums to their values.
+
+    Results are flat, so fields are read directly instead of through asdict's recursive deep copy.
+    """
+    serialized: dict[str, Any] = {}
+    for result_field in fields(result):
+        value = getattr(result, result_field.name)
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, list):
+            value = [item.value if isinstance(item, Enum) else item for item in value]
+        serialized[result_field.name] = value
+    return serialized
@@ -0,0 +1,110 @@
+"""Shared helpers for writing Huey tasks to the queue."""
+
+import copy
+import logging
+from collections.abc import Callable, Iterable
+
+from django.db.models import QuerySet
+from huey.api import Task
+
+from base.models import ProviderLink
+from open_health_exchange.settings import HUEY
+
+from .constants import Provider
+
+logger = logging.getLogger(__name__)
+
+# Provider types with sync support, matched against ProviderLink.provider.provider_type
+SUPPORTED_PROVIDER_VALUES = frozenset(p.value for p in Provider)
+
+
+def enqueue_many(tasks: list[Task]) -> None:
+    """
+    Write tasks to the queue in one Redis round trip
+
+    Huey.enqueue issues one storage write per task. Here the writes go through a
+    non-transactional pipeline on a copy of the storage, so the shared connection used
+    by the consumer is untouched. Immediate mode keeps the regular per-task path.
+    """
+    if HUEY.immediate:
+        for task in tasks:
+            HUEY.enqueue(task)
+        return
+
+    storage = copy.copy(HUEY.storage)
+    with HUEY.storage.conn.pipeline(transaction=False) as pipe:
+        storage.conn = pipe
+        for task in tasks:
+            storage.enqueue(HUEY.serialize_task(task), task.priority)
+        pipe.execute()
+
+
+def active_provider_links() -> QuerySet[ProviderLink]:
+    """Active links of supported providers that hold an access token, loading only the columns needed to queue a sync"""
+    return (
+        ProviderLink.objects.filter(
+            provider__active=True,
+            provider__provider_type__in=SUPPORTED_PROVIDER_VALUES,
+            extra_data__has_key="access_token",
+        )
+        .select_related("user", "provider")
+        .only("id", "user__ehr_user_id", "provider__provider_type")
+    )
+
+
+def enqueue_link_tasks(
+    links: Iterable[ProviderLink], build_task: Callable[[ProviderLink], Task], batch_size: int
+) -> list[dict]:
+    """
+    Build one task per provider link and write them to the queue in batches of batch_size
+
+    Returns one result per link, in link order: queued with its task id, or failed with the
+    error when the task could not be built or its batch could not be written.
+    """
+    results: list[dict] = []
+    pending: list[tuple[ProviderLink, Task]] = []
+
+    for link in links:
+        try:
+            pending.append((link, build_task(link)))
+        except Exception as e:
+            results.append(_link_error_result(link, e))
+
+        if len(pending) >= batch_size:
+            results.extend(_enqueue_batch(pending))
+            pending = []
+
+    if pending:
+        results.extend(_enqueue_batch(pending))
+
+    return results
+
+
+def _enqueue_batch(pending: list[tuple[ProviderLink, Task]]) -> list[dict]:
+    """Enqueue a batch of per-link tasks and report each one as queued or failed"""
+    try:
+        enqueue_many([task for _, task in pending])
+    except Exception as e:
+        return [_link_error_result(link, e) for link, _ in pending]
+
+    logger.debug("Queued %d provider link tasks", len(pending))
+    return [
+        {
+            "task_id": task.id,
+            "status": "queued",
+            "link_id": link.pk,
+            "user_id": link.user.ehr_user_id,
+            "provider": link.provider.provider_type,
+        }
+        for link, task in pending
+    ]
+
+
+def _link_error_result(link: ProviderLink, error: Exception) -> dict:
+    """Log and describe a provider link that could not be queued"""
+    logger.error(f"Error processing provider link {link.pk}: {error}")
+    return {
+        "error": f"Error processing provider link {link.pk}: {error}",
+        "success": False,
+        "link_id": link.pk,
+    }
@@ -3,23 +3,33 @@ Huey tasks for device synchronization
 """
 
 import logging
+from functools import cache, lru_cache
 
+from django.conf import settings
 from django.db import close_old_connections
 from django.utils import timezone
 from huey import crontab
+from huey.api import Task
 
 from base.models import EHRUser, ProviderLink
+from base.models import Provider as ProviderModel
 from open_health_exchange.settings import HUEY
+from webhooks.subscriptions import WebhookSubscriptionManager
 
-from .constants import Provider
+from .constants import PROVIDER_CONFIGS, Provider
 from .device_sync_service import DeviceSyncService
+from .health_data_constants import provider_from_value
+from .provider_link_data import merged_extra_data
 from .result_serialization import result_to_dict
+from .task_queue import active_provider_links, enqueue_link_tasks
 
 logger = logging.getLogger(__name__)
 
 
 @HUEY.task(priority=1)  # High priority for real-time sync
-def sync_user_devices(user_id: str, provider_name: str, patient_reference: str | None = None) -> dict:
+def sync_user_devices(
+    user_id: str, provider_name: str, patient_reference: str | None = None, provider_link_id: int | None = None
+) -> dict:
     """
     Device synchronization task
 
@@ -27,6 +37,7 @@ def sync_user_devices(user_id: str, provider_name: str, patient_reference: str |
         user_id: EHR user ID
         provider_name: Provider name (withings, fitbit, etc.)
         patient_reference: Optional FHIR Patient reference
+        provider_link_id: Primary key of the provider link to record the sync on, when the caller knows it
 
     Returns:
         Sync result dictionary
@@ -38,7 +49,7 @@ def sync_user_devices(user_id: str, provider_name: str, patient_reference: str |
         # Validate inputs
         try:
             user = EHRUser.objects.get(ehr_user_id=user_id)
-            provider = Provider(provider_name)
+            provider = provider_from_value(provider_name)
         except EHRUser.DoesNotExist:
             error_msg = f"EHR user {user_id} not found"
             logger.error(error_msg)
@@ -54,7 +65,7 @@ def sync_user_devices(user_id: str, provider_name: str, patient_reference: str |
 
         # Update provider link with sync information
         try:
-            _update_provider_link_sync_info(user, provider, result)
+            _update_provider_link_sync_info(user, provider, result, provider_link_id)
         except Exception as e:
             logger.warning(f"Could not update provider link: {e}")
 
@@ -88,8 +99,8 @@ def nightly_device_sync() -> list[dict]:
 
     Returns:
         list[dict]: Queue metadata for each queued task containing:
-            - task_id (str|None): Huey task ID if available
-            - queued (bool): True if task was queued successfully
+            - task_id (str): Huey task ID
+            - status (str): "queued"
             - link_id (int): Provider link database ID
             - user_id (str): EHR user ID
             - provider (str): Provider name (withings, fitbit, etc.)
@@ -107,64 +118,36 @@ def nightly_device_sync() -> list[dict]:
     logger.info("Starting nightly device synchronization")
     close_old_connections()
 
-    # Get all active provider links
-    active_links = ProviderLink.objects.filter(provider__active=True).select_related("user", "provider")
+    batch_size = settings.HUEY_TASK_CONFIG.get("ENQUEUE_BATCH_SIZE", 500)
 
-    sync_results = []
+    def build_task(link: ProviderLink) -> Task:
+        # Build device sync task; written to the queue with its batch
+        return sync_user_devices.s(
+            user_id=link.user.ehr_user_id,
+            provider_name=link.provider.provider_type,
+            provider_link_id=link.pk,
+        )
 
-    for link in active_links:
-        try:
-            # Validate provider is supported
-            if link.provider.provider_type not in [p.value for p in Provider]:
-                logger.warning(f"Unsupported provider {link.provider.provider_type} for link {link.pk}")
-                continue
-
-            # Check for access token
-            if not link.extra_data or "access_token" not in link.extra_data:
-                logger.warning(f"No access token found for provider link {link.pk}")
-                continue
-
-            # Queue device sync task asynchronously
-            task = sync_user_devices(
-                user_id=link.user.ehr_user_id,
-                provider_name=link.provider.provider_type,
-            )
-            sync_results.append(
-                {
-                    "task_id": getattr(task, "id", None),
-                    "queued": True,
-                    "link_id": link.pk,
-                    "user_id": link.user.ehr_user_id,
-                    "provider": link.provider.provider_type,
-                }
-            )
-
-            logger.info(f"Queued device sync for user {link.user.ehr_user_id} with {link.provider.provider_type}")
-
-        except Exception as e:
-            error_result = {
-                "error": f"Error processing provider link {link.pk}: {e}",
-                "success": False,
-                "link_id": link.pk,
-            }
-            sync_results.append(error_result)
-            logger.error(f"Error processing provider link {link.pk}: {e}")
+    # Stream links in chunks so the queryset does not cache every row
+    sync_results = enqueue_link_tasks(active_provider_links().iterator(chunk_size=batch_size), build_task, batch_size)
 
     logger.info(f"Nightly device sync completed. Processed {len(sync_results)} provider links")
     return sync_results
 
 
-def _update_provider_link_sync_info(user: EHRUser, provider: Provider, result) -> None:
+def _update_provider_link_sync_info(
+    user: EHRUser, provider: Provider, result, provider_link_id: int | None = None
+) -> None:
     """Update provider link with sync information"""
     try:
-        provider_link = ProviderLink.objects.filter(user=user, provider__provider_type=provider.value).first()
-
-        if provider_link:
-            # Update extra_data with sync information
-            if not provider_link.extra_data:
-                provider_link.extra_data = {}
-
-            provider_link.extra_data.update(
+        # Primary-key match when the caller knows the link, otherwise by user and provider type
+        if provider_link_id is not None:
+            provider_links = ProviderLink.objects.filter(pk=provider_link_id)
+        else:
+            provider_links = ProviderLink.objects.filter(user=user, provider__provider_type=provider.value)
+
+        updated = provider_links.update(
+            extra_data=merged_extra_data(
                 {
                     "last_device_sync": result.sync_timestamp,
                     "last_sync_device_count": result.processed_devices,
@@ -173,14 +156,32 @@ def _update_provider_link_sync_info(user: EHRUser, provider: Provider, result) -
                     "last_sync_success": result.success,
                 }
             )
-            provider_link.save()
-            logger.info(f"Updated provider link {provider_link.pk} with sync information")
+        )
+
+        if updated:
+            logger.info(f"Updated provider link for user {user.ehr_user_id} with sync information")
 
     except Exception as e:
         logger.error(f"Failed to update provider link: {e}")
         raise
 
 
+@lru_cache(maxsize=256)
+def _webhook_collection_types(provider: Provider, data_types: frozenset[str]) -> tuple[str, ...]:
+    """Sorted webhook collection types for a set of data types; users share a handful of data type sets"""
+    collection_types = PROVIDER_CONFIGS[provider].webhook_collection_types
+    types = frozenset[str]().union(
+        *(collection_types[data_type] for data_type in data_types if data_type in collection_types)
+    )
+    return tuple(sorted(types))
+
+
+@cache
+def _subscription_manager() -> WebhookSubscriptionManager:
+    """Subscription manager shared by tasks in this worker process, keeping its HTTP session pooled"""
+    return WebhookSubscriptionManager()
+
+
 @HUEY.task(priority=3)  # Medium priority for subscription management
 def ensure_webhook_subscriptions(user_id: str, provider_name: str, data_types: list[str] | None = None) -> dict:
     """
@@ -201,7 +202,7 @@ def ensure_webhook_subscriptions(user_id: str, provider_name: str, data_types: l
         # Validate inputs
         try:
             user = EHRUser.objects.get(ehr_user_id=user_id)
-            provider = Provider(provider_name)
+            provider = provider_from_value(provider_name)
         except EHRUser.DoesNotExist:
             error_msg = f"EHR user {user_id} not found"
             logger.error(error_msg)
@@ -212,8 +213,6 @@ def ensure_webhook_subscriptions(user_id: str, provider_name: str, data_types: l
             return {"error": error_msg, "success": False}
 
         # Get provider configuration
-        from ingestors.constants import PROVIDER_CONFIGS
-
         provider_config = PROVIDER_CONFIGS.get(provider)
         if not provider_config:
             error_msg = f"No configuration found for provider {provider_name}"
@@ -221,8 +220,6 @@ def ensure_webhook_subscriptions(user_id: str, provider_name: str, data_types: l
             return {"error": error_msg, "success": False}
 
         # Get configured data types from database provider settings
-        from base.models import Provider as ProviderModel
-
         try:
             provider_db = ProviderModel.objects.get(provider_type=provider_name, active=True)
             effective_data_types = provider_db.get_effective_data_types() if not data_types else data_types
@@ -242,17 +239,11 @@ def ensure_webhook_subscriptions(user_id: str, provider_name: str, data_types: l
         # Use effective data types
         data_types = effective_data_types
 
-        # Import subscription manager
-        from webhooks.subscriptions import WebhookSubscriptionManager
-
-        subscription_manager = WebhookSubscriptionManager()
+        subscription_manager = _subscription_manager()
 
         try:
             # Get collection types from provider configuration
-            all_collection_types = set()
-            for data_type in data_types:
-                if data_type in provider_config.webhook_collection_types:
-                    all_collection_types.update(provider_config.webhook_collection_types[data_type])
+            all_collection_types = _webhook_collection_types(provider, frozenset(data_types))
 
             if not all_collection_types:
                 error_msg = f"No webhook collection types found for data types {data_types}"
@@ -274,21 +265,18 @@ def ensure_webhook_subscriptions(user_id: str, provider_name: str, data_types: l
 
             # Update provider link with subscription info
             try:
-                provider_link = ProviderLink.objects.filter(user=user, provider__provider_type=provider.value).first()
-
-                if provider_link:
-                    if not provider_link.extra_data:
-                        provider_link.extra_data = {}
-
-                    provider_link.extra_data.update(
+                updated = ProviderLink.objects.filter(user=user, provider__provider_type=provider.value).update(
+                    extra_data=merged_extra_data(
                         {
                             "webhook_subscriptions_created": timezone.now().isoformat(),
                             "subscribed_data_types": data_types,
                             "webhook_active": True,
                         }
                     )
-                    provider_link.save()
-                    logger.debug(f"Updated provider link {provider_link.pk} with subscription info")
+                )
+
+                if updated:
+                    logger.debug(f"Updated provider link for user {user_id} with subscription info")
 
             except Exception as e:
                 logger.warning(f"Could not update provider link with subscription info: {e}")
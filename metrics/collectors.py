@@ -155,6 +155,29 @@ class MetricsCollector:
         """Record a rate limit hit."""
         PROVIDER_API_RATE_LIMITS.labels(provider=provider).inc()
 
+    def record_operation_batch(
+        self,
+        provider: str,
+        operation_type: str,
+        status: str,
+        duration: float | None = None,
+        error_type: str | None = None,
+        rate_limited: bool = False,
+    ):
+        """
+        Record the full outcome of one operation in a single call.
+
+        Combines the sync operation, provider error and rate limit metrics that a failed
+        call would otherwise emit separately.
+        """
+        self.record_sync_operation(provider, operation_type, status, duration)
+
+        if error_type:
+            self.record_provider_api_error(provider, error_type)
+
+        if rate_limited:
+            self.record_rate_limit(provider)
+
     def update_system_metrics(self):
         """Update system health metrics."""
         try:
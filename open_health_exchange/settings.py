@@ -242,12 +242,23 @@ FHIR_AUTH_TOKEN_VALUE = os.environ.get("FHIR_AUTH_TOKEN_VALUE", "")
 DEVICE_MAPPING = {
     "CACHE_TTL": int(os.environ.get("DEVICE_CACHE_TTL", "86400")),  # 24 hours default
     "NEGATIVE_CACHE_TTL": int(os.environ.get("DEVICE_NEGATIVE_CACHE_TTL", "3600")),  # 1 hour default
+    # Ceiling for jittered negative TTLs (entries are spread +/-10% around NEGATIVE_CACHE_TTL), keep it
+    # above NEGATIVE_CACHE_TTL * 1.1 or the upper buckets collapse onto the ceiling
+    "NEGATIVE_CACHE_MAX_TTL": int(os.environ.get("DEVICE_NEGATIVE_CACHE_MAX_TTL", "7200")),  # 2 hours default
     "CACHE_PREFIX": "device_mapping",
     "IDENTIFIER_SYSTEMS": {
         "fitbit": "https://api.fitbit.com/device-id",
         "withings": "https://api.withings.com/device-id",
     },
     "BATCH_SIZE": int(os.environ.get("DEVICE_BATCH_SIZE", "50")),  # Max devices per batch
+    "BATCH_CACHE_TTL": int(os.environ.get("DEVICE_BATCH_CACHE_TTL", "60")),  # Whole-batch responses, short-lived
+    "LOCAL_CACHE_SIZE": int(os.environ.get("DEVICE_LOCAL_CACHE_SIZE", "10000")),  # In-process entries per worker
+    "LOCAL_CACHE_TTL": int(os.environ.get("DEVICE_LOCAL_CACHE_TTL", "300")),  # 5 minutes default
+    "HTTP_POOL_SIZE": int(os.environ.get("DEVICE_HTTP_POOL_SIZE", "10")),  # Shared FHIR keep-alive connections
+    # Resolve from the local DeviceReference mirror before cache/FHIR (mirror is filled from FHIR hits)
+    "LOCAL_TABLE_FIRST": os.environ.get("DEVICE_LOCAL_TABLE_FIRST", "false").lower() == "true",
+    # Mirror rows not refreshed within this window are skipped and re-resolved through cache/FHIR
+    "LOCAL_TABLE_MAX_AGE": int(os.environ.get("DEVICE_LOCAL_TABLE_MAX_AGE", "86400")),  # 24 hours default
 }
 
 # API Client Configuration
@@ -257,6 +268,8 @@ API_CLIENT_CONFIG = {
     "TIMEOUT": int(os.environ.get("API_TIMEOUT", "30")),
     "RATE_LIMIT_WINDOW": int(os.environ.get("API_RATE_LIMIT_WINDOW", "60")),  # seconds (global default)
     "MAX_REQUESTS_PER_WINDOW": int(os.environ.get("API_MAX_REQUESTS_PER_WINDOW", "300")),  # global default
+    "FETCH_WORKERS": int(os.environ.get("API_FETCH_WORKERS", "4")),  # Data types fetched concurrently per sync
+    "FETCH_CHUNK_DAYS": int(os.environ.get("API_FETCH_CHUNK_DAYS", "30")),  # Longer ranges are fetched in windows
     # Per-provider rate limit overrides (takes precedence over global defaults)
     "PROVIDER_RATE_LIMITS": {
         "fitbit": {
@@ -451,7 +464,18 @@ CACHES = {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         },
         "KEY_PREFIX": "ohe",
-    }
+    },
+    # Device mapping values are short strings ("Device/<uuid>", "NOT_FOUND") and small dicts,
+    # so JSON avoids a pickle round trip per key. Separate prefix keeps it apart from pickled entries.
+    "device_map": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "SERIALIZER": "django_redis.serializers.json.JSONSerializer",
+        },
+        "KEY_PREFIX": "ohe_dm",
+    },
 }
 
 
@@ -481,6 +505,9 @@ FHIR_CLIENT_CONFIG = {
     "BATCH_SIZE": int(os.environ.get("FHIR_BATCH_SIZE", "100")),  # Standard FHIR batch size
     "MAX_RETRIES": int(os.environ.get("FHIR_MAX_RETRIES", "3")),
     "BACKOFF_FACTOR": float(os.environ.get("FHIR_BACKOFF_FACTOR", "1.0")),
+    "PUBLISH_WORKERS": int(
+        os.environ.get("FHIR_PUBLISH_WORKERS", "4")
+    ),  # Observation batches published concurrently per sync; keep low (<= 8) to spare the FHIR server
 }
 
 # Webhook Configuration
@@ -488,6 +515,9 @@ WEBHOOK_CONFIG = {
     "TIMEOUT": int(os.environ.get("WEBHOOK_TIMEOUT", "30")),  # Eliminates 5 hardcoded timeout=30
     "CACHE_TIMEOUT": int(os.environ.get("WEBHOOK_CACHE_TIMEOUT", "60")),  # Health check cache
     "MAX_RETRIES": int(os.environ.get("WEBHOOK_MAX_RETRIES", "3")),
+    "SYNC_COALESCE_SECONDS": float(
+        os.environ.get("WEBHOOK_SYNC_COALESCE_SECONDS", "0.5")
+    ),  # Merge webhook bursts per user/provider into one sync; 0 disables
 }
 
 # Circuit Breaker Configuration
@@ -514,9 +544,25 @@ HEALTH_DATA_CONFIG = {
         "INITIAL_SYNC": int(
             os.environ.get("HEALTH_DATA_INITIAL_BATCH_SIZE", "1000")
         ),  # Eliminates hardcoded batch_size=1000
+        "INCREMENTAL_SYNC": int(
+            os.environ.get("HEALTH_DATA_INCREMENTAL_BATCH_SIZE", "500")
+        ),  # Records transformed and published per batch in incremental syncs
+        "WEBHOOK_SYNC": int(
+            os.environ.get("HEALTH_DATA_WEBHOOK_BATCH_SIZE", "100")
+        ),  # Records transformed and published per batch in webhook syncs
+        "MANUAL_SYNC": int(
+            os.environ.get("HEALTH_DATA_MANUAL_BATCH_SIZE", "500")
+        ),  # Records transformed and published per batch in manual syncs
         "TEST": int(os.environ.get("HEALTH_DATA_TEST_BATCH_SIZE", "10")),  # Test environments
+        "ENQUEUE": int(
+            os.environ.get("HEALTH_DATA_ENQUEUE_BATCH_SIZE", "500")
+        ),  # Nightly sync tasks written to the queue per Redis round trip
     },
     "LOOKBACK_DAYS": int(os.environ.get("HEALTH_DATA_LOOKBACK_DAYS", "30")),  # Eliminates hardcoded 30 days
+    "NIGHTLY_SPREAD_SECONDS": int(
+        os.environ.get("HEALTH_DATA_NIGHTLY_SPREAD_SECONDS", "1800")
+    ),  # Random start delay per nightly sync to spread provider API load; 0 starts all at once
+    "HTTP_POOL_SIZE": int(os.environ.get("HEALTH_DATA_HTTP_POOL_SIZE", "10")),  # Shared FHIR keep-alive connections
     "FIELD_LENGTHS": {
         "EHR_USER_ID": int(os.environ.get("EHR_USER_ID_MAX_LENGTH", "100")),  # Eliminates hardcoded max_length=100
         "EHR_USER_ID_MIN": int(os.environ.get("EHR_USER_ID_MIN_LENGTH", "3")),  # Eliminates hardcoded min 3 chars
@@ -528,6 +574,9 @@ CACHE_TIMEOUTS = {
     "DEVICE_CACHE": int(os.environ.get("DEVICE_CACHE_TIMEOUT", "86400")),  # Eliminates hardcoded timeout=86400
     "ASSOCIATION_CACHE": int(os.environ.get("ASSOCIATION_CACHE_TIMEOUT", "86400")),  # 24 hours
     "WEBHOOK_HEALTH": int(os.environ.get("WEBHOOK_HEALTH_CACHE_TIMEOUT", "60")),  # Health check cache
+    "HEALTH_SYNC_HISTORY": int(
+        os.environ.get("HEALTH_SYNC_HISTORY_CACHE_TIMEOUT", "86400")
+    ),  # Whether a user has completed a health sync with a provider
     "OIDC_USERINFO": int(
         os.environ.get("OIDC_USERINFO_CACHE_TIMEOUT", "900")
     ),  # Matches accounts ACCESS_TOKEN_EXPIRE_SECONDS
@@ -538,6 +587,9 @@ HUEY_TASK_CONFIG = {
     "DEFAULT_TIMEOUT": int(os.environ.get("HUEY_DEFAULT_TIMEOUT", "3600")),  # Eliminates hardcoded timeout=3600
     "HEALTH_SYNC_TIMEOUT": int(os.environ.get("HUEY_HEALTH_SYNC_TIMEOUT", "3600")),
     "DEVICE_SYNC_TIMEOUT": int(os.environ.get("HUEY_DEVICE_SYNC_TIMEOUT", "1800")),
+    "ENQUEUE_BATCH_SIZE": int(
+        os.environ.get("HUEY_ENQUEUE_BATCH_SIZE", "500")
+    ),  # Nightly device sync tasks written to the queue per Redis round trip
 }
 
 # System URLs Configuration - Eliminates hardcoded URL patterns
@@ -7,14 +7,35 @@ from typing import Any, cast
 
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 
+def create_pooled_session(pool_size: int) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool of the given size.
+
+    Share one session between threads so connections (and TLS handshakes) are reused
+    across FHIR calls instead of opening a new connection per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class FHIRClient:
     """Client for interacting with FHIR server"""
 
-    def __init__(self, base_url: str | None = None, auth_token: str | None = None, auth_header: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        auth_token: str | None = None,
+        auth_header: str | None = None,
+        session: requests.Session | None = None,
+    ):
         """
         Initialize FHIR client.
 
@@ -22,6 +43,7 @@ class FHIRClient:
             base_url: FHIR server base URL (defaults to settings.FHIR_BASE_URL)
             auth_token: Authentication token value (defaults to settings.FHIR_AUTH_TOKEN_VALUE)
             auth_header: Authentication header name (defaults to settings.FHIR_AUTH_TOKEN_HEADER)
+            session: Shared pooled session (see create_pooled_session); one-off requests calls if omitted
         """
         self.base_url = base_url or settings.FHIR_BASE_URL
         self.auth_header = auth_header or settings.FHIR_AUTH_TOKEN_HEADER
@@ -33,6 +55,8 @@ class FHIRClient:
         if not self.auth_value:
             raise ValueError("FHIR_AUTH_TOKEN_VALUE not configured")
 
+        self._http = session or requests
+
         # Ensure base_url ends with /
         if not self.base_url.endswith("/"):
             self.base_url += "/"
@@ -62,7 +86,7 @@ class FHIRClient:
         url = f"{self.base_url}{resource_type}"
 
         try:
-            response = requests.get(
+            response = self._http.get(
                 url, headers=self._get_headers(), params=params or {}, timeout=settings.FHIR_CLIENT_CONFIG["TIMEOUT"]
             )
             response.raise_for_status()
@@ -85,7 +109,7 @@ class FHIRClient:
         url = f"{self.base_url}{resource_type}/{resource_id}"
 
         try:
-            response = requests.get(url, headers=self._get_headers(), timeout=settings.FHIR_CLIENT_CONFIG["TIMEOUT"])
+            response = self._http.get(url, headers=self._get_headers(), timeout=settings.FHIR_CLIENT_CONFIG["TIMEOUT"])
             response.raise_for_status()
             return cast(dict[Any, Any], response.json())
         except requests.exceptions.RequestException as e:
@@ -109,7 +133,7 @@ class FHIRClient:
         resource_data["resourceType"] = resource_type
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 url, headers=self._get_headers(), json=resource_data, timeout=settings.FHIR_CLIENT_CONFIG["TIMEOUT"]
             )
             response.raise_for_status()
@@ -139,7 +163,7 @@ class FHIRClient:
         resource_data["id"] = resource_id
 
         try:
-            response = requests.put(
+            response = self._http.put(
                 url, headers=self._get_headers(), json=resource_data, timeout=settings.FHIR_CLIENT_CONFIG["TIMEOUT"]
             )
             response.raise_for_status()
@@ -161,7 +185,9 @@ class FHIRClient:
         url = f"{self.base_url}{resource_type}/{resource_id}"
 
         try:
-            response = requests.delete(url, headers=self._get_headers(), timeout=settings.FHIR_CLIENT_CONFIG["TIMEOUT"])
+            response = self._http.delete(
+                url, headers=self._get_headers(), timeout=settings.FHIR_CLIENT_CONFIG["TIMEOUT"]
+            )
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             logger.error(f"Error deleting {resource_type}/{resource_id}: {e}")
@@ -17,8 +17,8 @@ logger = logging.getLogger(__name__)
 class HealthDataPublisher:
     """Publishes and manages FHIR health data resources"""
 
-    def __init__(self):
-        self.fhir_client = FHIRClient()
+    def __init__(self, fhir_client: FHIRClient | None = None):
+        self.fhir_client = fhir_client or FHIRClient()
 
     def publish_health_observations(
         self, observations: list[dict[str, Any]], batch_size: int | None = None
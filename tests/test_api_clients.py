@@ -256,7 +256,7 @@ class TestWithingsDataFetching:
                 mock_config.return_value = MagicMock(
                     api_endpoint="/measure",
                     api_action="getmeas",
-                    meastype=1,
+                    meastype=(1,),
                 )
 
                 date_range = DateRange(
@@ -290,7 +290,7 @@ class TestWithingsDataFetching:
                 mock_config.return_value = MagicMock(
                     api_endpoint="/measure",
                     api_action="getmeas",
-                    meastype=1,
+                    meastype=(1,),
                 )
 
                 date_range = DateRange(
@@ -458,7 +458,7 @@ class TestTokenManagement:
         assert result is True
         assert mock_social_auth.extra_data["access_token"] == "new_access_token"
         assert mock_social_auth.extra_data["refresh_token"] == "new_refresh_token"
-        mock_social_auth.save.assert_called_once()
+        mock_social_auth.save.assert_called_once_with(update_fields=["extra_data"])
 
     @responses.activate
     def test_refresh_withings_token_failure(self, client, mock_settings):
@@ -697,6 +697,7 @@ class TestWithingsResponseProcessing:
         assert len(result) == 1
         assert result[0]["value"] == 75.0
         assert result[0]["device_id"] == "device-123"
+        assert result[0]["meastype"] == 1
         assert result[0]["measurement_source"] == MeasurementSource.DEVICE
 
     def test_process_withings_measurements_user_entry(self, client):
@@ -2,14 +2,19 @@
 Tests for device mapping service.
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
+from freezegun import freeze_time
 
 from ingestors.constants import Provider
 from ingestors.device_mapping_service import (
     DeviceMappingService,
     DeviceQuery,
+    LocalDeviceCache,
     bulk_map_devices,
     get_device_mapping_service,
     get_fhir_device_reference,
@@ -64,6 +69,27 @@ class TestDeviceQuery:
             query.device_id = "new-id"
 
 
+class TestRealSettings:
+    """Tests against the DEVICE_MAPPING dict from project settings, without patching."""
+
+    def test_device_query_cache_key(self):
+        """Test cache keys are built from the configured prefix."""
+        query = DeviceQuery(provider=Provider.WITHINGS, device_id="device-123")
+
+        assert query.cache_key == "device_mapping:withings:device-123"
+
+    def test_service_reads_configured_keys(self):
+        """Test the service finds every key it reads from DEVICE_MAPPING."""
+        service = DeviceMappingService(fhir_client=MagicMock())
+        queries = [
+            DeviceQuery(provider=Provider.WITHINGS, device_id="device-1"),
+            DeviceQuery(provider=Provider.FITBIT, device_id="device-2"),
+        ]
+
+        assert service._batch_response_key(queries).startswith("device_mapping:batch:")
+        assert service.get_cache_stats()["cache_prefix"] == "device_mapping"
+
+
 class TestDeviceMappingService:
     """Tests for DeviceMappingService class."""
 
@@ -183,6 +209,253 @@ class TestDeviceMappingService:
             # Should return None for all queries on error
             assert result["device-1"] is None
 
+    def test_get_device_references_local_tier_hit(self, service, mock_fhir_client):
+        """Test repeated lookups are served from the in-process tier."""
+        with patch("ingestors.device_mapping_service.cache") as mock_cache:
+            mock_cache.get_many.return_value = {}
+            mock_fhir_client.search_resource.return_value = {"entry": [{"resource": {"id": "uuid-456"}}]}
+
+            first = service.get_fhir_device_reference(Provider.WITHINGS, "device-123")
+            second = service.get_fhir_device_reference(Provider.WITHINGS, "device-123")
+
+            assert first == second == "Device/uuid-456"
+            assert mock_cache.get_many.call_count == 1
+            assert mock_fhir_client.search_resource.call_count == 1
+
+    def test_get_device_references_local_tier_partial_hit(self, service, mock_fhir_client):
+        """Test only locally unknown devices reach the shared cache."""
+        with patch("ingestors.device_mapping_service.cache") as mock_cache:
+            mock_cache.get_many.return_value = {"device_map:withings:device-1": "Device/uuid-1"}
+            service.bulk_map_devices(Provider.WITHINGS, ["device-1"])
+
+            mock_cache.get_many.return_value = {"device_map:withings:device-2": "Device/uuid-2"}
+            result = service.bulk_map_devices(Provider.WITHINGS, ["device-1", "device-2"])
+
+            assert result == {"device-1": "Device/uuid-1", "device-2": "Device/uuid-2"}
+            mock_cache.get_many.assert_called_with(["device_map:withings:device-2"])
+
+    def test_get_device_references_failure_not_cached_locally(self, service, mock_fhir_client):
+        """Test failed batch operations are not stored in the in-process tier."""
+        with (
+            patch("ingestors.device_mapping_service.cache") as mock_cache,
+            patch.object(service, "_batch_fhir_search", side_effect=Exception("FHIR error")),
+        ):
+            mock_cache.get_many.return_value = {}
+            result = service.get_fhir_device_reference(Provider.WITHINGS, "device-1")
+
+            assert result is None
+            assert len(service._local) == 0
+
+    def test_get_device_references_batch_cache_hit(self, service, mock_fhir_client):
+        """Test a cached whole-batch response skips per-ID lookups."""
+        with patch("ingestors.device_mapping_service.cache") as mock_cache:
+            mock_cache.get.return_value = {"device-1": "Device/uuid-1", "device-2": None}
+
+            result = service.bulk_map_devices(Provider.WITHINGS, ["device-2", "device-1"])
+
+            assert result == {"device-1": "Device/uuid-1", "device-2": None}
+            mock_cache.get_many.assert_not_called()
+            mock_fhir_client.search_resource.assert_not_called()
+
+    def test_get_device_references_batch_cache_store(self, service, mock_fhir_client):
+        """Test resolved batches are stored under an order-independent key."""
+        with patch("ingestors.device_mapping_service.cache") as mock_cache:
+            mock_cache.get.return_value = None
+            mock_cache.get_many.return_value = {
+                "device_map:withings:device-1": "Device/uuid-1",
+                "device_map:withings:device-2": "Device/uuid-2",
+            }
+
+            service.bulk_map_devices(Provider.WITHINGS, ["device-1", "device-2"])
+
+            batch_key = mock_cache.set.call_args.args[0]
+            assert mock_cache.set.call_args.args[1] == {"device-1": "Device/uuid-1", "device-2": "Device/uuid-2"}
+            assert batch_key.startswith("device_map:batch:")
+            assert (
+                service._batch_response_key(
+                    [DeviceQuery(Provider.WITHINGS, "device-2"), DeviceQuery(Provider.WITHINGS, "device-1")]
+                )
+                == batch_key
+            )
+
+    def test_get_device_references_batch_cache_incomplete_ignored(self, service, mock_fhir_client):
+        """Test a cached batch missing queried devices falls back to per-ID lookup."""
+        with patch("ingestors.device_mapping_service.cache") as mock_cache:
+            mock_cache.get.return_value = {"device-1": "Device/uuid-1"}
+            mock_cache.get_many.return_value = {
+                "device_map:withings:device-1": "Device/uuid-1",
+                "device_map:withings:device-2": "Device/uuid-2",
+            }
+
+            result = service.bulk_map_devices(Provider.WITHINGS, ["device-1", "device-2"])
+
+            assert result["device-2"] == "Device/uuid-2"
+            mock_cache.get_many.assert_called_once()
+
+    def test_batch_response_key_single_query(self, service):
+        """Test single queries don't use the batch response cache."""
+        assert service._batch_response_key([DeviceQuery(Provider.WITHINGS, "device-1")]) is None
+
+
+class TestLocalTableFirst:
+    """Tests for the optional DeviceReference mirror lookup."""
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Mock Django settings with the local table enabled."""
+        with patch("ingestors.device_mapping_service.settings") as mock:
+            mock.DEVICE_MAPPING = {
+                "CACHE_PREFIX": "device_map",
+                "CACHE_TTL": 3600,
+                "NEGATIVE_CACHE_TTL": 600,
+                "BATCH_SIZE": 100,
+                "LOCAL_TABLE_FIRST": True,
+                "LOCAL_TABLE_MAX_AGE": 600,
+                "IDENTIFIER_SYSTEMS": {
+                    "withings": "https://api.withings.com/device-id",
+                },
+            }
+            yield mock
+
+    @pytest.fixture
+    def mock_fhir_client(self):
+        """Create mock FHIR client."""
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, mock_settings, mock_fhir_client):
+        """Create service instance."""
+        return DeviceMappingService(fhir_client=mock_fhir_client)
+
+    def test_table_hits_skip_cache_and_fhir(self, service, mock_fhir_client):
+        """Test devices found in the mirror never reach the cache or FHIR."""
+        with (
+            patch("ingestors.device_mapping_service.DeviceReference") as mock_model,
+            patch("ingestors.device_mapping_service.cache") as mock_cache,
+        ):
+            mock_model.objects.filter.return_value.values_list.return_value = [
+                ("device-1", "Device/uuid-1"),
+                ("device-2", "Device/uuid-2"),
+            ]
+
+            result = service.bulk_map_devices(Provider.WITHINGS, ["device-1", "device-2"])
+
+            assert result == {"device-1": "Device/uuid-1", "device-2": "Device/uuid-2"}
+            mock_model.objects.filter.assert_called_once()
+            assert mock_model.objects.filter.call_args.kwargs["device_id__in"] == ["device-1", "device-2"]
+            mock_cache.get_many.assert_not_called()
+            mock_fhir_client.search_resource.assert_not_called()
+
+    def test_table_misses_fall_through_and_populate_mirror(self, service, mock_fhir_client):
+        """Test unknown devices go to FHIR and positive hits are upserted into the mirror."""
+        with (
+            patch("ingestors.device_mapping_service.DeviceReference") as mock_model,
+            patch("ingestors.device_mapping_service.cache") as mock_cache,
+        ):
+            mock_model.objects.filter.return_value.values_list.return_value = []
+            mock_cache.get_many.return_value = {}
+            mock_fhir_client.search_resource.return_value = {"entry": [{"resource": {"id": "uuid-1"}}]}
+
+            result = service.get_fhir_device_reference(Provider.WITHINGS, "device-1")
+
+            assert result == "Device/uuid-1"
+            mock_model.objects.bulk_create.assert_called_once()
+            assert mock_model.objects.bulk_create.call_args.kwargs["update_conflicts"] is True
+            mock_model.assert_called_once_with(provider="withings", device_id="device-1", fhir_reference=result)
+
+    def test_table_failure_falls_back_to_cache(self, service, mock_fhir_client):
+        """Test a failing mirror query falls back to the cache path."""
+        with (
+            patch("ingestors.device_mapping_service.DeviceReference") as mock_model,
+            patch("ingestors.device_mapping_service.cache") as mock_cache,
+        ):
+            mock_model.objects.filter.side_effect = Exception("DB down")
+            mock_cache.get_many.return_value = {"device_map:withings:device-1": "Device/uuid-1"}
+
+            result = service.get_fhir_device_reference(Provider.WITHINGS, "device-1")
+
+            assert result == "Device/uuid-1"
+
+    @freeze_time("2024-01-15 12:00:00", tz_offset=0)
+    def test_stale_rows_are_ignored(self, service):
+        """Test the mirror query only accepts rows refreshed within LOCAL_TABLE_MAX_AGE."""
+        with patch("ingestors.device_mapping_service.DeviceReference") as mock_model:
+            mock_model.objects.filter.return_value.values_list.return_value = []
+
+            service._local_table_lookup([DeviceQuery(Provider.WITHINGS, "device-1")])
+
+            fresh_since = mock_model.objects.filter.call_args.kwargs["updated_at__gte"]
+            assert fresh_since == datetime(2024, 1, 15, 11, 50, tzinfo=UTC)
+
+    def test_negative_results_not_mirrored(self, service):
+        """Test only positive results are written to the mirror."""
+        with patch("ingestors.device_mapping_service.DeviceReference") as mock_model:
+            service._local_table_store([DeviceQuery(Provider.WITHINGS, "device-1")], {"device-1": None})
+
+            mock_model.objects.bulk_create.assert_not_called()
+
+
+class TestLocalDeviceCache:
+    """Tests for LocalDeviceCache in-process tier."""
+
+    def test_expired_entries_are_misses(self):
+        """Test entries past their TTL fall through to remaining queries."""
+        local = LocalDeviceCache(maxsize=10, ttl=60)
+        query = DeviceQuery(Provider.WITHINGS, "device-1")
+        local.set_many([query], {"device-1": "Device/uuid-1"})
+
+        with patch("ingestors.device_mapping_service.time.monotonic", return_value=time.monotonic() + 120):
+            hits, remaining = local.get_many([query])
+
+        assert hits == {}
+        assert remaining == [query]
+
+    def test_negative_results_are_cached(self):
+        """Test None results are served as local hits."""
+        local = LocalDeviceCache(maxsize=10, ttl=60)
+        query = DeviceQuery(Provider.FITBIT, "device-1")
+        local.set_many([query], {"device-1": None})
+
+        hits, remaining = local.get_many([query])
+
+        assert hits == {"device-1": None}
+        assert remaining == []
+
+    def test_evicts_oldest_beyond_maxsize(self):
+        """Test least recently stored entries are evicted."""
+        local = LocalDeviceCache(maxsize=2, ttl=60)
+        queries = [DeviceQuery(Provider.WITHINGS, f"device-{i}") for i in range(3)]
+        local.set_many(queries, {f"device-{i}": f"Device/uuid-{i}" for i in range(3)})
+
+        hits, remaining = local.get_many(queries)
+
+        assert len(local) == 2
+        assert remaining == [queries[0]]
+        assert set(hits) == {"device-1", "device-2"}
+
+    def test_hit_refreshes_recency(self):
+        """Test a hit protects the entry from the next eviction."""
+        local = LocalDeviceCache(maxsize=2, ttl=60)
+        queries = [DeviceQuery(Provider.WITHINGS, f"device-{i}") for i in range(3)]
+        local.set_many(queries[:2], {"device-0": "Device/uuid-0", "device-1": "Device/uuid-1"})
+
+        local.get_many([queries[0]])
+        local.set_many([queries[2]], {"device-2": "Device/uuid-2"})
+
+        hits, remaining = local.get_many(queries)
+        assert set(hits) == {"device-0", "device-2"}
+        assert remaining == [queries[1]]
+
+    def test_clear(self):
+        """Test clearing the local tier."""
+        local = LocalDeviceCache(maxsize=10, ttl=60)
+        query = DeviceQuery(Provider.WITHINGS, "device-1")
+        local.set_many([query], {"device-1": "Device/uuid-1"})
+
+        local.clear()
+
+        assert len(local) == 0
+
 
 class TestBatchCacheLookup:
     """Tests for _batch_cache_lookup method."""
@@ -336,19 +609,34 @@ class TestBatchFHIRSearch:
 
     def test_batch_fhir_search_multiple_providers(self, service, mock_fhir_client):
         """Test FHIR search with multiple providers."""
-        mock_fhir_client.search_resource.side_effect = [
-            {"entry": [{"resource": {"id": "withings-uuid"}}]},
-            {"entry": [{"resource": {"id": "fitbit-uuid"}}]},
-        ]
+        # Queries are grouped by provider, so answer by identifier rather than call order
+        mock_fhir_client.search_resource.side_effect = lambda resource_type, params: {
+            "entry": [{"resource": {"id": params["identifier"].split("|")[1].replace("device", "uuid")}}]
+        }
 
         queries = [
             DeviceQuery(Provider.WITHINGS, "withings-device"),
             DeviceQuery(Provider.FITBIT, "fitbit-device"),
+            DeviceQuery(Provider.WITHINGS, "withings-device-2"),
         ]
         results = service._batch_fhir_search(queries)
 
         assert results["withings-device"] == "Device/withings-uuid"
         assert results["fitbit-device"] == "Device/fitbit-uuid"
+        assert results["withings-device-2"] == "Device/withings-uuid-2"
+        assert mock_fhir_client.search_resource.call_count == 3
+
+    def test_group_by_provider_preserves_order_within_provider(self, service):
+        """Test grouping yields each provider once with queries in original order."""
+        queries = [
+            DeviceQuery(Provider.WITHINGS, "w-1"),
+            DeviceQuery(Provider.FITBIT, "f-1"),
+            DeviceQuery(Provider.WITHINGS, "w-2"),
+        ]
+
+        groups = dict(service._group_by_provider(queries))
+
+        assert groups == {Provider.FITBIT: [queries[1]], Provider.WITHINGS: [queries[0], queries[2]]}
 
     def test_batch_fhir_search_error_handling(self, service, mock_fhir_client):
         """Test FHIR search error handling."""
@@ -432,6 +720,39 @@ class TestBatchCacheStore:
             # Should not raise
             service._batch_cache_store(queries, results)
 
+    def test_batch_cache_store_negative_ttl_jitter(self, service):
+        """Test negative entries are spread across jittered TTLs within +/-10%."""
+        with patch("ingestors.device_mapping_service.cache") as mock_cache:
+            queries = [DeviceQuery(Provider.WITHINGS, f"device-{i}") for i in range(200)]
+            results = {query.device_id: None for query in queries}
+
+            service._batch_cache_store(queries, results)
+
+            timeouts = [call.kwargs["timeout"] for call in mock_cache.set_many.call_args_list]
+            stored = sum(len(call.args[0]) for call in mock_cache.set_many.call_args_list)
+            assert 1 < len(timeouts) <= 4
+            assert len(set(timeouts)) == len(timeouts)
+            assert all(540 <= timeout <= 660 for timeout in timeouts)
+            assert stored == 200
+
+    def test_negative_ttl_buckets_span_both_sides_of_ttl(self, service):
+        """Test default buckets are distinct and jitter both below and above the TTL."""
+        buckets = service._bucket_negative_entries({f"key-{i}": "NOT_FOUND" for i in range(200)})
+
+        assert sorted(buckets) == [540, 580, 620, 660]
+
+    def test_batch_cache_store_negative_ttl_capped(self, service):
+        """Test jittered negative TTLs never exceed NEGATIVE_CACHE_MAX_TTL."""
+        service.config = {**service.config, "NEGATIVE_CACHE_MAX_TTL": 600}
+        with patch("ingestors.device_mapping_service.cache") as mock_cache:
+            queries = [DeviceQuery(Provider.WITHINGS, f"device-{i}") for i in range(200)]
+
+            service._batch_cache_store(queries, {query.device_id: None for query in queries})
+
+            timeouts = [call.kwargs["timeout"] for call in mock_cache.set_many.call_args_list]
+            assert all(timeout <= 600 for timeout in timeouts)
+            assert len(set(timeouts)) == len(timeouts)
+
 
 class TestGetIdentifierSystem:
     """Tests for _get_identifier_system method."""
@@ -546,6 +867,23 @@ class TestGlobalFunctions:
 
             assert service1 is service2
 
+    def test_get_device_mapping_service_concurrent_first_access(self, mock_settings):
+        """Test concurrent first access creates exactly one service and pooled client."""
+        import ingestors.device_mapping_service as module
+
+        module._device_mapping_service = None
+
+        with (
+            patch.object(module, "FHIRClient") as mock_client_cls,
+            patch.object(module, "create_pooled_session") as mock_session,
+            ThreadPoolExecutor(max_workers=8) as executor,
+        ):
+            services = list(executor.map(lambda _: get_device_mapping_service(), range(32)))
+
+        assert all(service is services[0] for service in services)
+        mock_client_cls.assert_called_once_with(session=mock_session.return_value)
+        mock_session.assert_called_once_with(10)
+
     def test_get_fhir_device_reference_function(self, mock_settings):
         """Test convenience function for single device mapping."""
         import ingestors.device_mapping_service as module
@@ -613,6 +951,19 @@ class TestSearchSingleDevice:
 
         assert result == "uuid-123"
 
+    def test_search_single_device_requests_minimal_elements(self, service, mock_fhir_client):
+        """Test the search asks the server for a trimmed Device resource."""
+        mock_fhir_client.search_resource.return_value = {"entry": []}
+
+        service._search_single_device("https://api.withings.com/device-id", "device-123")
+
+        params = mock_fhir_client.search_resource.call_args.args[1]
+        assert params == {
+            "identifier": "https://api.withings.com/device-id|device-123",
+            "_count": 1,
+            "_elements": "identifier",
+        }
+
     def test_search_single_device_not_found(self, service, mock_fhir_client):
         """Test when device not found."""
         mock_fhir_client.search_resource.return_value = {"entry": []}
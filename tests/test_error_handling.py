@@ -2,6 +2,8 @@
 Tests for error handling utilities.
 """
 
+import asyncio
+import inspect
 from unittest.mock import patch
 
 import pytest
@@ -168,8 +170,12 @@ class TestErrorHandler:
                 failing_operation()
 
             assert exc_info.value.error_type == ErrorType.NETWORK_ERROR
-            assert mock_metrics.record_sync_operation.called
-            assert mock_metrics.record_provider_api_error.called
+            mock_metrics.record_operation_batch.assert_called_once()
+            call_kwargs = mock_metrics.record_operation_batch.call_args.kwargs
+            assert call_kwargs["status"] == "error"
+            assert call_kwargs["error_type"] == ErrorType.NETWORK_ERROR.value
+            assert call_kwargs["rate_limited"] is False
+            mock_metrics.record_sync_operation.assert_not_called()
 
     def test_rate_limit_error_records_rate_limit_metric(self):
         """Test rate limit errors record specific metric."""
@@ -183,7 +189,9 @@ class TestErrorHandler:
                 rate_limited_operation()
 
             assert exc_info.value.error_type == ErrorType.RATE_LIMIT_ERROR
-            mock_metrics.record_rate_limit.assert_called_once_with("withings")
+            call_kwargs = mock_metrics.record_operation_batch.call_args.kwargs
+            assert call_kwargs["provider"] == "withings"
+            assert call_kwargs["rate_limited"] is True
 
     def test_auth_error_wraps_correctly(self):
         """Test auth errors are wrapped correctly."""
@@ -199,6 +207,21 @@ class TestErrorHandler:
             assert exc_info.value.error_type == ErrorType.AUTH_ERROR
             assert "Authentication failed" in str(exc_info.value)
 
+    def test_error_logs_with_exc_info(self):
+        """Test failures defer traceback formatting to the log handler."""
+        with patch("ingestors.error_handling.metrics"), patch("ingestors.error_handling.logger") as mock_logger:
+
+            @error_handler("withings", "fetch_data")
+            def failing_operation():
+                raise Exception("Connection timeout")
+
+            with pytest.raises(HealthDataError):
+                failing_operation()
+
+            call_kwargs = mock_logger.error.call_args.kwargs
+            assert call_kwargs["exc_info"] is True
+            assert "traceback" not in call_kwargs["extra"]
+
 
 class TestRetryHandler:
     """Tests for RetryHandler class."""
@@ -274,8 +297,8 @@ class TestRetryHandler:
 
         assert call_count == 3  # Initial + 2 retries
 
-    def test_exponential_backoff(self):
-        """Test exponential backoff calculation."""
+    def test_decorrelated_jitter_backoff(self):
+        """Test each delay is drawn from [base_delay, previous_delay * backoff_factor]."""
         handler = RetryHandler(
             max_retries=3,
             base_delay=1.0,
@@ -283,32 +306,99 @@ class TestRetryHandler:
             max_delay=10.0,
         )
 
-        # Test delay calculation: base_delay * (backoff_factor ** attempt)
-        # Attempt 0: 1.0 * (2.0 ** 0) = 1.0
-        # Attempt 1: 1.0 * (2.0 ** 1) = 2.0
-        # Attempt 2: 1.0 * (2.0 ** 2) = 4.0
-        # Max delay caps at 10.0
+        # random.uniform returns its upper bound, so delays grow 1.0 -> 2.0 -> 4.0 -> 8.0
+        with (
+            patch("time.sleep") as mock_sleep,
+            patch("ingestors.error_handling.random.uniform", side_effect=lambda low, high: high) as mock_uniform,
+        ):
+
+            @handler
+            def failing_op():
+                raise HealthDataError("Error", ErrorType.NETWORK_ERROR)
+
+            with pytest.raises(HealthDataError):
+                failing_op()
+
+            delays = [call.args[0] for call in mock_sleep.call_args_list]
+            bounds = [call.args for call in mock_uniform.call_args_list]
+
+        # Should have 3 sleep calls (for retries 1, 2, 3)
+        assert delays == [2.0, 4.0, 8.0]
+        assert bounds == [(1.0, 2.0), (1.0, 4.0), (1.0, 8.0)]
+
+    def test_jittered_delays_within_bounds(self):
+        """Test unpatched jittered delays stay within [base_delay, max_delay]."""
+        handler = RetryHandler(max_retries=5, base_delay=1.0, backoff_factor=3.0, max_delay=10.0)
 
-        delays = []
         with patch("time.sleep") as mock_sleep:
 
             @handler
             def failing_op():
                 raise HealthDataError("Error", ErrorType.NETWORK_ERROR)
 
-            try:
+            with pytest.raises(HealthDataError):
                 failing_op()
-            except HealthDataError:
-                pass
 
-            # Collect delays from sleep calls
             delays = [call.args[0] for call in mock_sleep.call_args_list]
 
-        # Should have 3 sleep calls (for retries 1, 2, 3)
-        assert len(delays) == 3
-        assert delays[0] == 1.0
-        assert delays[1] == 2.0
-        assert delays[2] == 4.0
+        assert len(delays) == 5
+        assert all(1.0 <= delay <= 10.0 for delay in delays)
+
+    def test_retry_after_overrides_jitter(self):
+        """Test a server-provided retry_after is used as the delay."""
+        handler = RetryHandler(max_retries=1, base_delay=1.0, max_delay=10.0)
+
+        with patch("time.sleep") as mock_sleep:
+
+            @handler
+            def rate_limited_op():
+                raise HealthDataError("Server busy", ErrorType.API_ERROR, retry_after=7)
+
+            with pytest.raises(HealthDataError):
+                rate_limited_op()
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_retry_after_capped_at_max_delay(self):
+        """Test a retry_after above max_delay is clamped to max_delay."""
+        handler = RetryHandler(max_retries=2, base_delay=1.0, max_delay=5.0)
+
+        with patch("time.sleep") as mock_sleep:
+
+            @handler
+            def rate_limited_op():
+                raise HealthDataError("Server busy", ErrorType.API_ERROR, retry_after=86400)
+
+            with pytest.raises(HealthDataError):
+                rate_limited_op()
+
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [5.0, 5.0]
+
+    def test_retry_after_does_not_seed_jitter(self):
+        """Test jittered delays after a retry_after still grow from base_delay."""
+        handler = RetryHandler(max_retries=2, base_delay=1.0, backoff_factor=2.0, max_delay=60.0)
+        errors = iter(
+            [
+                HealthDataError("Server busy", ErrorType.API_ERROR, retry_after=30),
+                HealthDataError("Network error", ErrorType.NETWORK_ERROR),
+                HealthDataError("Network error", ErrorType.NETWORK_ERROR),
+            ]
+        )
+
+        with (
+            patch("time.sleep") as mock_sleep,
+            patch("ingestors.error_handling.random.uniform", side_effect=lambda low, high: high) as mock_uniform,
+        ):
+
+            @handler
+            def flaky_op():
+                raise next(errors)
+
+            with pytest.raises(HealthDataError):
+                flaky_op()
+
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [30.0, 2.0]
+        mock_uniform.assert_called_once_with(1.0, 2.0)
 
     def test_max_delay_cap(self):
         """Test max delay caps the backoff."""
@@ -370,6 +460,44 @@ class TestRetryHandler:
 
         assert call_count == 3  # Retried for validation errors
 
+    def test_async_function_retries_with_asyncio_sleep(self):
+        """Test coroutine functions are retried without blocking the event loop."""
+        handler = RetryHandler(max_retries=3, base_delay=0.01)
+        call_count = 0
+
+        @handler
+        async def eventually_succeeds():
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                raise HealthDataError("Network error", ErrorType.NETWORK_ERROR)
+            return "success"
+
+        with patch("time.sleep") as mock_sleep:
+            result = asyncio.run(eventually_succeeds())
+
+        assert result == "success"
+        assert call_count == 3
+        mock_sleep.assert_not_called()
+        assert inspect.iscoroutinefunction(eventually_succeeds)
+
+    def test_async_function_converts_and_raises_non_retryable(self):
+        """Test async wrapper converts regular exceptions and doesn't retry non-retryable ones."""
+        handler = RetryHandler(max_retries=3, base_delay=0.01)
+        call_count = 0
+
+        @handler
+        async def auth_failing():
+            nonlocal call_count
+            call_count += 1
+            raise Exception("401 unauthorized")
+
+        with pytest.raises(HealthDataError) as exc_info:
+            asyncio.run(auth_failing())
+
+        assert exc_info.value.error_type == ErrorType.AUTH_ERROR
+        assert call_count == 1
+
 
 class TestPredefinedRetryHandlers:
     """Tests for predefined retry handlers."""
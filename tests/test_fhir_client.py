@@ -7,7 +7,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 import requests
 
-from publishers.fhir.client import FHIRClient
+from publishers.fhir.client import FHIRClient, create_pooled_session
 
 
 @pytest.fixture
@@ -66,6 +66,30 @@ class TestFHIRClientInit:
             FHIRClient()
 
 
+class TestFHIRClientSession:
+    """Tests for pooled session support."""
+
+    def test_create_pooled_session_sizes_adapters(self):
+        """Test pooled session mounts adapters with the requested pool size."""
+        session = create_pooled_session(8)
+
+        adapter = session.get_adapter("https://fhir.example.com/")
+        assert adapter._pool_connections == 8
+        assert adapter._pool_maxsize == 8
+
+    def test_search_uses_shared_session(self, mock_settings):
+        """Test requests go through the shared session when provided."""
+        session = MagicMock()
+        session.get.return_value.json.return_value = {"total": 0}
+        client = FHIRClient(session=session)
+
+        with patch("publishers.fhir.client.requests.get") as mock_get:
+            client.search_resource("Device", {"identifier": "sys|1"})
+
+            mock_get.assert_not_called()
+        session.get.assert_called_once()
+
+
 class TestFHIRClientHeaders:
     """Tests for FHIRClient header generation."""
 
@@ -2,7 +2,9 @@
 Tests for health data managers.
 """
 
-from datetime import UTC, datetime
+import threading
+import time
+from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -14,6 +16,8 @@ from ingestors.health_data_constants import (
     HealthDataType,
     MeasurementSource,
     SyncTrigger,
+    data_types_from_values,
+    provider_from_value,
 )
 from ingestors.health_data_manager import (
     BaseHealthDataManager,
@@ -97,6 +101,18 @@ class TestWithingsHealthDataManager:
         assert HealthDataType.RR_INTERVALS in supported
         assert len(supported) == 9
 
+    def test_supported_data_types_precomputed_in_declaration_order(self, manager):
+        """Test supported data types are derived once, in HealthDataType declaration order."""
+        supported = manager.get_supported_data_types()
+
+        assert supported is manager.get_supported_data_types()
+        assert list(supported) == [data_type for data_type in HealthDataType if data_type in supported]
+
+    def test_supported_data_types_set_matches_ordered_types(self, manager):
+        """Test the membership set holds exactly the ordered supported data types."""
+        assert manager.supported_data_types_set() == frozenset(manager.get_supported_data_types())
+        assert isinstance(manager.supported_data_types_set(), frozenset)
+
     def test_fetch_health_data_heart_rate(self, manager):
         """Test fetching heart rate data."""
         mock_client = MagicMock()
@@ -432,17 +448,19 @@ class TestWithingsHealthDataManager:
         """Test that API errors don't stop processing other data types."""
         from ingestors.api_clients import APIError
 
-        mock_client = MagicMock()
-        # First call raises error, second returns data
-        mock_client.get_health_data.side_effect = [
-            APIError("API error"),
-            [
+        def get_health_data(provider, data_type, user_id, date_range):
+            # Heart rate fails, steps returns data (types may be fetched concurrently)
+            if data_type == HealthDataType.HEART_RATE:
+                raise APIError("API error")
+            return [
                 {
                     "date": datetime(2024, 1, 15, tzinfo=UTC),
                     "steps": 5000,
                 }
-            ],
-        ]
+            ]
+
+        mock_client = MagicMock()
+        mock_client.get_health_data.side_effect = get_health_data
 
         date_range = DateRange(
             start=datetime(2024, 1, 15, tzinfo=UTC),
@@ -463,22 +481,23 @@ class TestWithingsHealthDataManager:
 
     def test_fetch_health_data_multiple_types(self, manager):
         """Test fetching multiple data types at once."""
-        mock_client = MagicMock()
-        mock_client.get_health_data.side_effect = [
-            [
+        responses = {
+            HealthDataType.HEART_RATE: [
                 {
                     "timestamp": datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC),
                     "value": 72,
                     "measurement_source": MeasurementSource.DEVICE,
                 }
             ],
-            [
+            HealthDataType.STEPS: [
                 {
                     "date": datetime(2024, 1, 15, tzinfo=UTC),
                     "steps": 10000,
                 }
             ],
-        ]
+        }
+        mock_client = MagicMock()
+        mock_client.get_health_data.side_effect = lambda provider, data_type, user_id, date_range: responses[data_type]
 
         date_range = DateRange(
             start=datetime(2024, 1, 15, tzinfo=UTC),
@@ -495,6 +514,203 @@ class TestWithingsHealthDataManager:
 
         assert len(records) == 2
 
+    def test_fetch_health_data_concurrent_keeps_request_order(self, manager):
+        """Test records come back in requested data type order even when a later type finishes first."""
+
+        def get_health_data(provider, data_type, user_id, date_range):
+            if data_type == HealthDataType.HEART_RATE:
+                time.sleep(0.05)
+                return [{"timestamp": datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC), "value": 72}]
+            return [{"date": datetime(2024, 1, 15, tzinfo=UTC), "steps": 10000}]
+
+        mock_client = MagicMock()
+        mock_client.get_health_data.side_effect = get_health_data
+
+        date_range = DateRange(
+            start=datetime(2024, 1, 15, tzinfo=UTC),
+            end=datetime(2024, 1, 16, tzinfo=UTC),
+        )
+
+        with (
+            patch("ingestors.health_data_manager.get_unified_health_data_client", return_value=mock_client),
+            patch("ingestors.health_data_manager.settings") as mock_settings,
+        ):
+            mock_settings.API_CLIENT_CONFIG = {"FETCH_WORKERS": 2}
+            records = manager.fetch_health_data(
+                user_id="test-user",
+                data_types=[HealthDataType.HEART_RATE, HealthDataType.STEPS],
+                date_range=date_range,
+                sync_trigger=SyncTrigger.MANUAL,
+            )
+
+        assert [record.data_type for record in records] == [HealthDataType.HEART_RATE, HealthDataType.STEPS]
+
+    def test_fetch_health_data_drops_duplicate_records(self, manager):
+        """Test measurements the provider returns more than once are only returned once."""
+        mock_client = MagicMock()
+        mock_client.get_health_data.return_value = [
+            {"timestamp": datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC), "value": 72, "device_id": "dev-1"},
+            {"timestamp": datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC), "value": 72, "device_id": "dev-1"},
+            {"timestamp": datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC), "value": 74, "device_id": "dev-2"},
+        ]
+
+        date_range = DateRange(
+            start=datetime(2024, 1, 15, tzinfo=UTC),
+            end=datetime(2024, 1, 16, tzinfo=UTC),
+        )
+
+        with patch("ingestors.health_data_manager.get_unified_health_data_client", return_value=mock_client):
+            records = manager.fetch_health_data(
+                user_id="test-user",
+                data_types=[HealthDataType.HEART_RATE],
+                date_range=date_range,
+                sync_trigger=SyncTrigger.MANUAL,
+            )
+
+        assert [record.device_id for record in records] == ["dev-1", "dev-2"]
+
+    def test_fetch_health_data_keeps_measures_of_one_group(self, manager):
+        """Test distinct meastypes sharing a measure group's timestamp and device are all kept."""
+        timestamp = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
+        mock_client = MagicMock()
+        mock_client.get_health_data.return_value = [
+            {"timestamp": timestamp, "value": value, "device_id": "dev-1", "measurement_id": 42, "meastype": meastype}
+            for meastype, value in ((12, 36.9), (71, 36.8), (73, 33.5))
+        ]
+
+        date_range = DateRange(
+            start=datetime(2024, 1, 15, tzinfo=UTC),
+            end=datetime(2024, 1, 16, tzinfo=UTC),
+        )
+
+        with patch("ingestors.health_data_manager.get_unified_health_data_client", return_value=mock_client):
+            records = manager.fetch_health_data(
+                user_id="test-user",
+                data_types=[HealthDataType.TEMPERATURE],
+                date_range=date_range,
+                sync_trigger=SyncTrigger.MANUAL,
+            )
+
+        assert [record.metadata["meastype"] for record in records] == [12, 71, 73]
+
+    def test_fetch_health_data_long_range_fetched_in_chunks(self, manager):
+        """Test long ranges are fetched in FETCH_CHUNK_DAYS windows and concatenated in order."""
+        requested_ranges = []
+
+        def get_health_data(provider, data_type, user_id, date_range):
+            requested_ranges.append(date_range)
+            return [{"timestamp": date_range.start, "value": 60.0 + date_range.start.month}]
+
+        mock_client = MagicMock()
+        mock_client.get_health_data.side_effect = get_health_data
+
+        date_range = DateRange(
+            start=datetime(2024, 1, 1, tzinfo=UTC),
+            end=datetime(2024, 3, 15, tzinfo=UTC),
+        )
+
+        with (
+            patch("ingestors.health_data_manager.get_unified_health_data_client", return_value=mock_client),
+            patch("ingestors.health_data_manager.settings") as mock_settings,
+        ):
+            mock_settings.API_CLIENT_CONFIG = {"FETCH_WORKERS": 3, "FETCH_CHUNK_DAYS": 30}
+            records = manager.fetch_health_data(
+                user_id="test-user",
+                data_types=[HealthDataType.HEART_RATE],
+                date_range=date_range,
+                sync_trigger=SyncTrigger.MANUAL,
+            )
+
+        assert len(requested_ranges) == 3
+        assert [record.value for record in records] == [61.0, 61.0, 63.0]
+        assert [record.timestamp for record in records] == sorted(chunk.start for chunk in requested_ranges)
+
+    def test_fetch_health_data_bounds_requests_across_nested_pools(self, manager):
+        """Test data types and their date windows share FETCH_WORKERS concurrent provider requests."""
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def get_health_data(provider, data_type, user_id, date_range):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return []
+
+        mock_client = MagicMock()
+        mock_client.get_health_data.side_effect = get_health_data
+
+        date_range = DateRange(
+            start=datetime(2024, 1, 1, tzinfo=UTC),
+            end=datetime(2024, 3, 15, tzinfo=UTC),
+        )
+
+        with (
+            patch("ingestors.health_data_manager.get_unified_health_data_client", return_value=mock_client),
+            patch("ingestors.health_data_manager.settings") as mock_settings,
+        ):
+            mock_settings.API_CLIENT_CONFIG = {"FETCH_WORKERS": 2, "FETCH_CHUNK_DAYS": 30}
+            manager.fetch_health_data(
+                user_id="test-user",
+                data_types=[HealthDataType.HEART_RATE, HealthDataType.WEIGHT],
+                date_range=date_range,
+                sync_trigger=SyncTrigger.MANUAL,
+            )
+
+        assert mock_client.get_health_data.call_count == 6
+        assert peak <= 2
+
+
+class TestDateRangeSplit:
+    """Tests for DateRange.split."""
+
+    def test_short_range_is_single_chunk(self):
+        """Test a range within the window is returned as-is."""
+        date_range = DateRange(start=datetime(2024, 1, 1, tzinfo=UTC), end=datetime(2024, 1, 31, tzinfo=UTC))
+
+        assert date_range.split(timedelta(days=30)) == [date_range]
+
+    def test_chunks_start_at_midnight_without_overlap(self):
+        """Test chunks after the first start at midnight and end just before the next chunk."""
+        date_range = DateRange(start=datetime(2024, 1, 1, 10, 0, tzinfo=UTC), end=datetime(2024, 3, 15, tzinfo=UTC))
+
+        chunks = date_range.split(timedelta(days=30))
+
+        assert [chunk.start for chunk in chunks] == [
+            datetime(2024, 1, 1, 10, 0, tzinfo=UTC),
+            datetime(2024, 1, 31, tzinfo=UTC),
+            datetime(2024, 3, 1, tzinfo=UTC),
+        ]
+        assert chunks[-1].end == date_range.end
+        for chunk, next_chunk in zip(chunks, chunks[1:], strict=False):
+            assert chunk.end == next_chunk.start - timedelta(microseconds=1)
+
+
+class TestValueCoercion:
+    """Tests for string-to-enum coercion helpers."""
+
+    def test_provider_from_value(self):
+        """Test provider strings map to the enum member."""
+        assert provider_from_value("withings") is Provider.WITHINGS
+
+    def test_provider_from_unknown_value_raises(self):
+        """Test unknown providers raise ValueError like the enum constructor."""
+        with pytest.raises(ValueError, match="'garmin' is not a valid Provider"):
+            provider_from_value("garmin")
+
+    def test_data_types_from_values(self):
+        """Test data type strings map to enum members in order."""
+        assert data_types_from_values(["steps", "heart_rate"]) == [HealthDataType.STEPS, HealthDataType.HEART_RATE]
+
+    def test_data_types_from_unknown_value_raises(self):
+        """Test unknown data types raise ValueError like the enum constructor."""
+        with pytest.raises(ValueError, match="'mood' is not a valid HealthDataType"):
+            data_types_from_values(["steps", "mood"])
+
 
 class TestFitbitHealthDataManager:
     """Tests for FitbitHealthDataManager class."""
@@ -782,6 +998,13 @@ class TestHealthDataManagerFactory:
         assert isinstance(manager, FitbitHealthDataManager)
         assert manager.provider == Provider.FITBIT
 
+    def test_create_returns_shared_instance(self):
+        """Test the factory hands out one manager per provider."""
+        withings = HealthDataManagerFactory.create(Provider.WITHINGS)
+
+        assert HealthDataManagerFactory.create(Provider.WITHINGS) is withings
+        assert HealthDataManagerFactory.create(Provider.FITBIT) is not withings
+
     def test_create_unsupported_provider_raises(self):
         """Test that creating manager for unsupported provider raises error."""
         with pytest.raises(ValueError, match="Unsupported health data provider"):
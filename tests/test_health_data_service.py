@@ -2,6 +2,8 @@
 Tests for health data synchronization service.
 """
 
+import threading
+import time
 from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
@@ -15,7 +17,11 @@ from ingestors.health_data_constants import (
     SyncFrequency,
     SyncTrigger,
 )
-from ingestors.health_data_service import HealthDataSyncService, MockHealthDataSyncService
+from ingestors.health_data_service import (
+    HealthDataSyncService,
+    MockHealthDataSyncService,
+    get_health_data_sync_service,
+)
 
 
 class TestHealthDataSyncServiceInit:
@@ -34,6 +40,35 @@ class TestHealthDataSyncServiceInit:
         service = HealthDataSyncService(fhir_publisher=mock_publisher)
         assert service.fhir_publisher == mock_publisher
 
+    def test_services_share_transformer(self):
+        """Test the stateless transformer is shared rather than rebuilt per service."""
+        assert HealthDataSyncService(fhir_publisher=MagicMock()).transformer is (
+            HealthDataSyncService(fhir_publisher=MagicMock()).transformer
+        )
+
+
+class TestGetHealthDataSyncService:
+    """Tests for the shared per-worker service instance."""
+
+    def test_returns_singleton_with_pooled_client(self):
+        """Test the service is built once and publishes through a pooled FHIR session."""
+        import ingestors.health_data_service as module
+
+        module._health_data_sync_service = None
+
+        with (
+            patch.object(module, "HealthDataPublisher") as mock_publisher_cls,
+            patch.object(module, "FHIRClient") as mock_client_cls,
+            patch.object(module, "create_pooled_session") as mock_session,
+        ):
+            service1 = get_health_data_sync_service()
+            service2 = get_health_data_sync_service()
+
+        assert service1 is service2
+        mock_client_cls.assert_called_once_with(session=mock_session.return_value)
+        mock_publisher_cls.assert_called_once_with(fhir_client=mock_client_cls.return_value)
+        module._health_data_sync_service = None
+
 
 class TestCreateDefaultConfig:
     """Tests for _create_default_config method."""
@@ -53,7 +88,7 @@ class TestCreateDefaultConfig:
         """Test config has correct data types."""
         data_types = [HealthDataType.HEART_RATE, HealthDataType.STEPS]
         config = service._create_default_config("user-123", data_types)
-        assert config.enabled_data_types == data_types
+        assert config.enabled_data_types == frozenset(data_types)
 
     def test_creates_config_with_individual_aggregation(self, service):
         """Test config defaults to individual aggregation."""
@@ -79,15 +114,19 @@ class TestSyncUserHealthData:
         """Create service with mocked dependencies."""
         with (
             patch("ingestors.health_data_service.HealthDataPublisher") as mock_pub_class,
-            patch("ingestors.health_data_service.HealthDataTransformer") as mock_trans_class,
+            patch.object(HealthDataSyncService, "transformer") as mock_transformer,
+            patch("ingestors.health_data_service.cache") as mock_cache,
+            patch("ingestors.health_data_service.ProviderLink") as mock_provider_link,
         ):
             mock_publisher = MagicMock()
             mock_pub_class.return_value = mock_publisher
-            mock_transformer = MagicMock()
-            mock_trans_class.return_value = mock_transformer
+            mock_cache.get.return_value = None
+            mock_provider_link.objects.filter.return_value.exists.return_value = False
             svc = HealthDataSyncService()
             svc.mock_publisher = mock_publisher
             svc.mock_transformer = mock_transformer
+            svc.mock_cache = mock_cache
+            svc.mock_provider_link = mock_provider_link
             yield svc
 
     def test_converts_string_provider_to_enum(self, service):
@@ -182,6 +221,114 @@ class TestSyncUserHealthData:
             assert result.success is False
             assert len(result.errors) == 1
 
+    def test_transforms_and_publishes_in_batches(self, service):
+        """Test records are transformed and published one batch at a time."""
+        mock_records = [
+            HealthDataRecord(
+                provider=Provider.WITHINGS,
+                user_id="user-123",
+                data_type=HealthDataType.HEART_RATE,
+                timestamp=datetime.now(UTC),
+                value=70.0 + i,
+                unit="bpm",
+            )
+            for i in range(5)
+        ]
+        sync_strategy = MagicMock()
+        sync_strategy.get_sync_params.return_value = {"batch_size": 2}
+
+        with (
+            patch.object(service, "_fetch_health_data", return_value=mock_records),
+            patch.object(
+                service, "_transform_health_data", side_effect=lambda records, *_: [{"id": "obs"} for _ in records]
+            ) as mock_transform,
+            patch.object(
+                service,
+                "_publish_health_data",
+                side_effect=lambda observations, _: {"success": True, "published_successfully": len(observations)},
+            ) as mock_publish,
+        ):
+            result = service.sync_user_health_data(
+                user_id="user-123",
+                provider=Provider.WITHINGS,
+                data_types=[HealthDataType.HEART_RATE],
+                sync_strategy=sync_strategy,
+            )
+
+        assert sorted(len(call.args[0]) for call in mock_transform.call_args_list) == [1, 2, 2]
+        assert mock_publish.call_count == 3
+        assert result.success is True
+        assert result.records_transformed == 5
+        assert result.fhir_resources_created == 5
+
+    def test_publishes_batches_concurrently(self, service):
+        """Test observation batches are published on the bounded worker pool."""
+        mock_records = [
+            HealthDataRecord(
+                provider=Provider.WITHINGS,
+                user_id="user-123",
+                data_type=HealthDataType.HEART_RATE,
+                timestamp=datetime.now(UTC),
+                value=70.0 + i,
+                unit="bpm",
+            )
+            for i in range(4)
+        ]
+        sync_strategy = MagicMock()
+        sync_strategy.get_sync_params.return_value = {"batch_size": 1}
+        publishing_threads = set()
+
+        def publish(observations, _):
+            publishing_threads.add(threading.current_thread().name)
+            time.sleep(0.05)
+            return {"success": True, "published_successfully": len(observations)}
+
+        with (
+            patch("ingestors.health_data_service.settings") as mock_settings,
+            patch.object(service, "_fetch_health_data", return_value=mock_records),
+            patch.object(service, "_transform_health_data", side_effect=lambda records, *_: [{}] * len(records)),
+            patch.object(service, "_publish_health_data", side_effect=publish),
+        ):
+            mock_settings.FHIR_CLIENT_CONFIG = {"PUBLISH_WORKERS": 4}
+            result = service.sync_user_health_data(
+                user_id="user-123",
+                provider=Provider.WITHINGS,
+                data_types=[HealthDataType.HEART_RATE],
+                sync_strategy=sync_strategy,
+            )
+
+        assert result.fhir_resources_created == 4
+        assert len(publishing_threads) > 1
+        assert all(name.startswith("fhir-publish") for name in publishing_threads)
+
+    def test_default_strategy_uses_cached_sync_history(self, service):
+        """Test a cached sync history selects the incremental strategy without a DB query."""
+        service.mock_cache.get.return_value = True
+
+        with patch.object(service, "_fetch_health_data", return_value=[]):
+            result = service.sync_user_health_data(
+                user_id="user-123", provider=Provider.WITHINGS, data_types=[HealthDataType.HEART_RATE]
+            )
+
+        assert result.trigger == SyncTrigger.INCREMENTAL
+        service.mock_provider_link.objects.filter.assert_not_called()
+
+    def test_default_strategy_checks_sync_history_once(self, service):
+        """Test an uncached sync history is read from the provider link and cached."""
+        with patch.object(service, "_fetch_health_data", return_value=[]):
+            result = service.sync_user_health_data(
+                user_id="user-123", provider=Provider.WITHINGS, data_types=[HealthDataType.HEART_RATE]
+            )
+
+        assert result.trigger == SyncTrigger.INITIAL
+        service.mock_provider_link.objects.filter.assert_called_once_with(
+            user__ehr_user_id="user-123",
+            provider__provider_type="withings",
+            extra_data__has_key="last_health_data_sync",
+        )
+        service.mock_cache.set.assert_called_once()
+        assert service.mock_cache.set.call_args.args[:2] == ("health_synced_before:withings:user-123", False)
+
     def test_handles_unexpected_exception(self, service):
         """Test handles unexpected exceptions."""
         with patch.object(service, "_fetch_health_data", side_effect=Exception("Network error")):
@@ -234,6 +381,7 @@ class TestFetchHealthData:
         """Test creates health manager for the provider."""
         with patch("ingestors.health_data_service.HealthDataManagerFactory") as mock_factory:
             mock_manager = MagicMock()
+            mock_manager.supported_data_types_set.return_value = frozenset(HealthDataType)
             mock_manager.fetch_health_data.return_value = []
             mock_factory.create.return_value = mock_manager
 
@@ -249,6 +397,7 @@ class TestFetchHealthData:
         """Test calls fetch_health_data with correct parameters."""
         with patch("ingestors.health_data_service.HealthDataManagerFactory") as mock_factory:
             mock_manager = MagicMock()
+            mock_manager.supported_data_types_set.return_value = frozenset(HealthDataType)
             mock_manager.fetch_health_data.return_value = []
             mock_factory.create.return_value = mock_manager
 
@@ -265,10 +414,45 @@ class TestFetchHealthData:
             assert call_kwargs["user_id"] == "user-123"
             assert call_kwargs["data_types"] == [HealthDataType.STEPS]
 
+    def test_skips_unsupported_data_types(self, service):
+        """Test only data types the provider supports are passed to the manager."""
+        with patch("ingestors.health_data_service.HealthDataManagerFactory") as mock_factory:
+            mock_manager = MagicMock()
+            mock_manager.supported_data_types_set.return_value = frozenset({HealthDataType.STEPS})
+            mock_manager.fetch_health_data.return_value = []
+            mock_factory.create.return_value = mock_manager
+
+            sync_params = {
+                "date_range": {"start": datetime.now(UTC), "end": datetime.now(UTC)},
+                "sync_trigger": SyncTrigger.MANUAL,
+            }
+            service._fetch_health_data(
+                "user-123", Provider.FITBIT, [HealthDataType.ECG, HealthDataType.STEPS], sync_params
+            )
+
+            assert mock_manager.fetch_health_data.call_args[1]["data_types"] == [HealthDataType.STEPS]
+
+    def test_no_supported_data_types_skips_fetch(self, service):
+        """Test the manager is not called when the provider supports none of the data types."""
+        with patch("ingestors.health_data_service.HealthDataManagerFactory") as mock_factory:
+            mock_manager = MagicMock()
+            mock_manager.supported_data_types_set.return_value = frozenset({HealthDataType.STEPS})
+            mock_factory.create.return_value = mock_manager
+
+            sync_params = {
+                "date_range": {"start": datetime.now(UTC), "end": datetime.now(UTC)},
+                "sync_trigger": SyncTrigger.MANUAL,
+            }
+            result = service._fetch_health_data("user-123", Provider.FITBIT, [HealthDataType.ECG], sync_params)
+
+            assert result == []
+            mock_manager.fetch_health_data.assert_not_called()
+
     def test_raises_on_fetch_error(self, service):
         """Test raises exception on fetch error."""
         with patch("ingestors.health_data_service.HealthDataManagerFactory") as mock_factory:
             mock_manager = MagicMock()
+            mock_manager.supported_data_types_set.return_value = frozenset(HealthDataType)
             mock_manager.fetch_health_data.side_effect = Exception("API error")
             mock_factory.create.return_value = mock_manager
 
@@ -288,10 +472,8 @@ class TestTransformHealthData:
         """Create service with mocked dependencies."""
         with (
             patch("ingestors.health_data_service.HealthDataPublisher"),
-            patch("ingestors.health_data_service.HealthDataTransformer") as mock_trans_class,
+            patch.object(HealthDataSyncService, "transformer") as mock_transformer,
         ):
-            mock_transformer = MagicMock()
-            mock_trans_class.return_value = mock_transformer
             svc = HealthDataSyncService()
             svc.mock_transformer = mock_transformer
             yield svc
@@ -367,6 +549,13 @@ class TestPublishHealthData:
             call_kwargs = service.fhir_publisher.publish_health_observations.call_args[1]
             assert call_kwargs["batch_size"] == 100
 
+    def test_empty_observations_skip_publisher(self, service):
+        """Test nothing is sent to the FHIR server for an empty batch."""
+        result = service._publish_health_data([], {"batch_size": 50})
+
+        service.fhir_publisher.publish_health_observations.assert_not_called()
+        assert result == {"published_successfully": 0, "errors": [], "success": True}
+
     def test_raises_on_publish_error(self, service):
         """Test raises exception on publish error."""
         service.fhir_publisher.publish_health_observations.side_effect = Exception("FHIR error")
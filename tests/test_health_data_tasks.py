@@ -0,0 +1,174 @@
+"""
+Tests for health data sync Huey tasks.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ingestors.constants import Provider
+from ingestors.health_data_tasks import (
+    _merge_date_ranges,
+    _update_provider_link_health_sync_info,
+    flush_realtime_health_sync,
+    nightly_health_data_sync,
+    queue_realtime_health_sync,
+)
+
+
+class TestQueueRealtimeHealthSync:
+    """Tests for coalescing webhook-triggered syncs."""
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Mock Django settings with a coalescing window."""
+        with patch("ingestors.health_data_tasks.settings") as mock:
+            mock.WEBHOOK_CONFIG = {"SYNC_COALESCE_SECONDS": 0.5}
+            yield mock
+
+    @pytest.fixture
+    def mock_conn(self):
+        """Mock Redis connection."""
+        conn = MagicMock()
+        with patch("ingestors.health_data_tasks.get_redis_connection", return_value=conn):
+            yield conn
+
+    def test_first_request_schedules_flush(self, mock_settings, mock_conn):
+        """Test the first request in a window schedules the flush task."""
+        mock_conn.set.return_value = True
+
+        with patch("ingestors.health_data_tasks.HUEY") as mock_huey:
+            task_id = queue_realtime_health_sync("user-1", "withings", ["heart_rate"])
+
+        mock_huey.enqueue.assert_called_once()
+        scheduled = mock_huey.enqueue.call_args.args[0]
+        assert scheduled.id == task_id
+        assert scheduled.eta is not None
+        pipe = mock_conn.pipeline.return_value.__enter__.return_value
+        pipe.sadd.assert_called_once_with("ohe:webhook_sync:withings:user-1:data_types", "heart_rate")
+
+    def test_request_within_window_joins_pending_flush(self, mock_settings, mock_conn):
+        """Test later requests in the window reuse the pending flush task."""
+        mock_conn.set.return_value = False
+        mock_conn.get.return_value = b"pending-task"
+
+        with patch("ingestors.health_data_tasks.HUEY") as mock_huey:
+            task_id = queue_realtime_health_sync("user-1", "withings", ["steps"])
+
+        mock_huey.enqueue.assert_not_called()
+        assert task_id == "pending-task"
+
+    def test_zero_window_queues_directly(self, mock_settings):
+        """Test coalescing can be disabled."""
+        mock_settings.WEBHOOK_CONFIG = {"SYNC_COALESCE_SECONDS": 0}
+
+        with patch("ingestors.health_data_tasks.sync_user_health_data_realtime") as mock_task:
+            mock_task.return_value.id = "task-123"
+            task_id = queue_realtime_health_sync("user-1", "withings", ["steps"])
+
+        assert task_id == "task-123"
+
+
+class TestFlushRealtimeHealthSync:
+    """Tests for running a coalesced sync."""
+
+    def test_runs_one_sync_for_merged_requests(self):
+        """Test pending data types and date ranges are merged into one sync."""
+        conn = MagicMock()
+        pipe = conn.pipeline.return_value.__enter__.return_value
+        pipe.execute.return_value = [
+            {b"steps", b"heart_rate"},
+            [
+                json.dumps({"start": "2024-01-15T10:00:00+00:00", "end": "2024-01-15T10:15:00+00:00"}),
+                json.dumps({"start": "2024-01-15T09:50:00+00:00", "end": "2024-01-15T10:05:00+00:00"}),
+            ],
+            3,
+        ]
+
+        with (
+            patch("ingestors.health_data_tasks.get_redis_connection", return_value=conn),
+            patch("ingestors.health_data_tasks.sync_user_health_data_realtime") as mock_sync,
+        ):
+            flush_realtime_health_sync.call_local("user-1", "withings")
+
+        mock_sync.call_local.assert_called_once_with(
+            user_id="user-1",
+            provider_name="withings",
+            data_types=["heart_rate", "steps"],
+            trigger_type="webhook",
+            date_range={"start": "2024-01-15T09:50:00+00:00", "end": "2024-01-15T10:15:00+00:00"},
+        )
+
+    def test_nothing_pending_skips_sync(self):
+        """Test a flush with no pending requests does not sync."""
+        conn = MagicMock()
+        conn.pipeline.return_value.__enter__.return_value.execute.return_value = [set(), [], 0]
+
+        with (
+            patch("ingestors.health_data_tasks.get_redis_connection", return_value=conn),
+            patch("ingestors.health_data_tasks.sync_user_health_data_realtime") as mock_sync,
+        ):
+            result = flush_realtime_health_sync.call_local("user-1", "withings")
+
+        mock_sync.call_local.assert_not_called()
+        assert result["success"] is True
+
+
+class TestMergeDateRanges:
+    """Tests for _merge_date_ranges helper."""
+
+    def test_missing_range_uses_default(self):
+        """Test any request without a range falls back to the strategy default."""
+        assert _merge_date_ranges([{"start": "2024-01-15", "end": "2024-01-16"}, None]) is None
+
+    def test_invalid_range_uses_default(self):
+        """Test unparseable ranges fall back to the strategy default."""
+        assert _merge_date_ranges([{"start": "yesterday", "end": "today"}]) is None
+
+
+class TestUpdateProviderLinkHealthSyncInfo:
+    """Tests for _update_provider_link_health_sync_info helper."""
+
+    def test_known_link_updated_by_primary_key(self):
+        """Test a provider link id from the caller is matched by primary key."""
+        with patch("ingestors.health_data_tasks.ProviderLink") as mock_link:
+            _update_provider_link_health_sync_info("user-1", Provider.WITHINGS, MagicMock(errors=[]), 7)
+
+        mock_link.objects.filter.assert_called_once_with(pk=7)
+        mock_link.objects.filter.return_value.update.assert_called_once()
+
+    def test_unknown_link_matched_by_user_and_provider(self):
+        """Test the link is looked up by EHR user id and provider type otherwise."""
+        with patch("ingestors.health_data_tasks.ProviderLink") as mock_link:
+            _update_provider_link_health_sync_info("user-1", Provider.WITHINGS, MagicMock(errors=[]))
+
+        mock_link.objects.filter.assert_called_once_with(user__ehr_user_id="user-1", provider__provider_type="withings")
+
+
+class TestNightlyHealthDataSync:
+    """Tests for nightly_health_data_sync task."""
+
+    def test_queues_jittered_incremental_sync_per_link(self):
+        """Test one validated incremental sync with a spread start time is queued per active link."""
+        links = [
+            MagicMock(pk=i, user=MagicMock(ehr_user_id=f"user-{i}"), provider=MagicMock(provider_type="withings"))
+            for i in range(3)
+        ]
+
+        with (
+            patch("ingestors.health_data_tasks.settings") as mock_settings,
+            patch("ingestors.health_data_tasks.active_provider_links") as mock_links,
+            patch("ingestors.task_queue.enqueue_many") as mock_enqueue,
+        ):
+            mock_settings.HEALTH_DATA_CONFIG = {"BATCH_SIZES": {"ENQUEUE": 2}, "NIGHTLY_SPREAD_SECONDS": 600}
+            mock_links.return_value.iterator.return_value = iter(links)
+
+            results = nightly_health_data_sync.call_local()
+
+        mock_links.return_value.iterator.assert_called_once_with(chunk_size=2)
+        tasks = [task for call in mock_enqueue.call_args_list for task in call.args[0]]
+        assert all(task.eta is not None for task in tasks)
+        assert all(task.kwargs["validated"] is True for task in tasks)
+        assert [task.kwargs["provider_link_id"] for task in tasks] == [0, 1, 2]
+        assert [result["status"] for result in results] == ["queued"] * 3
@@ -7,7 +7,20 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from ingestors.health_data_constants import HealthDataRecord, HealthDataType, Provider, _create_fhir_timestamp
+from ingestors.health_data_constants import (
+    HEALTH_DATA_DISPLAY_NAMES,
+    HEALTH_DATA_FHIR_CATEGORIES,
+    HEALTH_DATA_LOINC_CODES,
+    HEALTH_DATA_UCUM_UNITS,
+    HealthDataRecord,
+    HealthDataType,
+    Provider,
+    _create_fhir_timestamp,
+    display_name_for,
+    fhir_category_for,
+    loinc_code_for,
+    to_ucum,
+)
 from transformers.health_data_transformers import (
     HealthDataBundle,
     HealthDataTransformer,
@@ -35,6 +48,22 @@ class TestCreateFhirTimestamp:
         assert timestamp == "2024-01-15T10:30:45.123Z"
 
 
+class TestDataTypeLookups:
+    """Tests for ordinal-indexed data type lookup helpers."""
+
+    @pytest.mark.parametrize("data_type", list(HealthDataType))
+    def test_lookups_match_tables(self, data_type):
+        """Test each helper agrees with its source table, including undefined entries."""
+        assert loinc_code_for(data_type) == HEALTH_DATA_LOINC_CODES.get(data_type)
+        assert display_name_for(data_type) == HEALTH_DATA_DISPLAY_NAMES.get(data_type)
+        assert fhir_category_for(data_type) == HEALTH_DATA_FHIR_CATEGORIES.get(data_type)
+
+    @pytest.mark.parametrize("unit", [*HEALTH_DATA_UCUM_UNITS, *HEALTH_DATA_UCUM_UNITS.values(), "furlongs"])
+    def test_to_ucum_matches_table(self, unit):
+        """Test to_ucum agrees with the unit table, passing canonical and unknown units through."""
+        assert to_ucum(unit) == HEALTH_DATA_UCUM_UNITS.get(unit, unit)
+
+
 class TestHealthDataTransformer:
     """Tests for HealthDataTransformer class."""
 
@@ -430,7 +459,7 @@ class TestHealthDataTransformer:
         record.data_type.name = "UNKNOWN"
 
         with patch.object(transformer, "get_loinc_code", return_value=None):
-            with patch.dict("transformers.health_data_transformers.HEALTH_DATA_LOINC_CODES", {}, clear=True):
+            with patch("transformers.health_data_transformers.loinc_code_for", return_value=None):
                 with pytest.raises(ValueError, match="No LOINC code defined"):
                     transformer.transform_health_record(record, "Patient/test-user")
 
@@ -3,6 +3,7 @@ Tests for health data sync strategies.
 """
 
 from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 from freezegun import freeze_time
@@ -29,7 +30,7 @@ def make_sync_config():
     """Create a sample HealthSyncConfig with all required fields."""
     return HealthSyncConfig(
         user_id="test-user",
-        enabled_data_types=[HealthDataType.HEART_RATE, HealthDataType.STEPS],
+        enabled_data_types=frozenset({HealthDataType.HEART_RATE, HealthDataType.STEPS}),
         aggregation_preference=AggregationLevel.INDIVIDUAL,
         sync_frequency=SyncFrequency.REALTIME,
         retention_period=timedelta(days=365),
@@ -61,6 +62,15 @@ class TestInitialSyncStrategy:
         assert date_range.end == expected_end
         assert date_range.start == expected_start
 
+    def test_get_date_range_ends_at_given_now(self, strategy, config):
+        """Test a caller-supplied current time is used as the range end."""
+        now = datetime(2024, 1, 15, 12, 0, 0, tzinfo=UTC)
+
+        date_range = strategy.get_date_range(config, now=now)
+
+        assert date_range.end == now
+        assert date_range.start == now - timedelta(days=30)
+
     def test_get_date_range_custom_lookback(self, config):
         """Test initial sync with custom lookback days."""
         strategy = InitialSyncStrategy(lookback_days=90)
@@ -71,6 +81,10 @@ class TestInitialSyncStrategy:
         diff = date_range.end - date_range.start
         assert diff.days == 90
 
+    def test_instances_have_no_dict(self, strategy):
+        """Test strategies use slots rather than a per-instance __dict__."""
+        assert not hasattr(strategy, "__dict__")
+
     def test_sync_trigger_is_initial(self, strategy):
         """Test that sync trigger is INITIAL."""
         assert strategy.sync_trigger == SyncTrigger.INITIAL
@@ -159,6 +173,39 @@ class TestIncrementalSyncStrategy:
         assert date_range.start == expected_start
         assert date_range.end == expected_end
 
+    @freeze_time("2024-01-15 12:00:00", tz_offset=0)
+    def test_get_date_range_reaches_back_to_overlap_cursor(self, strategy, config):
+        """Test the previous window's start is used when it is earlier than the overlap buffer."""
+        last_sync = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
+        overlap_cursor = datetime(2024, 1, 15, 9, 30, 0, tzinfo=UTC)
+
+        date_range = strategy.get_date_range(config, last_sync, overlap_cursor=overlap_cursor)
+
+        assert date_range.start == overlap_cursor
+
+    @freeze_time("2024-01-15 12:00:00", tz_offset=0)
+    def test_get_sync_params_returns_cursors(self, strategy, config):
+        """Test the synced window is returned as cursors for the next sync."""
+        last_sync = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
+        overlap_cursor = datetime(2024, 1, 15, 9, 30, 0, tzinfo=UTC)
+
+        params = strategy.get_sync_params(
+            "test-user", [HealthDataType.HEART_RATE], config, last_sync, overlap_cursor=overlap_cursor
+        )
+
+        assert params["date_range"].start == overlap_cursor
+        assert params["cursor_overlap"] == overlap_cursor
+        assert params["cursor_current"] == datetime(2024, 1, 15, 12, 0, 0, tzinfo=UTC)
+
+    @freeze_time("2024-01-15 12:00:00", tz_offset=0)
+    def test_get_date_range_caps_long_gaps(self, strategy, config):
+        """Test a last sync older than max_span is clamped to the span."""
+        last_sync = datetime(2023, 11, 1, 10, 0, 0, tzinfo=UTC)
+
+        date_range = strategy.get_date_range(config, last_sync)
+
+        assert date_range.start == datetime(2024, 1, 8, 12, 0, 0, tzinfo=UTC)
+
     def test_sync_trigger_is_incremental(self, strategy):
         """Test that sync trigger is INCREMENTAL."""
         assert strategy.sync_trigger == SyncTrigger.INCREMENTAL
@@ -166,9 +213,10 @@ class TestIncrementalSyncStrategy:
     def test_custom_overlap_minutes(self, config):
         """Test incremental sync with custom overlap."""
         strategy = IncrementalSyncStrategy(overlap_minutes=10)
-        last_sync = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
+        now = datetime(2024, 1, 15, 12, 0, 0, tzinfo=UTC)
+        last_sync = now - timedelta(hours=2)
 
-        date_range = strategy.get_date_range(config, last_sync)
+        date_range = strategy.get_date_range(config, last_sync, now=now)
 
         # Start should be 10 minutes before last_sync
         expected_start = last_sync - timedelta(minutes=10)
@@ -448,6 +496,11 @@ class TestSyncStrategyFactory:
         assert isinstance(strategy, InitialSyncStrategy)
         assert strategy.lookback_days == 90
 
+    def test_create_for_trigger_unsupported_raises(self):
+        """Test an unknown trigger is rejected."""
+        with pytest.raises(ValueError, match="Unsupported sync trigger"):
+            SyncStrategyFactory.create_for_trigger("scheduled")
+
 
 class TestGetDefaultSyncStrategy:
     """Tests for get_default_sync_strategy function."""
@@ -505,6 +558,14 @@ class TestBaseSyncStrategyHelpers:
         for strategy, expected_batch_size in strategies:
             assert strategy._get_batch_size() == expected_batch_size
 
+    def test_batch_size_configurable_in_settings(self):
+        """Test HEALTH_DATA_CONFIG batch sizes override the defaults."""
+        with patch("ingestors.health_sync_strategies.settings") as mock_settings:
+            mock_settings.HEALTH_DATA_CONFIG = {"BATCH_SIZES": {"INITIAL_SYNC": 250}}
+
+            assert InitialSyncStrategy()._get_batch_size() == 250
+            assert WebhookSyncStrategy()._get_batch_size() == 100
+
     def test_priority_by_trigger_type(self):
         """Test priorities are appropriate for each trigger type."""
         strategies = [
@@ -112,6 +112,37 @@ class TestMetricsCollector:
         """Test recording rate limit hits."""
         collector.record_rate_limit(provider="fitbit")
 
+    def test_record_operation_batch(self, collector):
+        """Test a single call records sync, error and rate limit metrics."""
+        with (
+            patch.object(collector, "record_sync_operation") as mock_sync,
+            patch.object(collector, "record_provider_api_error") as mock_error,
+            patch.object(collector, "record_rate_limit") as mock_rate_limit,
+        ):
+            collector.record_operation_batch(
+                provider="withings",
+                operation_type="fetch_data",
+                status="error",
+                duration=0.5,
+                error_type="rate_limit_error",
+                rate_limited=True,
+            )
+
+        mock_sync.assert_called_once_with("withings", "fetch_data", "error", 0.5)
+        mock_error.assert_called_once_with("withings", "rate_limit_error")
+        mock_rate_limit.assert_called_once_with("withings")
+
+    def test_record_operation_batch_success(self, collector):
+        """Test success outcomes skip error metrics."""
+        with (
+            patch.object(collector, "record_provider_api_error") as mock_error,
+            patch.object(collector, "record_rate_limit") as mock_rate_limit,
+        ):
+            collector.record_operation_batch(provider="fitbit", operation_type="steps_fetch", status="success")
+
+        mock_error.assert_not_called()
+        mock_rate_limit.assert_not_called()
+
     def test_update_system_metrics(self, collector):
         """Test updating system metrics doesn't raise errors."""
         with (
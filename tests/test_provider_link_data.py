@@ -0,0 +1,40 @@
+"""
+Tests for ProviderLink.extra_data update helpers.
+"""
+
+import pytest
+
+from base.models import EHRUser, Provider, ProviderLink
+from ingestors.provider_link_data import merged_extra_data
+
+
+@pytest.mark.django_db
+class TestMergedExtraData:
+    """Tests for merged_extra_data against the database."""
+
+    @pytest.fixture
+    def link(self):
+        """Provider link for a Withings user."""
+        user = EHRUser.objects.create(username="user-1")
+        provider = Provider.objects.create(name="Withings", provider_type="withings", active=True)
+        return ProviderLink.objects.create(external_user_id="ext-1", provider=provider, user=user)
+
+    def test_merges_into_existing_keys(self, link):
+        """Test new entries are merged, overwriting only the keys they carry."""
+        link.extra_data = {"access_token": "token", "last_sync_success": False}
+        link.save()
+
+        updated = ProviderLink.objects.filter(pk=link.pk).update(
+            extra_data=merged_extra_data({"last_sync_success": True, "last_sync_errors": 0})
+        )
+
+        link.refresh_from_db()
+        assert updated == 1
+        assert link.extra_data == {"access_token": "token", "last_sync_success": True, "last_sync_errors": 0}
+
+    def test_merges_into_empty_extra_data(self, link):
+        """Test a link without extra_data gets the entries."""
+        ProviderLink.objects.filter(pk=link.pk).update(extra_data=merged_extra_data({"webhook_active": True}))
+
+        link.refresh_from_db()
+        assert link.extra_data == {"webhook_active": True}
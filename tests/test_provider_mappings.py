@@ -2,6 +2,8 @@
 Tests for provider data type mappings.
 """
 
+from collections.abc import Mapping
+
 import pytest
 
 from ingestors.health_data_constants import Provider
@@ -27,11 +29,11 @@ class TestDataTypeConfig:
         config = DataTypeConfig(
             name="test_type",
             display_name="Test Type",
-            subscription_categories=["1", "2"],
+            subscription_categories=("1", "2"),
             api_endpoint="/v2/test",
             api_method=APIMethod.POST,
             api_action="get",
-            meastype=10,
+            meastype=(10,),
             response_processor="_process_test",
             requires_date_range=True,
             description="Test data type",
@@ -41,7 +43,7 @@ class TestDataTypeConfig:
 
         assert config.name == "test_type"
         assert config.display_name == "Test Type"
-        assert config.subscription_categories == ["1", "2"]
+        assert config.subscription_categories == ("1", "2")
         assert config.api_method == APIMethod.POST
         assert config.date_format == "ymd"
         assert config.data_fields == "field1,field2"
@@ -51,11 +53,11 @@ class TestDataTypeConfig:
         config = DataTypeConfig(
             name="test",
             display_name="Test",
-            subscription_categories=["1"],
+            subscription_categories=("1",),
             api_endpoint="/test",
             api_method=APIMethod.POST,
             api_action=None,
-            meastype=None,
+            meastype=(),
             response_processor="_process",
             requires_date_range=True,
             description="Test",
@@ -71,6 +73,20 @@ class TestDataTypeConfig:
         with pytest.raises(AttributeError):
             config.name = "changed"
 
+    def test_data_type_config_requires_keywords(self):
+        """Test fields cannot be passed positionally."""
+        with pytest.raises(TypeError):
+            DataTypeConfig("test", "Test", ("1",), "/test", APIMethod.POST, None, None, "_process", True, "Test")
+
+    def test_data_type_config_compares_by_identity(self):
+        """Test configs with the same fields on different providers are distinct."""
+        assert WITHINGS_DATA_TYPES["ecg"] == WITHINGS_DATA_TYPES["ecg"]
+        assert WITHINGS_DATA_TYPES["ecg"] != FITBIT_DATA_TYPES["ecg"]
+
+    def test_data_type_config_is_hashable(self):
+        """Test configs can be used as set members and cache keys."""
+        assert len({*WITHINGS_DATA_TYPES.values(), *WITHINGS_DATA_TYPES.values()}) == len(WITHINGS_DATA_TYPES)
+
 
 class TestWithingsDataTypes:
     """Tests for Withings data type definitions."""
@@ -80,7 +96,7 @@ class TestWithingsDataTypes:
         config = WITHINGS_DATA_TYPES["ecg"]
 
         assert config.name == "ecg"
-        assert config.subscription_categories == ["54"]
+        assert config.subscription_categories == ("54",)
         assert config.api_endpoint == "/v2/heart"
         assert config.api_method == APIMethod.POST
         assert config.api_action == "list"
@@ -90,32 +106,32 @@ class TestWithingsDataTypes:
         config = WITHINGS_DATA_TYPES["heart_rate"]
 
         assert config.name == "heart_rate"
-        assert config.subscription_categories == ["4"]
+        assert config.subscription_categories == ("4",)
         assert config.api_endpoint == "/measure"
         assert config.api_method == APIMethod.POST
-        assert config.meastype == 11
+        assert config.meastype == (11,)
 
     def test_weight_configuration(self):
         """Test weight configuration uses /measure endpoint."""
         config = WITHINGS_DATA_TYPES["weight"]
 
-        assert config.subscription_categories == ["1"]
+        assert config.subscription_categories == ("1",)
         assert config.api_endpoint == "/measure"
         assert config.api_method == APIMethod.POST
-        assert config.meastype == 1
+        assert config.meastype == (1,)
 
     def test_blood_pressure_has_multiple_meastypes(self):
         """Test blood pressure has multiple meastypes."""
         config = WITHINGS_DATA_TYPES["blood_pressure"]
 
-        assert config.meastype == [9, 10]
+        assert config.meastype == (9, 10)
         assert config.api_endpoint == "/measure"
 
     def test_temperature_has_multiple_meastypes(self):
         """Test temperature has multiple meastypes for body temp, skin temp."""
         config = WITHINGS_DATA_TYPES["temperature"]
 
-        assert config.meastype == [12, 71, 73]
+        assert config.meastype == (12, 71, 73)
         assert config.api_endpoint == "/measure"
         assert config.api_method == APIMethod.POST
 
@@ -150,7 +166,7 @@ class TestWithingsDataTypes:
 
         assert config.api_endpoint == "/measure"
         assert config.api_action == "getmeas"
-        assert config.meastype == 91
+        assert config.meastype == (91,)
 
     def test_getmeas_types_use_measure_endpoint(self):
         """Test all getmeas data types use /measure endpoint (not /v2/measure)."""
@@ -185,15 +201,15 @@ class TestFitbitDataTypes:
         """Test Fitbit heart rate configuration."""
         config = FITBIT_DATA_TYPES["heart_rate"]
 
-        assert config.subscription_categories == ["activities"]
+        assert config.subscription_categories == ("activities",)
         assert "{date}" in config.api_endpoint
-        assert config.meastype is None
+        assert config.meastype == ()
 
     def test_sleep_configuration(self):
         """Test Fitbit sleep configuration."""
         config = FITBIT_DATA_TYPES["sleep"]
 
-        assert config.subscription_categories == ["sleep"]
+        assert config.subscription_categories == ("sleep",)
         assert "sleep" in config.api_endpoint
 
     def test_all_fitbit_types_have_required_fields(self):
@@ -219,6 +235,13 @@ class TestProviderDataTypeMappings:
         assert Provider.FITBIT in PROVIDER_DATA_TYPE_MAPPINGS
         assert PROVIDER_DATA_TYPE_MAPPINGS[Provider.FITBIT] == FITBIT_DATA_TYPES
 
+    def test_mappings_are_read_only(self):
+        """Test the shared mappings cannot be mutated by callers."""
+        with pytest.raises(TypeError):
+            WITHINGS_DATA_TYPES["ecg"] = FITBIT_DATA_TYPES["ecg"]
+        with pytest.raises(TypeError):
+            PROVIDER_DATA_TYPE_MAPPINGS[Provider.FITBIT] = WITHINGS_DATA_TYPES
+
 
 class TestGetCategoryToDataTypesMapping:
     """Tests for get_category_to_data_types_mapping function."""
@@ -261,7 +284,16 @@ class TestGetCategoryToDataTypesMapping:
         mapping = get_category_to_data_types_mapping(Provider.WITHINGS)
         # This test verifies the function works, actual unknown provider
         # would need the enum extended
-        assert isinstance(mapping, dict)
+        assert isinstance(mapping, Mapping)
+
+    def test_mapping_is_precomputed_and_read_only(self):
+        """Test the same read-only mapping is returned on every call."""
+        mapping = get_category_to_data_types_mapping(Provider.WITHINGS)
+
+        assert get_category_to_data_types_mapping(Provider.WITHINGS) is mapping
+        assert mapping["54"] == ("ecg",)
+        with pytest.raises(TypeError):
+            mapping["54"] = ("weight",)
 
 
 class TestResolveSubscriptionCategories:
@@ -311,6 +343,13 @@ class TestResolveSubscriptionCategories:
 
         assert categories == sorted(categories)
 
+    def test_cached_result_not_shared_with_caller(self):
+        """Test mutating a returned list does not affect later resolutions."""
+        categories = resolve_subscription_categories(Provider.WITHINGS, ["ecg", "weight"])
+        categories.append("99")
+
+        assert resolve_subscription_categories(Provider.WITHINGS, ["weight", "ecg"]) == ["1", "54"]
+
 
 class TestGetDataTypeConfig:
     """Tests for get_data_type_config function."""
@@ -362,11 +401,12 @@ class TestGetSupportedDataTypes:
         assert "steps" in types
         assert "sleep" in types
 
-    def test_returns_list(self):
-        """Test returns a list."""
+    def test_returns_shared_tuple(self):
+        """Test returns the same precomputed tuple on every call."""
         types = get_supported_data_types(Provider.WITHINGS)
 
-        assert isinstance(types, list)
+        assert isinstance(types, tuple)
+        assert get_supported_data_types(Provider.WITHINGS) is types
 
 
 class TestValidateDataTypes:
@@ -0,0 +1,39 @@
+"""
+Tests for task result serialization.
+"""
+
+from ingestors.constants import Provider
+from ingestors.health_data_constants import HealthDataType, HealthSyncResult, SyncTrigger
+from ingestors.result_serialization import result_to_dict
+
+
+class TestResultToDict:
+    """Tests for result_to_dict helper."""
+
+    def test_converts_enums_to_values(self):
+        """Test enum fields and lists of enums are serialized to their values."""
+        result = HealthSyncResult(
+            user_id="user-1",
+            provider=Provider.WITHINGS,
+            data_types=[HealthDataType.HEART_RATE, HealthDataType.STEPS],
+            trigger=SyncTrigger.WEBHOOK,
+            errors=["boom"],
+        )
+
+        serialized = result_to_dict(result)
+
+        assert serialized["provider"] == "withings"
+        assert serialized["data_types"] == ["heart_rate", "steps"]
+        assert serialized["trigger"] == SyncTrigger.WEBHOOK.value
+        assert serialized["errors"] == ["boom"]
+        assert serialized["user_id"] == "user-1"
+
+    def test_lists_are_copied(self):
+        """Test serialized lists do not alias the result's lists."""
+        result = HealthSyncResult(
+            user_id="user-1", provider=Provider.FITBIT, data_types=[], trigger=SyncTrigger.MANUAL, errors=[]
+        )
+
+        result_to_dict(result)["errors"].append("late error")
+
+        assert result.errors == []
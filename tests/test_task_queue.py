@@ -0,0 +1,72 @@
+"""
+Tests for shared Huey queue helpers.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ingestors.task_queue import active_provider_links, enqueue_link_tasks
+
+
+class TestActiveProviderLinks:
+    """Tests for active_provider_links query."""
+
+    def test_filters_supported_linked_providers(self):
+        """Test the query keeps active, supported providers holding an access token."""
+        with patch("ingestors.task_queue.ProviderLink") as mock_link:
+            active_provider_links()
+
+        mock_link.objects.filter.assert_called_once_with(
+            provider__active=True,
+            provider__provider_type__in=frozenset({"withings", "fitbit"}),
+            extra_data__has_key="access_token",
+        )
+        mock_link.objects.filter.return_value.select_related.return_value.only.assert_called_once_with(
+            "id", "user__ehr_user_id", "provider__provider_type"
+        )
+
+
+class TestEnqueueLinkTasks:
+    """Tests for enqueue_link_tasks helper."""
+
+    @pytest.fixture
+    def links(self):
+        """Provider links to queue tasks for."""
+        return [
+            MagicMock(pk=i, user=MagicMock(ehr_user_id=f"user-{i}"), provider=MagicMock(provider_type="withings"))
+            for i in range(5)
+        ]
+
+    def test_enqueues_in_batches(self, links):
+        """Test tasks are written to the queue in batches and reported per link."""
+        with patch("ingestors.task_queue.enqueue_many") as mock_enqueue:
+            results = enqueue_link_tasks(links, lambda link: MagicMock(id=f"task-{link.pk}"), 2)
+
+        assert [len(call.args[0]) for call in mock_enqueue.call_args_list] == [2, 2, 1]
+        assert [result["task_id"] for result in results] == [f"task-{i}" for i in range(5)]
+        assert [result["link_id"] for result in results] == [0, 1, 2, 3, 4]
+        assert all(result["status"] == "queued" for result in results)
+
+    def test_failed_batch_reports_each_link(self, links):
+        """Test a failed enqueue marks every link in the batch as failed."""
+        with patch("ingestors.task_queue.enqueue_many", side_effect=Exception("Redis down")):
+            results = enqueue_link_tasks(links, lambda link: MagicMock(), 10)
+
+        assert [result["link_id"] for result in results] == [0, 1, 2, 3, 4]
+        assert all(result["success"] is False for result in results)
+
+    def test_failed_build_skips_only_that_link(self, links):
+        """Test a link whose task cannot be built is reported and the others are still queued."""
+
+        def build_task(link):
+            if link.pk == 1:
+                raise ValueError("bad link")
+            return MagicMock(id=f"task-{link.pk}")
+
+        with patch("ingestors.task_queue.enqueue_many") as mock_enqueue:
+            results = enqueue_link_tasks(links, build_task, 10)
+
+        assert len(mock_enqueue.call_args.args[0]) == 4
+        assert [result.get("status") for result in results] == [None, "queued", "queued", "queued", "queued"]
+        assert results[0]["link_id"] == 1
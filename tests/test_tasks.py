@@ -0,0 +1,70 @@
+"""
+Tests for device sync Huey tasks.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from ingestors.constants import Provider
+from ingestors.tasks import (
+    _update_provider_link_sync_info,
+    _webhook_collection_types,
+    nightly_device_sync,
+)
+
+
+class TestNightlyDeviceSync:
+    """Tests for nightly_device_sync task."""
+
+    def test_queues_device_sync_per_link(self):
+        """Test one device sync carrying the provider link id is queued per active link."""
+        links = [
+            MagicMock(pk=i, user=MagicMock(ehr_user_id=f"user-{i}"), provider=MagicMock(provider_type="withings"))
+            for i in range(3)
+        ]
+
+        with (
+            patch("ingestors.tasks.settings") as mock_settings,
+            patch("ingestors.tasks.active_provider_links") as mock_links,
+            patch("ingestors.task_queue.enqueue_many") as mock_enqueue,
+        ):
+            mock_settings.HUEY_TASK_CONFIG = {"ENQUEUE_BATCH_SIZE": 2}
+            mock_links.return_value.iterator.return_value = iter(links)
+
+            results = nightly_device_sync.call_local()
+
+        mock_links.return_value.iterator.assert_called_once_with(chunk_size=2)
+        tasks = [task for call in mock_enqueue.call_args_list for task in call.args[0]]
+        assert [task.kwargs["user_id"] for task in tasks] == ["user-0", "user-1", "user-2"]
+        assert [task.kwargs["provider_link_id"] for task in tasks] == [0, 1, 2]
+        assert [result["status"] for result in results] == ["queued"] * 3
+
+
+class TestUpdateProviderLinkSyncInfo:
+    """Tests for _update_provider_link_sync_info helper."""
+
+    def test_known_link_updated_by_primary_key(self):
+        """Test a provider link id from the caller is matched by primary key."""
+        with patch("ingestors.tasks.ProviderLink") as mock_link:
+            _update_provider_link_sync_info(MagicMock(), Provider.WITHINGS, MagicMock(errors=[]), 7)
+
+        mock_link.objects.filter.assert_called_once_with(pk=7)
+        mock_link.objects.filter.return_value.update.assert_called_once()
+
+    def test_unknown_link_matched_by_user_and_provider(self):
+        """Test the link is looked up by user and provider type otherwise."""
+        user = MagicMock()
+        with patch("ingestors.tasks.ProviderLink") as mock_link:
+            _update_provider_link_sync_info(user, Provider.WITHINGS, MagicMock(errors=[]))
+
+        mock_link.objects.filter.assert_called_once_with(user=user, provider__provider_type="withings")
+        mock_link.objects.filter.return_value.update.assert_called_once()
+
+
+class TestWebhookCollectionTypes:
+    """Tests for _webhook_collection_types helper."""
+
+    def test_union_of_collection_types(self):
+        """Test collection types of all data types are merged, deduplicated and sorted."""
+        result = _webhook_collection_types(Provider.FITBIT, frozenset({"steps", "heart_rate", "weight", "unknown"}))
+
+        assert result == ("activities", "body")
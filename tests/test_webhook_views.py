@@ -140,10 +140,8 @@ class TestWithingsWebhookHandler:
                 ]
                 mock_processor.return_value = mock_proc_instance
 
-                with patch("webhooks.views.sync_user_health_data_realtime") as mock_sync:
-                    mock_task = MagicMock()
-                    mock_task.id = "task-123"
-                    mock_sync.return_value = mock_task
+                with patch("webhooks.views.queue_realtime_health_sync") as mock_sync:
+                    mock_sync.return_value = "task-123"
 
                     response = withings_webhook_handler(request)
 
@@ -214,7 +212,7 @@ class TestWithingsWebhookHandler:
                 ]
                 mock_processor.return_value = mock_proc_instance
 
-                with patch("webhooks.views.sync_user_health_data_realtime") as mock_sync:
+                with patch("webhooks.views.queue_realtime_health_sync") as mock_sync:
                     mock_sync.side_effect = Exception("Task queue error")
 
                     response = withings_webhook_handler(request)
@@ -346,10 +344,8 @@ class TestFitbitWebhookHandler:
                 ]
                 mock_processor.return_value = mock_proc_instance
 
-                with patch("webhooks.views.sync_user_health_data_realtime") as mock_sync:
-                    mock_task = MagicMock()
-                    mock_task.id = "task-456"
-                    mock_sync.return_value = mock_task
+                with patch("webhooks.views.queue_realtime_health_sync") as mock_sync:
+                    mock_sync.return_value = "task-456"
 
                     response = fitbit_webhook_handler(request)
 
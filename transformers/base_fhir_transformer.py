@@ -335,9 +335,9 @@ class BaseFHIRTransformer(ABC):
             if ucum:
                 return (display or display_unit, ucum)
 
-        from ingestors.health_data_constants import HEALTH_DATA_UCUM_UNITS
+        from ingestors.health_data_constants import to_ucum
 
-        return (display_unit, HEALTH_DATA_UCUM_UNITS.get(display_unit, display_unit))
+        return (display_unit, to_ucum(display_unit))
 
     def create_base_observation(
         self,
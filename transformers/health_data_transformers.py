@@ -12,15 +12,15 @@ from ingestors.health_data_constants import (
     BLOOD_PRESSURE_COMPONENT_CODES,
     BODY_COMPOSITION_CODES,
     FHIR_UNITS,
-    HEALTH_DATA_DISPLAY_NAMES,
-    HEALTH_DATA_FHIR_CATEGORIES,
-    HEALTH_DATA_LOINC_CODES,
-    HEALTH_DATA_UCUM_UNITS,
     RR_INTERVAL_LOINC,
     SLEEP_COMPONENT_CODES,
     HealthDataRecord,
     HealthDataType,
     _create_fhir_timestamp,
+    display_name_for,
+    fhir_category_for,
+    loinc_code_for,
+    to_ucum,
 )
 
 from .base_fhir_transformer import BaseFHIRTransformer
@@ -67,13 +67,11 @@ class HealthDataTransformer(BaseFHIRTransformer):
 
         # Get FHIR codes and mappings for non-ECG data
         # Use LOINC override if available (e.g., steps: 41950-7 for inwithings compatibility)
-        # Convert HealthDataType keys to strings for compatibility with get_loinc_code
-        loinc_codes_str: dict[str, str] = {k.value: v for k, v in HEALTH_DATA_LOINC_CODES.items()}
-        loinc_code = self.get_loinc_code(record.data_type.value, loinc_codes_str)
+        loinc_code = self.get_loinc_code(record.data_type.value)
         if not loinc_code:
-            loinc_code = HEALTH_DATA_LOINC_CODES.get(record.data_type)
-        display_name = HEALTH_DATA_DISPLAY_NAMES.get(record.data_type)
-        category = HEALTH_DATA_FHIR_CATEGORIES.get(record.data_type, "survey")
+            loinc_code = loinc_code_for(record.data_type)
+        display_name = display_name_for(record.data_type)
+        category = fhir_category_for(record.data_type) or "survey"
 
         if not loinc_code:
             raise ValueError(f"No LOINC code defined for data type: {record.data_type}")
@@ -153,30 +151,9 @@ class HealthDataTransformer(BaseFHIRTransformer):
             secondary_loinc_code=secondary_loinc,
         )
 
-        # Transform value based on data type
-        if record.data_type == HealthDataType.HEART_RATE:
-            observation.update(self._transform_heart_rate_value(record))
-        elif record.data_type == HealthDataType.STEPS:
-            observation.update(self._transform_steps_value(record))
-        elif record.data_type == HealthDataType.WEIGHT:
-            observation.update(self._transform_weight_value(record))
-        elif record.data_type == HealthDataType.BLOOD_PRESSURE:
-            observation.update(self._transform_blood_pressure_value(record))
-        elif record.data_type == HealthDataType.TEMPERATURE:
-            observation.update(self._transform_temperature_value(record))
-        elif record.data_type == HealthDataType.SPO2:
-            observation.update(self._transform_spo2_value(record))
-        elif record.data_type == HealthDataType.RR_INTERVALS:
-            observation.update(self._transform_rr_intervals_value(record))
-        elif record.data_type == HealthDataType.SLEEP:
-            observation.update(self._transform_sleep_value(record))
-        elif record.data_type == HealthDataType.PULSE_WAVE_VELOCITY:
-            observation.update(self._transform_pulse_wave_velocity_value(record))
-        elif record.data_type == HealthDataType.FAT_MASS:
-            observation.update(self._transform_fat_mass_value(record))
-        else:
-            # Generic value transformation
-            observation.update(self._transform_generic_value(record))
+        # Transform value based on data type (generic transformation for unmapped types)
+        transform_value = self._VALUE_TRANSFORMS.get(record.data_type, HealthDataTransformer._transform_generic_value)
+        observation.update(transform_value(self, record))
 
         # Add notes with metadata
         if record.metadata:
@@ -214,7 +191,7 @@ class HealthDataTransformer(BaseFHIRTransformer):
 
     def _transform_weight_value(self, record: HealthDataRecord) -> dict[str, Any]:
         """Transform weight value to FHIR format"""
-        ucum_unit = HEALTH_DATA_UCUM_UNITS.get(record.unit, record.unit)
+        ucum_unit = to_ucum(record.unit)
 
         return {
             "valueQuantity": {
@@ -517,7 +494,7 @@ class HealthDataTransformer(BaseFHIRTransformer):
 
     def _transform_generic_value(self, record: HealthDataRecord) -> dict[str, Any]:
         """Transform generic numeric value to FHIR format"""
-        ucum_unit = HEALTH_DATA_UCUM_UNITS.get(record.unit, record.unit)
+        ucum_unit = to_ucum(record.unit)
 
         if isinstance(record.value, int | float):
             return {
@@ -532,6 +509,20 @@ class HealthDataTransformer(BaseFHIRTransformer):
             # Complex value - store as string for now
             return {"valueString": str(record.value)}
 
+    # Value transformation per data type, looked up once per record instead of an if/elif cascade
+    _VALUE_TRANSFORMS = {
+        HealthDataType.HEART_RATE: _transform_heart_rate_value,
+        HealthDataType.STEPS: _transform_steps_value,
+        HealthDataType.WEIGHT: _transform_weight_value,
+        HealthDataType.BLOOD_PRESSURE: _transform_blood_pressure_value,
+        HealthDataType.TEMPERATURE: _transform_temperature_value,
+        HealthDataType.SPO2: _transform_spo2_value,
+        HealthDataType.RR_INTERVALS: _transform_rr_intervals_value,
+        HealthDataType.SLEEP: _transform_sleep_value,
+        HealthDataType.PULSE_WAVE_VELOCITY: _transform_pulse_wave_velocity_value,
+        HealthDataType.FAT_MASS: _transform_fat_mass_value,
+    }
+
     def transform_multiple_records(
         self, records: list[HealthDataRecord], patient_reference: str, device_reference: str | None = None
     ) -> list[dict[str, Any]]:
@@ -89,7 +89,7 @@ class WebhookPayloadProcessor:
 
             # Get mapping of appli types to data type names
             category_mapping = get_category_to_data_types_mapping(Provider.WITHINGS)
-            data_type_names = category_mapping.get(str(appli), [])
+            data_type_names = category_mapping.get(str(appli), ())
 
             if not data_type_names:
                 logger.warning(f"Withings webhook with unsupported appli type: {appli} (no data types configured)")
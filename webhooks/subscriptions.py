@@ -43,6 +43,8 @@ class WebhookSubscriptionManager:
 
     def __init__(self):
         self.base_webhook_url = settings.WEBHOOK_BASE_URL
+        # Reused across calls so provider API connections are pooled
+        self.session = requests.Session()
 
     def create_withings_subscription(self, user_id: str, data_types: list[str] | None = None) -> WebhookSubscription:
         """
@@ -99,7 +101,7 @@ class WebhookSubscriptionManager:
                     logger.info(
                         f"Creating Withings subscription for user {user_id}, appli {appli} (callback: {callback_url})"
                     )
-                    response = requests.post(
+                    response = self.session.post(
                         url, data=body_params, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"]
                     )
                     response.raise_for_status()
@@ -210,7 +212,7 @@ class WebhookSubscriptionManager:
                 )
 
                 try:
-                    response = requests.post(url, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
+                    response = self.session.post(url, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
 
                     if response.status_code == 201:  # Created
                         subscription = WebhookSubscription(
@@ -276,7 +278,9 @@ class WebhookSubscriptionManager:
                 "appli": appli,
             }
 
-            response = requests.post(url, data=body_params, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
+            response = self.session.post(
+                url, data=body_params, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"]
+            )
             response.raise_for_status()
 
             result = response.json()
@@ -305,7 +309,7 @@ class WebhookSubscriptionManager:
             url = f"https://api.fitbit.com/1/user/{fitbit_user_id}/{collection_type}/apiSubscriptions/{subscription_id}.json"
             headers = {"Authorization": f"Bearer {access_token}"}
 
-            response = requests.delete(url, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
+            response = self.session.delete(url, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
             success = response.status_code == 204  # No Content
 
             if success:
@@ -332,7 +336,9 @@ class WebhookSubscriptionManager:
             headers = {"Authorization": f"Bearer {access_token}"}
             body_params = {"action": "list"}
 
-            response = requests.post(url, data=body_params, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
+            response = self.session.post(
+                url, data=body_params, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"]
+            )
             if response.status_code == 200:
                 result = response.json()
                 if result.get("status") == 0:
@@ -364,7 +370,7 @@ class WebhookSubscriptionManager:
             url = f"https://api.fitbit.com/1/user/{fitbit_user_id}/apiSubscriptions.json"
             headers = {"Authorization": f"Bearer {access_token}"}
 
-            response = requests.get(url, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
+            response = self.session.get(url, headers=headers, timeout=settings.WEBHOOK_CONFIG["TIMEOUT"])
             if response.status_code == 200:
                 data = response.json()
                 subscriptions.extend(
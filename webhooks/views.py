@@ -18,7 +18,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 # Import our health data sync infrastructure
-from ingestors.health_data_tasks import sync_user_health_data_realtime
+from ingestors.health_data_tasks import queue_realtime_health_sync
 
 from .processors import WebhookPayloadProcessor, WebhookValidationError
 from .validators import WebhookSignatureValidator
@@ -125,7 +125,7 @@ def withings_webhook_handler(request):
         queued_tasks = []
         for sync_request in sync_requests:
             try:
-                task_result = sync_user_health_data_realtime(
+                task_id = queue_realtime_health_sync(
                     user_id=sync_request["user_id"],
                     provider_name=sync_request["provider"],
                     data_types=sync_request["data_types"],
@@ -135,13 +135,13 @@ def withings_webhook_handler(request):
 
                 queued_tasks.append(
                     {
-                        "task_id": task_result.id,
+                        "task_id": task_id,
                         "user_id": sync_request["user_id"],
                         "data_types": sync_request["data_types"],
                     }
                 )
 
-                logger.info(f"Queued Withings sync task {task_result.id} for user {sync_request['user_id']}")
+                logger.info(f"Queued Withings sync task {task_id} for user {sync_request['user_id']}")
 
             except Exception as e:
                 logger.error(f"Failed to queue Withings sync task: {e}")
@@ -248,7 +248,7 @@ def fitbit_webhook_handler(request):
         queued_tasks = []
         for sync_request in sync_requests:
             try:
-                task_result = sync_user_health_data_realtime(
+                task_id = queue_realtime_health_sync(
                     user_id=sync_request["user_id"],
                     provider_name=sync_request["provider"],
                     data_types=sync_request["data_types"],
@@ -258,13 +258,13 @@ def fitbit_webhook_handler(request):
 
                 queued_tasks.append(
                     {
-                        "task_id": task_result.id,
+                        "task_id": task_id,
                         "user_id": sync_request["user_id"],
                         "data_types": sync_request["data_types"],
                     }
                 )
 
-                logger.info(f"Queued Fitbit sync task {task_result.id} for user {sync_request['user_id']}")
+                logger.info(f"Queued Fitbit sync task {task_id} for user {sync_request['user_id']}")
 
             except Exception as e:
                 logger.error(f"Failed to queue Fitbit sync task: {e}")